@@ -0,0 +1,94 @@
+"""
+Measures the per-call overhead of :meth:`Layout.get_size()` and
+:meth:`LayoutIter.next_cluster()` in both API mode and ABI mode.
+
+Each mode is measured in a separate interpreter, since the mode is selected
+when pangocffi is imported. API mode is only available once the extension
+has been compiled with ``make build-api``.
+
+Usage (from the root of the repository)::
+
+    python -m benchmarks.call_overhead
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+TEXT = 'Hi from Παν語! The quick brown fox jumps over the lazy dog. ' * 20
+
+
+def _time_per_call(function, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls
+
+
+def _measure(calls: int) -> dict:
+    import pangocffi
+    from pangocffi import Layout
+    from tests.context_creator import ContextCreator
+
+    context_creator = ContextCreator.create_surface_without_output()
+    layout = Layout(context_creator.get_pango_context_as_class())
+    layout.width = pangocffi.units_from_double(300)
+    layout.text = TEXT
+
+    get_size = _time_per_call(layout.get_size, calls)
+
+    # Iterate over every cluster of the layout repeatedly, so that the cost
+    # of creating the iterator is spread over many calls.
+    clusters = 0
+    next_cluster_time = 0.0
+    while clusters < calls:
+        layout_iter = layout.get_iter()
+        start = time.perf_counter()
+        while layout_iter.next_cluster():
+            clusters += 1
+        next_cluster_time += time.perf_counter() - start
+
+    context_creator.close()
+    return {
+        'cffi_mode': pangocffi.cffi_mode,
+        'pango_version': pangocffi.pango_version_string(),
+        'layout_get_size_ns': get_size * 1e9,
+        'layout_iter_next_cluster_ns': next_cluster_time / clusters * 1e9,
+    }
+
+
+def _run_child(abi_mode: bool, calls: int) -> dict:
+    env = dict(os.environ)
+    env.pop('PANGOCFFI_ABI_MODE', None)
+    if abi_mode:
+        env['PANGOCFFI_ABI_MODE'] = '1'
+    output = subprocess.check_output(
+        [sys.executable, '-m', 'benchmarks.call_overhead', '--child',
+         str(calls)],
+        env=env,
+    )
+    return json.loads(output)
+
+
+def main(calls: int = 200000) -> None:
+    results = [_run_child(False, calls), _run_child(True, calls)]
+    if results[0]['cffi_mode'] != 'api':
+        print('API mode extension not found, run `make build-api` first.',
+              file=sys.stderr)
+        results = results[1:]
+    for result in results:
+        print(
+            '{cffi_mode}: Layout.get_size {layout_get_size_ns:.0f} ns/call, '
+            'LayoutIter.next_cluster {layout_iter_next_cluster_ns:.0f} '
+            'ns/call'.format(**result)
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 3 and sys.argv[1] == '--child':
+        print(json.dumps(_measure(int(sys.argv[2]))))
+    else:
+        main()
@@ -0,0 +1,72 @@
+"""
+Compares editing near the end of a long log, laid out as a single
+:class:`Layout`, with editing the same text held in a :class:`Document`,
+which only lays out the paragraphs touched by the edit again.
+
+Usage (from the root of the repository)::
+
+    python -m benchmarks.document_edit
+"""
+
+import json
+import time
+
+
+def _log_lines(count: int) -> str:
+    return ''.join(
+        '2024-01-01 00:00:{:02d} worker-{} processed request {} – Παν語\n'
+        .format(i % 60, i % 8, i * 7919 % 100000)
+        for i in range(count)
+    )
+
+
+def measure(lines: int = 20000, edits: int = 20) -> dict:
+    import pangocffi
+    from pangocffi import Document, Layout
+    from tests.context_creator import ContextCreator
+
+    context_creator = ContextCreator.create_surface_without_output()
+    context = context_creator.get_pango_context_as_class()
+    text = _log_lines(lines)
+    width = 400 * pangocffi.units_from_double(1)
+
+    layout = Layout(context)
+    layout.width = width
+    layout.text = text
+    layout.get_size()
+    start = time.perf_counter()
+    for i in range(edits):
+        text = text[:-1] + 'edit {}\n'.format(i)
+        layout.text = text
+        layout.get_size()
+    layout_time = time.perf_counter() - start
+
+    document = Document(context, _log_lines(lines), width=width)
+    document.height
+    start = time.perf_counter()
+    for i in range(edits):
+        document.insert(document.length - 1, 'edit {}'.format(i))
+        document.height
+    document_time = time.perf_counter() - start
+
+    context_creator.close()
+    return {
+        'cffi_mode': pangocffi.cffi_mode,
+        'bytes': len(text.encode('utf-8')),
+        'edits': edits,
+        'layout_ms_per_edit': layout_time / edits * 1e3,
+        'document_ms_per_edit': document_time / edits * 1e3,
+    }
+
+
+def main() -> None:
+    results = measure()
+    print(
+        'Layout: {layout_ms_per_edit:.2f} ms/edit, '
+        'Document: {document_ms_per_edit:.2f} ms/edit'.format(**results)
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Measures the wall time of ``import pangocffi`` with an empty cache (cold)
+and with a populated cache (warm).
+
+Every import runs in a fresh interpreter. Cold imports use a new, empty
+cache directory each time, so they include resolving the shared libraries
+and parsing the C definitions. Warm imports reuse a cache directory that was
+populated beforehand.
+
+Usage (from the root of the repository)::
+
+    python -m benchmarks.import_time
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_CHILD_SOURCE = '''
+import json, time
+start = time.perf_counter()
+import pangocffi
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'cffi_mode': pangocffi.cffi_mode}))
+'''
+
+
+def _import_once(cache_dir: str) -> dict:
+    env = dict(os.environ)
+    env['PANGOCFFI_CACHE_DIR'] = cache_dir
+    output = subprocess.check_output(
+        [sys.executable, '-c', _CHILD_SOURCE],
+        env=env,
+    )
+    return json.loads(output)
+
+
+def _summarize(results: list) -> dict:
+    seconds = [result['seconds'] for result in results]
+    return {
+        'cffi_mode': results[-1]['cffi_mode'],
+        'runs': len(seconds),
+        'median_ms': statistics.median(seconds) * 1000,
+        'min_ms': min(seconds) * 1000,
+        'max_ms': max(seconds) * 1000,
+    }
+
+
+def measure(runs: int = 10) -> dict:
+    cold = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(_import_once(cache_dir))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        _import_once(cache_dir)
+        warm = [_import_once(cache_dir) for _ in range(runs)]
+
+    return {'cold': _summarize(cold), 'warm': _summarize(warm)}
+
+
+def main() -> None:
+    results = measure()
+    for name in ('cold', 'warm'):
+        print(
+            '{}: median {median_ms:.1f} ms, min {min_ms:.1f} ms, '
+            'max {max_ms:.1f} ms ({cffi_mode})'.format(name, **results[name])
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
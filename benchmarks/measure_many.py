@@ -0,0 +1,66 @@
+"""
+Compares measuring many short texts (such as the cells of a table) one at a
+time through :attr:`Layout.text` and :meth:`Layout.get_size()`, with
+measuring them in a single call to :func:`measure_many()`.
+
+Usage (from the root of the repository)::
+
+    python -m benchmarks.measure_many
+"""
+
+import json
+import time
+
+
+def _cells(count: int) -> list:
+    return ['Cell {} – Παν語 {}'.format(i, i * 7919 % 1000)
+            for i in range(count)]
+
+
+def measure(count: int = 100000) -> dict:
+    import pangocffi
+    from pangocffi import FontDescription, Layout, measure_many
+    from tests.context_creator import ContextCreator
+
+    context_creator = ContextCreator.create_surface_without_output()
+    context = context_creator.get_pango_context_as_class()
+    desc = FontDescription()
+    desc.family = 'sans-serif'
+    desc.size = pangocffi.units_from_double(10)
+    texts = _cells(count)
+
+    start = time.perf_counter()
+    layout = Layout(context)
+    layout.font_description = desc
+    for text in texts:
+        layout.text = text
+        layout.get_size()
+        layout.get_baseline()
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    measure_many(context, texts, desc)
+    measure_many_time = time.perf_counter() - start
+
+    context_creator.close()
+    return {
+        'cffi_mode': pangocffi.cffi_mode,
+        'texts': count,
+        'layout_loop_us_per_text': loop_time / count * 1e6,
+        'measure_many_us_per_text': measure_many_time / count * 1e6,
+    }
+
+
+def main() -> None:
+    results = measure()
+    print(
+        'Layout loop: {layout_loop_us_per_text:.2f} us/text, '
+        'measure_many: {measure_many_us_per_text:.2f} us/text'.format(
+            **results
+        )
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Measures the startup latency of pangocffi:
+
+* ``import_ms``: the wall time of ``import pangocffi``.
+* ``first_layout_ms``: the time to create a cairo-backed :class:`Context` and
+  the first :class:`Layout` from it, after pangocffi has been imported.
+* ``first_paragraph_ms``: the time to set the text of that layout and shape
+  it by computing its extents.
+
+Every run happens in a fresh interpreter. The results are written as JSON,
+together with the versions of Pango, Python and CFFI, so that they can be
+compared across versions.
+
+Usage (from the root of the repository)::
+
+    python -m benchmarks.startup [--runs N] [--cold] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+PARAGRAPH = (
+    'Hi from Παν語! Pango is a library for laying out and rendering of text, '
+    'with an emphasis on internationalization. Pango can be used anywhere '
+    'that text layout is needed, though most of the work on Pango so far has '
+    'been done in the context of the GTK widget toolkit.'
+)
+
+METRICS = ['import_ms', 'first_layout_ms', 'first_paragraph_ms']
+
+
+def _measure_child() -> dict:
+    start = time.perf_counter()
+    import pangocffi
+    import_time = time.perf_counter() - start
+
+    # Loading the test helper's cairo bindings is not part of pangocffi's
+    # startup, so it is excluded from the measurements.
+    from tests.context_creator import ContextCreator
+    ContextCreator.initialise_ffi()
+
+    start = time.perf_counter()
+    context_creator = ContextCreator.create_surface_without_output()
+    layout = pangocffi.Layout(context_creator.get_pango_context_as_class())
+    first_layout_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    layout.width = pangocffi.units_from_double(300)
+    layout.text = PARAGRAPH
+    layout.get_extents()
+    first_paragraph_time = time.perf_counter() - start
+
+    context_creator.close()
+    return {
+        'import_ms': import_time * 1000,
+        'first_layout_ms': first_layout_time * 1000,
+        'first_paragraph_ms': first_paragraph_time * 1000,
+        'cffi_mode': pangocffi.cffi_mode,
+        'pango_version': pangocffi.pango_version_string(),
+    }
+
+
+def _run_child(cache_dir: Optional[str]) -> dict:
+    env = dict(os.environ)
+    if cache_dir is not None:
+        env['PANGOCFFI_CACHE_DIR'] = cache_dir
+    output = subprocess.check_output(
+        [sys.executable, '-m', 'benchmarks.startup', '--child'],
+        env=env,
+    )
+    return json.loads(output)
+
+
+def measure(runs: int = 10, cold: bool = False) -> dict:
+    """
+    :param runs:
+        the number of interpreters to measure.
+    :param cold:
+        whether every run should start with an empty pangocffi cache.
+    :return:
+        the environment and the median, minimum and maximum of each metric.
+    """
+    results = []
+    for _ in range(runs):
+        if cold:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                results.append(_run_child(cache_dir))
+        else:
+            results.append(_run_child(None))
+
+    import cffi
+    summary = {
+        'pango_version': results[-1]['pango_version'],
+        'cffi_mode': results[-1]['cffi_mode'],
+        'cffi_version': cffi.__version__,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cold_cache': cold,
+        'runs': runs,
+    }
+    for metric in METRICS:
+        values = [result[metric] for result in results]
+        summary[metric] = {
+            'median': statistics.median(values),
+            'min': min(values),
+            'max': max(values),
+        }
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Measures the startup latency of pangocffi.'
+    )
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument(
+        '--cold',
+        action='store_true',
+        help='start every run with an empty pangocffi cache'
+    )
+    parser.add_argument('--output', help='write the JSON results to a file')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_measure_child()))
+        return
+
+    results = measure(args.runs, args.cold)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Measures how laying out a corpus of paragraphs with a
+:class:`LayoutThreadPool` scales with the number of threads.
+
+Every thread lays out paragraphs with its own :class:`Context`, and Pango
+releases the GIL while it lays out text, so the throughput should increase
+with the number of threads up to the number of cores.
+
+Usage (from the root of the repository)::
+
+    python -m benchmarks.thread_scaling
+"""
+
+import json
+import os
+import time
+
+THREAD_COUNTS = [1, 2, 4, 8]
+
+PARAGRAPH = (
+    'Hi from Παν語! Pango is a library for laying out and rendering of text, '
+    'with an emphasis on internationalization. Pango can be used anywhere '
+    'that text layout is needed, though most of the work on Pango so far has '
+    'been done in the context of the GTK widget toolkit. '
+)
+
+
+def _corpus(paragraphs: int) -> list:
+    from pangocffi import ParagraphSpec, units_from_double
+
+    return [
+        ParagraphSpec(
+            PARAGRAPH * (1 + i % 8),
+            'sans-serif 11',
+            width=units_from_double(300 + i % 5 * 40)
+        )
+        for i in range(paragraphs)
+    ]
+
+
+def measure(paragraphs: int = 2000) -> dict:
+    import pangocffi
+    from pangocffi import LayoutThreadPool
+    from tests.context_creator import ContextCreator, create_pango_context
+
+    ContextCreator.initialise_ffi()
+    specs = _corpus(paragraphs)
+    results = []
+    for threads in THREAD_COUNTS:
+        with LayoutThreadPool(
+            create_pango_context,
+            max_workers=threads,
+            warm_font_descriptions=['sans-serif 11']
+        ) as pool:
+            # Create the contexts of every thread before timing.
+            for future in [pool.submit(spec) for spec in specs[:threads]]:
+                future.result()
+            start = time.perf_counter()
+            for _ in pool.map(specs):
+                pass
+            elapsed = time.perf_counter() - start
+        results.append({
+            'threads': threads,
+            'seconds': elapsed,
+            'paragraphs_per_second': paragraphs / elapsed,
+        })
+    for result in results:
+        result['speedup'] = \
+            result['paragraphs_per_second'] / \
+            results[0]['paragraphs_per_second']
+    return {
+        'cffi_mode': pangocffi.cffi_mode,
+        'pango_version': pangocffi.pango_version_string(),
+        'cpu_count': os.cpu_count(),
+        'paragraphs': paragraphs,
+        'results': results,
+    }
+
+
+def main() -> None:
+    results = measure()
+    for result in results['results']:
+        print(
+            '{threads} threads: {paragraphs_per_second:.0f} paragraphs/s '
+            '({speedup:.2f}x)'.format(**result)
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
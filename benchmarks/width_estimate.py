@@ -0,0 +1,66 @@
+"""
+Compares measuring many short Latin texts (such as the cells of a table)
+with :func:`measure_many()`, with estimating their widths from the advance
+table of a :class:`WidthEstimator`.
+
+Usage (from the root of the repository)::
+
+    python -m benchmarks.width_estimate
+"""
+
+import json
+import time
+
+
+def _cells(count: int) -> list:
+    return ['Cell {} – Total {}'.format(i, i * 7919 % 1000)
+            for i in range(count)]
+
+
+def measure(count: int = 100000) -> dict:
+    import pangocffi
+    from pangocffi import FontDescription, WidthEstimator, measure_many
+    from tests.context_creator import ContextCreator
+
+    context_creator = ContextCreator.create_surface_without_output()
+    context = context_creator.get_pango_context_as_class()
+    desc = FontDescription()
+    desc.family = 'sans-serif'
+    desc.size = pangocffi.units_from_double(10)
+    texts = _cells(count)
+
+    start = time.perf_counter()
+    measure_many(context, texts, desc)
+    measure_many_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    estimator = WidthEstimator(context, desc)
+    estimator.estimate('')
+    table_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    estimator.estimate_many(texts)
+    estimate_time = time.perf_counter() - start
+
+    context_creator.close()
+    return {
+        'cffi_mode': pangocffi.cffi_mode,
+        'texts': count,
+        'measure_many_us_per_text': measure_many_time / count * 1e6,
+        'estimate_us_per_text': estimate_time / count * 1e6,
+        'table_ms': table_time * 1e3,
+    }
+
+
+def main() -> None:
+    results = measure()
+    print(
+        'measure_many: {measure_many_us_per_text:.2f} us/text, '
+        'estimate_many: {estimate_us_per_text:.2f} us/text '
+        '(table built in {table_ms:.0f} ms)'.format(**results)
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
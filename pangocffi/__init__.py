@@ -1,11 +1,17 @@
+import importlib
 import os
 import warnings
-from typing import List
+from typing import Dict, List
 import ctypes.util
-from .ffi_build import ffi
+from . import cache as _cache
 
 
-def _dlopen(dl_name: str, generated_ffi, names: List[str]):
+def _dlopen(
+        dl_name: str,
+        generated_ffi,
+        names: List[str],
+        library_paths: Dict[str, dict]
+):
     """
     :param dl_name:
         The name of the dynamic library. This is also used to determine the
@@ -15,10 +21,16 @@ def _dlopen(dl_name: str, generated_ffi, names: List[str]):
         The FFI for pango/gobject/glib, generated by pangocffi.
     :param names:
         An array of library names commonly used across different platforms.
+    :param library_paths:
+        The library paths loaded from :mod:`pangocffi.cache`. The cached path
+        is tried before searching for the library, and is updated with the
+        path that was opened.
     :return:
         A FFILibrary instance for the library.
     """
 
+    search_names = list(names)
+
     # Try environment locations if set
     env_location = os.getenv(f'{dl_name.upper()}_LOCATION')
     if env_location:
@@ -29,6 +41,15 @@ def _dlopen(dl_name: str, generated_ffi, names: List[str]):
             warnings.warn(f"dlopen() failed to load {dl_name} library:"
                           f" '{env_location}'. Falling back.")
 
+    # Try the path that was opened the last time pangocffi was imported, which
+    # avoids the cost of ``ctypes.util.find_library()``.
+    cached_path = _cache.get_library_path(library_paths, dl_name, search_names)
+    if cached_path:
+        try:
+            return generated_ffi.dlopen(cached_path)
+        except OSError:
+            pass
+
     # Try various names for the same library, for different platforms.
     for name in names:
         for lib_name in (name, 'lib' + name):
@@ -36,6 +57,9 @@ def _dlopen(dl_name: str, generated_ffi, names: List[str]):
                 path = ctypes.util.find_library(lib_name)
                 lib = generated_ffi.dlopen(path or lib_name)
                 if lib:
+                    _cache.set_library_path(
+                        library_paths, dl_name, search_names, path or lib_name
+                    )
                     return lib
             except OSError:
                 pass
@@ -44,30 +68,122 @@ def _dlopen(dl_name: str, generated_ffi, names: List[str]):
     )
 
 
-pango = _dlopen('pango', ffi, ['pango', 'pango-1', 'pango-1.0', 'pango-1.0-0'])
-gobject = _dlopen('gobject', ffi, ['gobject-2.0', 'gobject-2.0-0'])
-glib = _dlopen('glib', ffi, ['glib-2.0', 'glib-2.0-0'])
+# Prefer the compiled API-mode extension if it has been built (see
+# ``setup.py``), since calls through it avoid libffi's marshalling. Otherwise
+# fall back to loading the libraries at runtime in ABI mode.
+try:
+    if os.getenv('PANGOCFFI_ABI_MODE'):
+        raise ImportError('API mode disabled by PANGOCFFI_ABI_MODE')
+    from ._generated.ffi_api import ffi, lib as pango
+    gobject = pango
+    glib = pango
+    cffi_mode = 'api'
+    _library_paths = {}
+except ImportError:
+    from .ffi_build import ffi
+    _library_paths = _cache.load_library_paths()
+    _cached_library_paths = dict(_library_paths)
+    pango = _dlopen(
+        'pango',
+        ffi,
+        ['pango', 'pango-1', 'pango-1.0', 'pango-1.0-0'],
+        _library_paths
+    )
+    gobject = _dlopen(
+        'gobject', ffi, ['gobject-2.0', 'gobject-2.0-0'], _library_paths
+    )
+    glib = _dlopen('glib', ffi, ['glib-2.0', 'glib-2.0-0'], _library_paths)
+    if _library_paths != _cached_library_paths:
+        _cache.store_library_paths(_library_paths)
+    cffi_mode = 'abi'
+
+# The wrapper API is imported lazily (PEP 562), so that only the modules that
+# are actually used get imported. Each name maps to the submodule that
+# defines it.
+_LAZY_IMPORTS = {
+    'pango_version': 'version',
+    'pango_version_string': 'version',
+    'Style': 'enums',
+    'Weight': 'enums',
+    'Variant': 'enums',
+    'Stretch': 'enums',
+    'FontMask': 'enums',
+    'Alignment': 'enums',
+    'EllipsizeMode': 'enums',
+    'WrapMode': 'enums',
+    'Direction': 'enums',
+    'LogAttrFlag': 'enums',
+    'LayoutSerializeFlags': 'enums',
+    'LayoutDeserializeFlags': 'enums',
+    'Gravity': 'enums',
+    'GravityHint': 'enums',
+    'Underline': 'enums',
+    'TabAlign': 'enums',
+    'units_to_double': 'convert',
+    'units_from_double': 'convert',
+    'PangoObject': 'pango_object',
+    'Language': 'language',
+    'FontMetrics': 'font_metrics',
+    'Font': 'font',
+    'FontDescription': 'font_description',
+    'Rectangle': 'rectangle',
+    'Item': 'item',
+    'Context': 'context',
+    'GlyphItem': 'glyph_item',
+    'GlyphItemIter': 'glyph_item_iter',
+    'Attribute': 'attribute',
+    'AttrList': 'attr_list',
+    'TabArray': 'tab_array',
+    'LayoutRun': 'layout_run',
+    'LayoutIter': 'layout_iter',
+    'LayoutLine': 'layout_line',
+    'LineMetrics': 'layout_line',
+    'Layout': 'layout',
+    'Color': 'color',
+    'TextIndex': 'text_index',
+    'ChangeTracker': 'change_tracker',
+    'Document': 'document',
+    'find_paragraph_boundary': 'document',
+    'StreamedLine': 'stream',
+    'stream_lines': 'stream',
+    'Paginator': 'paginate',
+    'PageBreaks': 'paginate',
+    'MeasurementCache': 'measure',
+    'measure_many': 'measure',
+    'ColumnWidth': 'measure',
+    'column_width': 'measure',
+    'WidthEstimator': 'estimate',
+    'LATIN_CHARACTERS': 'estimate',
+    'fit_font_size': 'fit',
+    'fit_font_sizes': 'fit',
+    'ParagraphSpec': 'pool',
+    'ParagraphResult': 'pool',
+    'layout_paragraph': 'pool',
+    'warm_fonts': 'pool',
+    'LayoutProcessPool': 'pool',
+    'ContextRegistry': 'pool',
+    'LayoutThreadPool': 'pool',
+}
+
+__all__ = ['ffi', 'pango', 'gobject', 'glib', 'cffi_mode'] + \
+    list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        # Submodules, such as ``pangocffi.layout``, are attributes too
+        try:
+            return importlib.import_module(f'{__name__}.{name}')
+        except ModuleNotFoundError as error:
+            if error.name != f'{__name__}.{name}':
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module('.' + module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
 
-# Imports are normally always put at the top of the file.
-# But the wrapper API requires that the pango library be loaded first.
-# Therefore, we have to disable linting rules for these lines.
-from .version import *  # noqa
-from .enums import *  # noqa
-from .convert import *  # noqa
-from .pango_object import PangoObject  # noqa
-from .language import Language  # noqa
-from .font_metrics import FontMetrics  # noqa
-from .font import Font  # noqa
-from .font_description import FontDescription  # noqa
-from .rectangle import Rectangle  # noqa
-from .item import Item  # noqa
-from .context import Context  # noqa
-from .glyph_item import GlyphItem  # noqa
-from .glyph_item_iter import GlyphItemIter  # noqa
-from .attribute import Attribute  # noqa
-from .attr_list import AttrList  # noqa
-from .tab_array import TabArray # noqa
-from .layout_run import LayoutRun  # noqa
-from .layout_iter import LayoutIter  # noqa
-from .layout import Layout  # noqa
-from .color import Color  # noqa
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,185 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, Tuple
+
+from .context import Context
+from .pool import ContextRegistry, ParagraphResult, ParagraphSpec
+
+_Extents = Tuple[int, int, int, int]
+
+
+class AsyncLayoutPool:
+    """
+    An :class:`AsyncLayoutPool` lays out text for :mod:`asyncio` code without
+    blocking the event loop. Its coroutines dispatch the work to a bounded
+    pool of threads, each owning its own :class:`Context` and
+    :class:`Layout` (see :class:`ContextRegistry`), and Pango releases the
+    GIL while it lays out text, so a very large paragraph only occupies one
+    worker while other requests continue to be served.
+
+    At most ``max_pending`` calls are scheduled on the workers at once.
+    Further calls wait for a free slot without blocking the event loop,
+    which applies backpressure to callers when the workers are saturated.
+
+    Cancelling a call that has not started yet removes it from the queue.
+    A call that has already started can't be interrupted, but its slot is
+    only released once the worker has finished with it.
+
+    Paragraphs are described with :class:`ParagraphSpec` objects. Every
+    worker keeps the last paragraph it laid out, so several calls for the
+    same paragraph, such as repeated calls to :meth:`hit_test()`, only lay
+    it out once if they run on the same worker.
+
+    The pool must only be used from one event loop. It can be used as an
+    asynchronous context manager, which shuts it down on exit::
+
+        async with AsyncLayoutPool(create_context) as pool:
+            result = await pool.layout_lines(ParagraphSpec(text, 'Sans 11'))
+    """
+
+    def __init__(
+            self,
+            context_factory: Callable[[], Context],
+            max_workers: Optional[int] = None,
+            max_pending: Optional[int] = None,
+            warm_font_descriptions: Sequence[str] = ()
+    ):
+        """
+        :param context_factory:
+            a function that returns a new :class:`Context`, which is called
+            once in every worker thread. See :class:`ContextRegistry`.
+        :param max_workers:
+            the number of worker threads, which defaults to the number of
+            CPUs.
+        :param max_pending:
+            the maximum number of calls scheduled on the workers at once,
+            which defaults to twice the number of workers.
+        :param warm_font_descriptions:
+            font descriptions to load once in every worker, see
+            :func:`warm_fonts()`.
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._max_pending = max_pending or 2 * self._max_workers
+        assert self._max_pending > 0, "max_pending isn't positive"
+        self._registry = ContextRegistry(
+            context_factory,
+            warm_font_descriptions
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix='pangocffi-aio',
+            initializer=self._registry.get_context
+        )
+        self._semaphore = asyncio.Semaphore(self._max_pending)
+
+    @property
+    def max_workers(self) -> int:
+        """The number of worker threads."""
+        return self._max_workers
+
+    @property
+    def max_pending(self) -> int:
+        """The maximum number of calls scheduled on the workers at once."""
+        return self._max_pending
+
+    async def _run(self, function: Callable, *args):
+        loop = asyncio.get_running_loop()
+        await self._semaphore.acquire()
+
+        def release(_) -> None:
+            try:
+                loop.call_soon_threadsafe(self._semaphore.release)
+            except RuntimeError:
+                # The event loop has been closed.
+                pass
+
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    async def measure(self, spec: ParagraphSpec) -> Tuple[_Extents, _Extents]:
+        """
+        Computes the ink and logical extents of a paragraph.
+
+        :param spec:
+            the paragraph to measure.
+        :return:
+            a tuple containing the ink extents and the logical extents of the
+            paragraph, each as a tuple of ``(x, y, width, height)`` in Pango
+            units.
+        """
+        return await self._run(self._measure, spec)
+
+    def _measure(self, spec: ParagraphSpec) -> Tuple[_Extents, _Extents]:
+        layout = self._registry.get_layout_for(spec)
+        ink, logical = layout.get_extents()
+        return (
+            (ink.x, ink.y, ink.width, ink.height),
+            (logical.x, logical.y, logical.width, logical.height)
+        )
+
+    async def layout_lines(self, spec: ParagraphSpec) -> ParagraphResult:
+        """
+        Lays out a paragraph and returns its extents and line breaks. See
+        :func:`layout_paragraph()`.
+
+        :param spec:
+            the paragraph to lay out.
+        :return:
+            the extents and line breaks of the paragraph.
+        """
+        return await self._run(self._registry.layout_paragraph, spec)
+
+    async def hit_test(
+            self,
+            spec: ParagraphSpec,
+            x: int,
+            y: int
+    ) -> Tuple[int, int, bool]:
+        """
+        Converts a position within a paragraph to the character at that
+        position, as ``pango_layout_xy_to_index()`` does.
+
+        :param spec:
+            the paragraph to hit test.
+        :param x:
+            the x offset from the left edge of the paragraph, in Pango units.
+        :param y:
+            the y offset from the top edge of the paragraph, in Pango units.
+        :return:
+            a tuple containing the character offset into the text of the
+            grapheme at the position, the number of characters from the
+            start of the grapheme to the edge closest to the position
+            (``0`` for the leading edge), and whether the position was
+            inside the paragraph.
+        """
+        return await self._run(self._hit_test, spec, x, y)
+
+    def _hit_test(
+            self,
+            spec: ParagraphSpec,
+            x: int,
+            y: int
+    ) -> Tuple[int, int, bool]:
+        layout = self._registry.get_layout_for(spec)
+        index, trailing, inside = layout.xy_to_index(x, y)
+        return layout.text_index.byte_to_char(index), trailing, inside
+
+    async def shutdown(self) -> None:
+        """
+        Shuts down the workers, after waiting for the scheduled calls to
+        finish.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self) -> 'AsyncLayoutPool':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.shutdown()
@@ -1,4 +1,16 @@
-from . import ffi, pango, Attribute, PangoObject
+from . import ffi, glib, pango
+from .attribute import Attribute
+from .pango_object import PangoObject
+from .version import pango_version
+
+
+def _check_serialization_supported() -> None:
+    # pango_attr_list_to_string() and pango_attr_list_from_string() were
+    # added in Pango 1.50.
+    if pango_version() < 15000:
+        raise NotImplementedError(
+            "Serializing an AttrList requires Pango 1.50 or later."
+        )
 
 
 class AttrList(PangoObject):
@@ -119,6 +131,44 @@ class AttrList(PangoObject):
             length,
         )
 
+    def to_string(self) -> str:
+        """
+        Serializes the attribute list to a string, in the format accepted by
+        :meth:`from_string()`. Requires Pango 1.50 or later.
+
+        :return:
+            the serialized attribute list
+        :raises: NotImplementedError
+            When Pango is older than 1.50.
+        """
+        _check_serialization_supported()
+        string = ffi.gc(
+            pango.pango_attr_list_to_string(self._pointer),
+            glib.g_free,
+        )
+        return ffi.string(string).decode("utf-8")
+
+    @classmethod
+    def from_string(cls, text: str) -> "AttrList":
+        """
+        Deserializes an attribute list that was serialized with
+        :meth:`to_string()`. Requires Pango 1.50 or later.
+
+        :param text:
+            the serialized attribute list
+        :return:
+            a new :class:`AttrList`
+        :raises: ValueError
+            When ``text`` isn't a valid serialized attribute list.
+        :raises: NotImplementedError
+            When Pango is older than 1.50.
+        """
+        _check_serialization_supported()
+        pointer = pango.pango_attr_list_from_string(text.encode("utf-8"))
+        if pointer == ffi.NULL:
+            raise ValueError("text isn't a valid serialized AttrList")
+        return cls.from_pointer(pointer, gc=True)
+
     # avoid _EQ_METHOD since pango_attr_list_equal is a newer method
     def __eq__(self, other) -> bool:
         if isinstance(other, PangoObject):
@@ -1,5 +1,8 @@
-from . import FontDescription, Underline, ffi, pango, PangoObject
-from .enums import Gravity, GravityHint, Stretch, Style, Variant, Weight
+from . import ffi, pango
+from .enums import Gravity, GravityHint, Stretch, Style, Underline, \
+    Variant, Weight
+from .font_description import FontDescription
+from .pango_object import PangoObject
 from .rectangle import Rectangle
 
 
@@ -0,0 +1,387 @@
+"""
+    pangocffi.cache
+    ~~~~~~~~~~~~~~~
+
+    Persistent caches used to speed up importing pangocffi.
+
+    Resolving the shared libraries with ``ctypes.util.find_library()`` can
+    shell out to ``ldconfig`` or a compiler, so the paths that were
+    successfully opened are stored in the user's cache directory and tried
+    first on subsequent imports.
+
+    Parsing the C definitions with pycparser is the other large cost of
+    importing pangocffi, so the parsed declarations are also stored in the
+    cache directory, and fed to a new :class:`cffi.FFI` on subsequent
+    imports.
+
+    This module must not depend on the libraries being loaded, since it is
+    used while loading them.
+"""
+
+import _cffi_backend
+import hashlib
+import json
+import os
+import pickle
+import platform
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+LIBRARY_CACHE_FILENAME = 'libraries.json'
+
+FFI_CACHE_FILENAME_FORMAT = 'ffi_{}.pickle'
+
+_C_DEFINITIONS = [
+    Path(__file__).parent / 'c_definitions_glib.txt',
+    Path(__file__).parent / 'c_definitions_pango.txt',
+]
+
+_FINGERPRINT_ENVIRONMENT_VARIABLES = [
+    'LD_LIBRARY_PATH',
+    'DYLD_LIBRARY_PATH',
+    'DYLD_FALLBACK_LIBRARY_PATH',
+    'PANGO_LOCATION',
+    'GOBJECT_LOCATION',
+    'GLIB_LOCATION',
+]
+
+_LD_SO_CACHE = '/etc/ld.so.cache'
+
+
+def cache_dir() -> Optional[Path]:
+    """
+    Returns the directory the caches are stored in.
+
+    The directory can be set with the ``PANGOCFFI_CACHE_DIR`` environment
+    variable. Setting it to an empty string disables caching. Otherwise the
+    platform's user cache directory is used.
+
+    :return:
+        the cache directory, or ``None`` if caching is disabled.
+    """
+    env_cache_dir = os.getenv('PANGOCFFI_CACHE_DIR')
+    if env_cache_dir is not None:
+        return Path(env_cache_dir) if env_cache_dir else None
+
+    if sys.platform == 'win32':
+        base = os.getenv('LOCALAPPDATA')
+        if base:
+            return Path(base) / 'pangocffi' / 'Cache'
+    elif sys.platform == 'darwin':
+        return Path.home() / 'Library' / 'Caches' / 'pangocffi'
+    else:
+        base = os.getenv('XDG_CACHE_HOME')
+        if base:
+            return Path(base) / 'pangocffi'
+    return Path.home() / '.cache' / 'pangocffi'
+
+
+def environment_fingerprint() -> str:
+    """
+    Returns a cheap fingerprint of the parts of the environment that affect
+    which shared libraries are found: the platform, the library search path
+    variables, the ``*_LOCATION`` overrides, and the modification time of the
+    dynamic linker's cache.
+
+    :return:
+        a hex digest identifying the environment.
+    """
+    values = [sys.platform, platform.machine(), str(sys.maxsize > 2 ** 32)]
+    for name in _FINGERPRINT_ENVIRONMENT_VARIABLES:
+        values.append(os.getenv(name, ''))
+    if sys.platform == 'win32':
+        values.append(os.getenv('PATH', ''))
+    try:
+        values.append(str(os.stat(_LD_SO_CACHE).st_mtime_ns))
+    except OSError:
+        values.append('')
+    return hashlib.sha1('\0'.join(values).encode('utf-8')).hexdigest()
+
+
+def _is_trusted(path: Path) -> bool:
+    # The cache directory may be shared with other users, whose files must
+    # not be used: they could make pangocffi open another library, or run
+    # code when the declarations are unpickled. Only files owned by the
+    # current user, that nobody else can write to, are read.
+    try:
+        stat = os.stat(str(path))
+    except OSError:
+        return False
+    if not hasattr(os, 'getuid'):
+        return True
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    if not _is_trusted(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _replace_atomically(path: Path, write: Callable[[str], None]) -> bool:
+    """
+    Calls ``write`` with a temporary filename next to ``path``, and then
+    moves the temporary file to ``path``, so that concurrent readers never
+    see a partially written file.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=str(path.parent),
+            prefix=path.name,
+            suffix='.tmp'
+        )
+        os.close(file_descriptor)
+        try:
+            write(temp_path)
+            os.replace(temp_path, str(path))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        return False
+    return True
+
+
+def _write_atomically(path: Path, content: str) -> bool:
+    def write(temp_path: str) -> None:
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+    return _replace_atomically(path, write)
+
+
+def load_library_paths() -> Dict[str, dict]:
+    """
+    Reads the library paths that were stored for the current environment.
+
+    :return:
+        a dictionary keyed by library name (such as ``'pango'``), with the
+        names that were searched and the path that was opened. The dictionary
+        is empty if nothing was cached or the environment has changed.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return {}
+    data = _read_json(directory / LIBRARY_CACHE_FILENAME)
+    if data is None or data.get('fingerprint') != environment_fingerprint():
+        return {}
+    libraries = data.get('libraries')
+    return libraries if isinstance(libraries, dict) else {}
+
+
+def store_library_paths(libraries: Dict[str, dict]) -> Optional[Path]:
+    """
+    Stores the library paths for the current environment. Failing to write
+    the cache (for example on a read-only file system) is not an error.
+
+    :param libraries:
+        a dictionary in the format returned by :func:`load_library_paths()`.
+    :return:
+        the path of the cache file, or ``None`` if it was not written.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return None
+    path = directory / LIBRARY_CACHE_FILENAME
+    content = json.dumps({
+        'fingerprint': environment_fingerprint(),
+        'libraries': libraries,
+    }, indent=2, sort_keys=True)
+    return path if _write_atomically(path, content) else None
+
+
+def get_library_path(
+        libraries: Dict[str, dict],
+        dl_name: str,
+        names: List[str]
+) -> Optional[str]:
+    """
+    :param libraries:
+        a dictionary in the format returned by :func:`load_library_paths()`.
+    :param dl_name:
+        the name of the dynamic library, such as ``'pango'``.
+    :param names:
+        the library names that would be searched for.
+    :return:
+        the cached path, or ``None`` if it was cached for different names.
+    """
+    entry = libraries.get(dl_name)
+    if not isinstance(entry, dict) or entry.get('names') != names:
+        return None
+    return entry.get('path')
+
+
+def set_library_path(
+        libraries: Dict[str, dict],
+        dl_name: str,
+        names: List[str],
+        path: str
+) -> None:
+    """
+    Records the path that was opened for a dynamic library.
+    """
+    libraries[dl_name] = {'names': list(names), 'path': path}
+
+
+def c_definitions_digest() -> str:
+    """
+    Returns a digest of the C definitions and the versions of CFFI and
+    Python, which identifies the cached declarations that can be used.
+
+    :return:
+        a hex digest.
+    """
+    digest = hashlib.sha1(_cffi_backend.__version__.encode('ascii'))
+    digest.update(sys.version.encode('utf-8'))
+    for path in _C_DEFINITIONS:
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def _ffi_cache_path() -> Optional[Path]:
+    directory = cache_dir()
+    if directory is None:
+        return None
+    return directory / FFI_CACHE_FILENAME_FORMAT.format(
+        c_definitions_digest()
+    )
+
+
+# CFFI has no public API to declare types without parsing C source, so the
+# declarations are read from and written to the parser's internal state. This
+# is only valid for the CFFI version the cache was written with, which is part
+# of the digest.
+
+# A struct that the cached FFI must be able to size, since pangocffi needs it
+# while being imported.
+_CHECKED_STRUCT = 'PangoLogAttr'
+
+
+def _has_built_types(declarations: dict) -> bool:
+    # CFFI marks the model of a struct or union as completed once its ctype
+    # has been built, and a completed model can't be built again by another
+    # FFI.
+    return any(
+        getattr(tp, 'completed', 0) for tp, _ in declarations.values()
+    )
+
+
+def load_ffi(source: Optional[str] = None):
+    """
+    Creates an FFI from the declarations that were previously stored with
+    :func:`store_ffi()`, without parsing the C definitions.
+
+    :param source:
+        The name of the out-of-line module to set as the FFI's source, such
+        as ``pangocffi._generated.ffi``, or ``None`` to not set a source.
+    :return:
+        a :class:`cffi.FFI`, or ``None`` if the declarations have not been
+        cached for the current C definitions, are not owned by the current
+        user, or could not be loaded.
+    """
+    from cffi import FFI
+
+    path = _ffi_cache_path()
+    if path is None or not _is_trusted(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            declarations, int_constants, cdef_sources = pickle.load(file)
+        if _has_built_types(declarations):
+            return None
+        ffi = FFI()
+        ffi._parser._declarations.update(declarations)
+        ffi._parser._int_constants.update(int_constants)
+        ffi._cdefsources.extend(cdef_sources)
+        ffi.sizeof(_CHECKED_STRUCT)
+    except Exception:
+        return None
+    if source is not None:
+        ffi.set_source(source, None)
+    return ffi
+
+
+def store_ffi(ffi) -> Optional[Path]:
+    """
+    Stores the declarations of the given FFI in the cache. Failing to write
+    the cache is not an error.
+
+    The FFI must have just been created, since the declarations of types
+    that have been used can't be loaded again. Such an FFI isn't stored.
+
+    :param ffi:
+        a :class:`cffi.FFI` with the C definitions declared, that hasn't
+        been used yet.
+    :return:
+        the path of the cache file, or ``None`` if it was not written.
+    """
+    path = _ffi_cache_path()
+    if path is None or _has_built_types(ffi._parser._declarations):
+        return None
+    content = pickle.dumps(
+        (ffi._parser._declarations, ffi._parser._int_constants,
+         ffi._cdefsources),
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+    def write(temp_path: str) -> None:
+        with open(temp_path, 'wb') as file:
+            file.write(content)
+
+    return path if _replace_atomically(path, write) else None
+
+
+def populate() -> Optional[Path]:
+    """
+    Writes the paths of the libraries loaded by pangocffi and the parsed C
+    definitions to the cache. This is intended to be run when building
+    container images, so that workers never have to search for the libraries
+    or parse the C definitions::
+
+        python -m pangocffi.cache
+
+    :return:
+        the path of the cache directory, or ``None`` if caching is disabled.
+    """
+    import pangocffi
+    if cache_dir() is None:
+        return None
+    if pangocffi._library_paths:
+        store_library_paths(pangocffi._library_paths)
+    # The FFI in use can't be stored once its types have been used, so the
+    # C definitions are parsed again.
+    from .ffi_instance_builder import FFIInstanceBuilder
+    store_ffi(FFIInstanceBuilder().generate())
+    return cache_dir()
+
+
+def clear() -> None:
+    """
+    Removes the cached library paths and C definitions.
+    """
+    directory = cache_dir()
+    if directory is None or not directory.exists():
+        return
+    paths = [directory / LIBRARY_CACHE_FILENAME]
+    paths += directory.glob(FFI_CACHE_FILENAME_FORMAT.format('*'))
+    for path in paths:
+        try:
+            os.unlink(str(path))
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == '__main__':
+    cache_path = populate()
+    if cache_path is None:
+        print('Caching is disabled.')
+    else:
+        print(f'Cached pangocffi in {cache_path}')
@@ -0,0 +1,77 @@
+from typing import Optional, Tuple, Union
+
+from .context import Context
+from .layout import Layout
+
+
+class ChangeTracker:
+    """
+    A :class:`ChangeTracker` detects whether any of a set of :class:`Layout`
+    and :class:`Context` objects has changed since it was last updated, by
+    comparing their serial numbers (see :attr:`Layout.serial` and
+    :attr:`Context.serial`). This lets values derived from them, such as
+    extents, line metrics or glyph positions, be kept until they are stale,
+    rather than being computed again every time they are needed::
+
+        tracker = ChangeTracker(layout)
+        line_metrics = None
+
+        def get_line_metrics():
+            global line_metrics
+            if tracker.update():
+                line_metrics = layout.line_metrics()
+            return line_metrics
+
+    The serial of a layout also changes when its context changes, so it is
+    enough to track the layout.
+    """
+
+    def __init__(self, *objects: Union[Layout, Context]):
+        """
+        :param objects:
+            the :class:`Layout` and :class:`Context` objects to track.
+        :raises: AssertionError
+            When no objects are given.
+        """
+        assert len(objects) > 0, "no objects to track"
+        self._objects = objects
+        self._serials: Optional[Tuple[int, ...]] = None
+
+    @property
+    def objects(self) -> Tuple[Union[Layout, Context], ...]:
+        """The tracked objects."""
+        return self._objects
+
+    @property
+    def serials(self) -> Tuple[int, ...]:
+        """The current serial numbers of the tracked objects."""
+        return tuple(tracked.serial for tracked in self._objects)
+
+    @property
+    def changed(self) -> bool:
+        """
+        Whether any of the tracked objects has changed since the tracker was
+        last updated, or the tracker has never been updated.
+        """
+        return self.serials != self._serials
+
+    def update(self) -> bool:
+        """
+        Records the current serial numbers of the tracked objects, so that
+        they are considered unchanged from now on.
+
+        :return:
+            whether any of the tracked objects had changed since the tracker
+            was last updated, as :attr:`changed` would have returned.
+        """
+        serials = self.serials
+        changed = serials != self._serials
+        self._serials = serials
+        return changed
+
+    def invalidate(self) -> None:
+        """
+        Forgets the recorded serial numbers, so that the tracked objects are
+        considered changed until the tracker is next updated.
+        """
+        self._serials = None
@@ -1,5 +1,5 @@
 from . import ffi, glib, pango
-from . import PangoObject
+from .pango_object import PangoObject
 
 
 class Color(PangoObject):
@@ -1,5 +1,10 @@
-from . import pango, ffi, Font, FontDescription, Gravity, GravityHint, \
-    PangoObject
+from . import pango, ffi
+from .enums import Gravity, GravityHint
+from .font import Font
+from .font_description import FontDescription
+from .font_metrics import FontMetrics
+from .language import Language
+from .pango_object import PangoObject
 from typing import Optional
 
 
@@ -79,6 +84,31 @@ class Context(PangoObject):
     :meth:`Gravity.EAST` or :meth:`Gravity.WEST`.
     """
 
+    def _get_serial(self) -> int:
+        return pango.pango_context_get_serial(self._pointer)
+
+    serial: int = property(_get_serial)
+    """
+    The current serial number of the context. The serial number is
+    initialized to a small number larger than zero when a new context is
+    created, and is increased whenever the context is changed using any of
+    its setters or its font map, or :meth:`changed()` is called. It never
+    goes back to zero, and only wraps around after 2³² changes.
+
+    This can be used to detect cheaply whether a context has changed since
+    it was last used, for instance with :class:`ChangeTracker`.
+    """
+
+    def changed(self) -> None:
+        """
+        Forces a change in the context, which increases its :attr:`serial`.
+        This is only needed when the context depends on state that Pango
+        can't track, such as changes made to its font map outside of Pango.
+        The layouts of the context are laid out again when they are next
+        used.
+        """
+        pango.pango_context_changed(self._pointer)
+
     def load_font(self, desc: FontDescription) -> Optional[Font]:
         """
         Loads the font in one of the fontmaps in the context that is the
@@ -94,3 +124,36 @@ class Context(PangoObject):
         if font_pointer == ffi.NULL:
             return None
         return Font.from_pointer(font_pointer)
+
+    def get_metrics(
+            self,
+            desc: Optional[FontDescription] = None,
+            language: Optional[Language] = None
+    ) -> FontMetrics:
+        """
+        Gets overall metric information for a particular font description.
+        The metrics may be substantially different for different scripts,
+        so a language tag can be provided to get the metrics of the fonts
+        that would be used for that language.
+
+        :param desc:
+            the :class:`FontDescription` to get the metrics for, or ``None``
+            to use the font description of the context.
+        :param language:
+            Language tag used to determine which script to get the metrics
+            for, or ``None`` to get the metrics for the entire font.
+        :return:
+            A :class:`FontMetrics` object.
+        """
+        desc_pointer = ffi.NULL
+        if desc is not None:
+            desc_pointer = desc._pointer
+        language_pointer = ffi.NULL
+        if language is not None:
+            language_pointer = language._pointer
+        metrics_pointer = pango.pango_context_get_metrics(
+            self._pointer, desc_pointer, language_pointer
+        )
+        return FontMetrics.from_pointer(
+            ffi.gc(metrics_pointer, pango.pango_font_metrics_unref)
+        )
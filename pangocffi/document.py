@@ -0,0 +1,622 @@
+import bisect
+import itertools
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from . import ffi, glib, pango
+from .attr_list import AttrList
+from .change_tracker import ChangeTracker
+from .context import Context
+from .enums import WrapMode
+from .font_description import FontDescription
+from .layout import Layout
+
+
+def find_paragraph_boundary(text: str) -> Tuple[int, int]:
+    """
+    Locates the end of the first paragraph of ``text``, as Pango does when
+    it splits the text of a :class:`Layout` into paragraphs. Paragraphs are
+    delimited by ``'\\n'``, ``'\\r'``, ``'\\r\\n'`` or ``'\\u2029'``.
+
+    :param text:
+        the text to search.
+    :return:
+        a tuple containing the character offset of the paragraph delimiter
+        and the character offset at which the next paragraph starts. If no
+        delimiter is found, both are the length of ``text``.
+    """
+    text_bytes = text.encode("utf-8")
+    boundary = ffi.new("int[2]")
+    pango.pango_find_paragraph_boundary(
+        text_bytes, len(text_bytes), boundary, boundary + 1
+    )
+    delimiter_index = len(text_bytes[:boundary[0]].decode("utf-8"))
+    next_start = delimiter_index + len(
+        text_bytes[boundary[0]:boundary[1]].decode("utf-8")
+    )
+    return delimiter_index, next_start
+
+
+def _split_paragraphs(text: str) -> List[Tuple[str, str]]:
+    # Splits text into (paragraph text, delimiter) pairs. Text ending with a
+    # delimiter ends with an empty paragraph, as it does in a Layout.
+    text_bytes = text.encode("utf-8")
+    text_buffer = ffi.from_buffer(text_bytes)
+    length = len(text_bytes)
+    boundary = ffi.new("int[2]")
+    next_start_pointer = boundary + 1
+    find_paragraph_boundary = pango.pango_find_paragraph_boundary
+    paragraphs = []
+    start = 0
+    while True:
+        find_paragraph_boundary(
+            text_buffer + start, length - start, boundary, next_start_pointer
+        )
+        delimiter_index = start + boundary[0]
+        next_start = start + boundary[1]
+        paragraphs.append((
+            text_bytes[start:delimiter_index].decode("utf-8"),
+            text_bytes[delimiter_index:next_start].decode("utf-8")
+        ))
+        if next_start == delimiter_index:
+            return paragraphs
+        start = next_start
+
+
+def _copy_attributes(attributes: AttrList) -> List[ffi.CData]:
+    # Returns copies of the attributes of the list, which the caller owns.
+    head = pango.pango_attr_list_get_attributes(attributes.pointer)
+    copies = []
+    node = head
+    while node != ffi.NULL:
+        copies.append(ffi.cast("PangoAttribute *", node.data))
+        node = node.next
+    glib.g_slist_free(head)
+    return copies
+
+
+def _distribute_attributes(
+        attributes: AttrList,
+        byte_starts: List[int],
+        byte_lengths: List[int]
+) -> List[Optional[AttrList]]:
+    # Splits the attributes between paragraphs, given the byte offset and
+    # length of the text of every paragraph. Every attribute is clipped to
+    # the paragraphs it applies to, and moved to be relative to them.
+    # Paragraphs without attributes get None.
+    lists: List[Optional[AttrList]] = [None] * len(byte_starts)
+    for attribute in _copy_attributes(attributes):
+        start_index = attribute.start_index
+        end_index = attribute.end_index
+        index = max(bisect.bisect_right(byte_starts, start_index) - 1, 0)
+        while index < len(byte_starts) and byte_starts[index] < end_index:
+            paragraph_start = byte_starts[index]
+            paragraph_end = paragraph_start + byte_lengths[index]
+            piece_start = max(start_index, paragraph_start)
+            piece_end = min(end_index, paragraph_end)
+            if piece_start < piece_end:
+                piece = pango.pango_attribute_copy(attribute)
+                piece.start_index = piece_start - paragraph_start
+                piece.end_index = piece_end - paragraph_start
+                if lists[index] is None:
+                    lists[index] = AttrList()
+                pango.pango_attr_list_insert(lists[index].pointer, piece)
+            index += 1
+        pango.pango_attribute_destroy(attribute)
+    return lists
+
+
+class _Paragraph:
+    __slots__ = ("text", "delimiter", "attributes", "layout")
+
+    def __init__(
+            self,
+            text: str,
+            delimiter: str,
+            attributes: Optional[AttrList]
+    ):
+        self.text = text
+        self.delimiter = delimiter
+        self.attributes = attributes
+        self.layout: Optional[Layout] = None
+
+
+class Document:
+    """
+    A :class:`Document` holds a text that is edited incrementally, such as
+    the contents of a text editor or a log view. The text is split into
+    paragraphs, each laid out with its own :class:`Layout`, so that an edit
+    only lays out the paragraphs it touches again, rather than the whole
+    text.
+
+    The document keeps an index of the vertical position of every
+    paragraph, which is updated lazily: layouts are only created and laid
+    out when the position of a paragraph, or the height of the document, is
+    needed. Paragraphs are stacked without any spacing between them.
+
+    Offsets into the text are character offsets. Attributes are stored per
+    paragraph, and are moved along with the text when it is edited, as
+    :meth:`AttrList.splice()` does.
+
+    Like :class:`Layout`, a document must not be used by several threads at
+    once.
+    """
+
+    def __init__(
+            self,
+            context: Context,
+            text: str = "",
+            attributes: Optional[AttrList] = None,
+            font_description: Optional[FontDescription] = None,
+            width: int = -1,
+            wrap: WrapMode = WrapMode.WORD
+    ):
+        """
+        :param context:
+            the :class:`Context` to lay out the paragraphs with.
+        :param text:
+            the initial text of the document.
+        :param attributes:
+            the attributes of the initial text, or ``None``. Their indices are
+            byte offsets into the UTF-8 encoding of ``text``.
+        :param font_description:
+            the font description of the paragraphs, or ``None`` to use the
+            font description of the context.
+        :param width:
+            the width to wrap the paragraphs at, in Pango units, or ``-1`` to
+            not wrap them.
+        :param wrap:
+            the wrap mode of the paragraphs.
+        """
+        self._context = context
+        self._font_description = font_description
+        self._width = width
+        self._wrap = wrap
+        self._context_tracker = ChangeTracker(context)
+
+        self._paragraphs = self._create_paragraphs(text, attributes)
+        count = len(self._paragraphs)
+        self._lengths = array(
+            "i",
+            (len(p.text) + len(p.delimiter) for p in self._paragraphs)
+        )
+        self._starts = array("i", itertools.accumulate(
+            self._lengths[:-1], initial=0
+        ))
+        self._length = len(text)
+        self._heights = array("i", [-1]) * count
+        self._y_offsets = array("i", [0]) * (count + 1)
+        # The number of paragraphs whose y offset is known, besides the
+        # first.
+        self._y_valid = 0
+
+    @staticmethod
+    def _create_paragraphs(
+            text: str,
+            attributes: Optional[AttrList]
+    ) -> List[_Paragraph]:
+        pieces = _split_paragraphs(text)
+        if attributes is None:
+            return [
+                _Paragraph(paragraph_text, delimiter, None)
+                for paragraph_text, delimiter in pieces
+            ]
+        byte_starts = []
+        byte_lengths = []
+        byte_offset = 0
+        for paragraph_text, delimiter in pieces:
+            byte_length = len(paragraph_text.encode("utf-8"))
+            byte_starts.append(byte_offset)
+            byte_lengths.append(byte_length)
+            byte_offset += byte_length + len(delimiter.encode("utf-8"))
+        lists = _distribute_attributes(attributes, byte_starts, byte_lengths)
+        return [
+            _Paragraph(paragraph_text, delimiter, paragraph_attributes)
+            for (paragraph_text, delimiter), paragraph_attributes
+            in zip(pieces, lists)
+        ]
+
+    @property
+    def context(self) -> Context:
+        """The :class:`Context` used to lay out the paragraphs."""
+        return self._context
+
+    @property
+    def text(self) -> str:
+        """The text of the document."""
+        return "".join(p.text + p.delimiter for p in self._paragraphs)
+
+    @property
+    def length(self) -> int:
+        """The length of the text in characters."""
+        return self._length
+
+    @property
+    def paragraph_count(self) -> int:
+        """
+        The number of paragraphs. A document always has at least one
+        paragraph, and text that ends with a paragraph delimiter ends with
+        an empty paragraph.
+        """
+        return len(self._paragraphs)
+
+    def _get_font_description(self) -> Optional[FontDescription]:
+        return self._font_description
+
+    def _set_font_description(self, desc: Optional[FontDescription]) -> None:
+        self._font_description = desc
+        self._update_layouts()
+
+    font_description: Optional[FontDescription] = property(
+        _get_font_description, _set_font_description
+    )
+    """
+    The font description of the paragraphs. Changing it lays out every
+    paragraph again.
+    """
+
+    def _get_width(self) -> int:
+        return self._width
+
+    def _set_width(self, width: int) -> None:
+        self._width = width
+        self._update_layouts()
+
+    width: int = property(_get_width, _set_width)
+    """
+    The width to wrap the paragraphs at. Changing it lays out every paragraph
+    again.
+    """
+
+    def _get_wrap(self) -> WrapMode:
+        return self._wrap
+
+    def _set_wrap(self, wrap: WrapMode) -> None:
+        self._wrap = wrap
+        self._update_layouts()
+
+    wrap: WrapMode = property(_get_wrap, _set_wrap)
+    """
+    The wrap mode of the paragraphs. Changing it lays out every paragraph
+    again.
+    """
+
+    def _update_layouts(self) -> None:
+        for paragraph in self._paragraphs:
+            if paragraph.layout is not None:
+                self._configure_layout(paragraph.layout)
+        self._invalidate_heights()
+
+    def _configure_layout(self, layout: Layout) -> None:
+        layout.font_description = self._font_description
+        layout.width = self._width
+        layout.wrap = self._wrap
+
+    def _invalidate_heights(self) -> None:
+        self._heights = array("i", [-1]) * len(self._paragraphs)
+        self._y_valid = 0
+
+    def _check_index(self, index: int) -> None:
+        if not 0 <= index < len(self._paragraphs):
+            raise IndexError("paragraph index out of range")
+
+    def get_paragraph_text(self, index: int) -> str:
+        """
+        Returns the text of a paragraph, without its delimiter.
+
+        :param index:
+            the index of the paragraph.
+        :return:
+            the text of the paragraph.
+        :raises: IndexError
+            When ``index`` is out of range.
+        """
+        self._check_index(index)
+        return self._paragraphs[index].text
+
+    def get_paragraph_start(self, index: int) -> int:
+        """
+        Returns the character offset at which a paragraph starts.
+
+        :param index:
+            the index of the paragraph.
+        :return:
+            the offset of the paragraph in the text of the document.
+        :raises: IndexError
+            When ``index`` is out of range.
+        """
+        self._check_index(index)
+        return self._starts[index]
+
+    def get_layout(self, index: int) -> Layout:
+        """
+        Returns the :class:`Layout` of a paragraph, creating it if it was not
+        needed yet. The layout must not be modified, and is replaced when the
+        paragraph is edited.
+
+        :param index:
+            the index of the paragraph.
+        :return:
+            the layout of the paragraph.
+        :raises: IndexError
+            When ``index`` is out of range.
+        """
+        self._check_index(index)
+        paragraph = self._paragraphs[index]
+        if paragraph.layout is None:
+            layout = Layout(self._context)
+            self._configure_layout(layout)
+            layout.attributes = paragraph.attributes
+            layout.text = paragraph.text
+            paragraph.layout = layout
+        return paragraph.layout
+
+    def paragraph_at_offset(self, offset: int) -> int:
+        """
+        Returns the index of the paragraph containing a character offset.
+        The offset of a paragraph delimiter belongs to the paragraph it
+        ends.
+
+        :param offset:
+            an offset between ``0`` and :attr:`length`, inclusive.
+        :return:
+            the index of the paragraph.
+        :raises: IndexError
+            When ``offset`` is out of range.
+        """
+        if not 0 <= offset <= self._length:
+            raise IndexError("offset out of range")
+        return bisect.bisect_right(self._starts, offset) - 1
+
+    def _update_y_offsets(self, count: int) -> None:
+        # Makes the y offsets of the first ``count`` paragraphs, and the end
+        # of the last of those, valid.
+        if self._context_tracker.update():
+            self._invalidate_heights()
+        start = self._y_valid
+        if count <= start:
+            return
+        heights = self._heights
+        try:
+            index = heights.index(-1, start, count)
+            while True:
+                heights[index] = self.get_layout(index).get_size()[1]
+                index = heights.index(-1, index + 1, count)
+        except ValueError:
+            pass
+        self._y_offsets[start + 1:count + 1] = array("i", itertools.accumulate(
+            heights[start:count], initial=self._y_offsets[start]
+        ))[1:]
+        self._y_valid = count
+
+    def get_paragraph_y(self, index: int) -> int:
+        """
+        Returns the vertical position of a paragraph, laying out the
+        paragraphs before it whose height is not known.
+
+        :param index:
+            the index of the paragraph.
+        :return:
+            the y offset of the top of the paragraph from the top of the
+            document, in Pango units.
+        :raises: IndexError
+            When ``index`` is out of range.
+        """
+        self._check_index(index)
+        self._update_y_offsets(index)
+        return self._y_offsets[index]
+
+    def get_paragraph_height(self, index: int) -> int:
+        """
+        Returns the logical height of a paragraph.
+
+        :param index:
+            the index of the paragraph.
+        :return:
+            the height of the paragraph, in Pango units.
+        :raises: IndexError
+            When ``index`` is out of range.
+        """
+        self._check_index(index)
+        self._update_y_offsets(index + 1)
+        return self._heights[index]
+
+    @property
+    def height(self) -> int:
+        """
+        The height of the document in Pango units. Every paragraph whose
+        height is not known is laid out.
+        """
+        count = len(self._paragraphs)
+        self._update_y_offsets(count)
+        return self._y_offsets[count]
+
+    def paragraph_at_y(self, y: int) -> int:
+        """
+        Returns the index of the paragraph at a vertical position. Only the
+        paragraphs up to that position are laid out. Positions above the
+        document are clamped to the first paragraph, and positions below
+        the document to the last paragraph.
+
+        :param y:
+            the y offset from the top of the document, in Pango units.
+        :return:
+            the index of the paragraph.
+        """
+        count = len(self._paragraphs)
+        self._update_y_offsets(0)
+        step = 64
+        while (
+            self._y_valid < count
+            and self._y_offsets[self._y_valid] <= y
+        ):
+            self._update_y_offsets(min(count, self._y_valid + step))
+            step *= 2
+        index = bisect.bisect_right(
+            self._y_offsets, y, 0, self._y_valid + 1
+        ) - 1
+        return min(max(index, 0), count - 1)
+
+    def insert(
+            self,
+            offset: int,
+            text: str,
+            attributes: Optional[AttrList] = None
+    ) -> range:
+        """
+        Inserts text into the document. See :meth:`replace()`.
+
+        :param offset:
+            the character offset to insert the text at.
+        :param text:
+            the text to insert.
+        :param attributes:
+            the attributes of the inserted text, or ``None``.
+        :return:
+            the indices of the paragraphs that were replaced.
+        """
+        return self.replace(offset, offset, text, attributes)
+
+    def delete(self, start: int, end: int) -> range:
+        """
+        Deletes text from the document. See :meth:`replace()`.
+
+        :param start:
+            the character offset of the start of the text to delete.
+        :param end:
+            the character offset of the end of the text to delete.
+        :return:
+            the indices of the paragraphs that were replaced.
+        """
+        return self.replace(start, end, "")
+
+    def replace(
+            self,
+            start: int,
+            end: int,
+            text: str,
+            attributes: Optional[AttrList] = None
+    ) -> range:
+        """
+        Replaces a range of the text of the document.
+
+        Only the paragraphs touched by the edit are split again and replaced;
+        the other paragraphs keep their layouts and heights. Attributes after
+        the edit are moved along with the text, attributes covering the
+        replaced range are shortened, and attributes extending over the
+        start of the range are extended over the new text.
+
+        :param start:
+            the character offset of the start of the range.
+        :param end:
+            the character offset of the end of the range.
+        :param text:
+            the new text.
+        :param attributes:
+            the attributes of the new text, or ``None``. Their indices are
+            byte offsets into the UTF-8 encoding of ``text``.
+        :return:
+            the indices of the new paragraphs, which replace the paragraphs
+            touched by the edit.
+        :raises: IndexError
+            When ``start`` or ``end`` is out of range, or ``end`` is before
+            ``start``.
+        """
+        if not 0 <= start <= end <= self._length:
+            raise IndexError("range out of range")
+
+        # The paragraphs touched by the edit. The paragraph before is
+        # included when inserting at the start of a paragraph, and the
+        # paragraph after when editing at the end of a paragraph, since the
+        # delimiter between them could change ('\r' + '\n' is a single
+        # delimiter).
+        paragraphs = self._paragraphs
+        first = self.paragraph_at_offset(start)
+        last = self.paragraph_at_offset(end)
+        if first > 0 and start == self._starts[first]:
+            first -= 1
+        if (
+            last + 1 < len(paragraphs)
+            and end >= self._starts[last] + len(paragraphs[last].text)
+        ):
+            last += 1
+        touched = paragraphs[first:last + 1]
+        at_end = last == len(paragraphs) - 1
+
+        region_start = self._starts[first]
+        region_text = "".join(p.text + p.delimiter for p in touched)
+        local_start = start - region_start
+        local_end = end - region_start
+        new_text = (
+            region_text[:local_start] + text + region_text[local_end:]
+        )
+
+        region_attributes = None
+        if attributes is not None or any(
+                p.attributes is not None for p in touched
+        ):
+            region_attributes = self._edit_attributes(
+                touched,
+                len(region_text[:local_start].encode("utf-8")),
+                len(region_text[local_start:local_end].encode("utf-8")),
+                text,
+                attributes
+            )
+
+        new_paragraphs = self._create_paragraphs(new_text, region_attributes)
+        if not at_end:
+            # The region ends with a delimiter, which is followed by the
+            # next paragraph rather than by an empty one.
+            new_paragraphs.pop()
+
+        count = len(new_paragraphs)
+        paragraphs[first:last + 1] = new_paragraphs
+        self._lengths[first:last + 1] = array(
+            "i", (len(p.text) + len(p.delimiter) for p in new_paragraphs)
+        )
+        self._starts[first:] = array("i", itertools.accumulate(
+            self._lengths[first:-1], initial=region_start
+        ))
+        self._length += len(text) - (end - start)
+        self._heights[first:last + 1] = array("i", [-1]) * count
+        self._y_offsets[first + 1:last + 2] = array("i", [0]) * count
+        self._y_valid = min(self._y_valid, first)
+        return range(first, first + count)
+
+    @staticmethod
+    def _edit_attributes(
+            touched: Iterable[_Paragraph],
+            start: int,
+            removed: int,
+            text: str,
+            attributes: Optional[AttrList]
+    ) -> AttrList:
+        # Joins the attributes of the touched paragraphs, removes the
+        # replaced bytes from them, and splices in the attributes of the new
+        # text. All offsets are byte offsets into the touched paragraphs.
+        end = start + removed
+        joined = AttrList()
+        offset = 0
+        for paragraph in touched:
+            if paragraph.attributes is not None:
+                for attribute in _copy_attributes(paragraph.attributes):
+                    indices = []
+                    for index in (attribute.start_index, attribute.end_index):
+                        index += offset
+                        if index > start:
+                            index = start if index < end else index - removed
+                        indices.append(index)
+                    if indices[0] < indices[1]:
+                        attribute.start_index, attribute.end_index = indices
+                        pango.pango_attr_list_insert(joined.pointer, attribute)
+                    else:
+                        pango.pango_attribute_destroy(attribute)
+            offset += len(
+                (paragraph.text + paragraph.delimiter).encode("utf-8")
+            )
+        joined.splice(
+            attributes if attributes is not None else AttrList(),
+            start,
+            len(text.encode("utf-8"))
+        )
+        return joined
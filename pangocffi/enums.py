@@ -1,5 +1,13 @@
-from pangocffi import pango
-from enum import Enum
+from . import pango, ffi
+from enum import Enum, IntFlag
+
+
+def _log_attr_mask(field: str) -> int:
+    # The compiler decides where the bit fields of PangoLogAttr are stored,
+    # so each mask is read back from a PangoLogAttr with only that field set.
+    log_attr = ffi.new("PangoLogAttr *")
+    setattr(log_attr, field, 1)
+    return ffi.cast("unsigned int *", log_attr)[0]
 
 
 class Style(Enum):
@@ -158,6 +166,57 @@ class WrapMode(Enum):
     boundaries if there is not enough space for a full word."""
 
 
+class Direction(Enum):
+    """
+    :class:`Direction` represents a direction in the Unicode bidirectional
+    algorithm. Not every value in this enumeration makes sense for every
+    usage; for example, the return value of
+    :attr:`LayoutLine.resolved_direction` is only ever ``LTR`` or ``RTL``.
+    """
+
+    LTR = pango.PANGO_DIRECTION_LTR
+    """A strong left-to-right direction"""
+    RTL = pango.PANGO_DIRECTION_RTL
+    """A strong right-to-left direction"""
+    TTB_LTR = pango.PANGO_DIRECTION_TTB_LTR
+    """Deprecated value; treated the same as ``RTL``."""
+    TTB_RTL = pango.PANGO_DIRECTION_TTB_RTL
+    """Deprecated value; treated the same as ``LTR``."""
+    WEAK_LTR = pango.PANGO_DIRECTION_WEAK_LTR
+    """A weak left-to-right direction"""
+    WEAK_RTL = pango.PANGO_DIRECTION_WEAK_RTL
+    """A weak right-to-left direction"""
+    NEUTRAL = pango.PANGO_DIRECTION_NEUTRAL
+    """No direction specified"""
+
+
+class LayoutSerializeFlags(IntFlag):
+    """
+    :class:`LayoutSerializeFlags` influences what is included when a
+    :class:`Layout` is serialized with :meth:`Layout.serialize()`. Flags can
+    be combined with ``|``. Since: 1.50
+    """
+
+    DEFAULT = pango.PANGO_LAYOUT_SERIALIZE_DEFAULT
+    """Include only the properties of the layout."""
+    CONTEXT = pango.PANGO_LAYOUT_SERIALIZE_CONTEXT
+    """Include the properties of the context of the layout."""
+    OUTPUT = pango.PANGO_LAYOUT_SERIALIZE_OUTPUT
+    """Include the computed lines and runs of the layout."""
+
+
+class LayoutDeserializeFlags(IntFlag):
+    """
+    :class:`LayoutDeserializeFlags` influences how a :class:`Layout` is
+    created with :meth:`Layout.deserialize()`. Since: 1.50
+    """
+
+    DEFAULT = pango.PANGO_LAYOUT_DESERIALIZE_DEFAULT
+    """Apply only the properties of the layout."""
+    CONTEXT = pango.PANGO_LAYOUT_DESERIALIZE_CONTEXT
+    """Apply the serialized properties of the context to the context."""
+
+
 class Gravity(Enum):
     """
     :class:`Gravity` represents the orientation of glyphs in a segment of text.
@@ -270,3 +329,53 @@ class TabAlign(Enum):
     appears to the left of the tab stop position (until the available
     space is filled), the rest to the right. Since: 1.50
     """
+
+
+class LogAttrFlag(Enum):
+    """
+    The values of :class:`LogAttrFlag` are the bit masks of the flags stored
+    in each item of :attr:`Layout.log_attrs`, which describe the position
+    before the corresponding character.
+    """
+
+    IS_LINE_BREAK = _log_attr_mask("is_line_break")
+    """A line break can be inserted before the character."""
+    IS_MANDATORY_BREAK = _log_attr_mask("is_mandatory_break")
+    """A line break must be inserted before the character."""
+    IS_CHAR_BREAK = _log_attr_mask("is_char_break")
+    """The text can be broken into characters before the character."""
+    IS_WHITE = _log_attr_mask("is_white")
+    """The character is whitespace."""
+    IS_CURSOR_POSITION = _log_attr_mask("is_cursor_position")
+    """The cursor can appear in front of the character."""
+    IS_WORD_START = _log_attr_mask("is_word_start")
+    """The character is the beginning of a word."""
+    IS_WORD_END = _log_attr_mask("is_word_end")
+    """The character follows the end of a word."""
+    IS_SENTENCE_BOUNDARY = _log_attr_mask("is_sentence_boundary")
+    """There is a sentence boundary before the character."""
+    IS_SENTENCE_START = _log_attr_mask("is_sentence_start")
+    """The character is the beginning of a sentence."""
+    IS_SENTENCE_END = _log_attr_mask("is_sentence_end")
+    """The character follows the end of a sentence."""
+    BACKSPACE_DELETES_CHARACTER = _log_attr_mask(
+        "backspace_deletes_character"
+    )
+    """
+    Backspace deletes one character rather than the entire grapheme
+    cluster.
+    """
+    IS_EXPANDABLE_SPACE = _log_attr_mask("is_expandable_space")
+    """The character is a space that can be expanded when justifying."""
+    IS_WORD_BOUNDARY = _log_attr_mask("is_word_boundary")
+    """
+    There is a word boundary before the character, as defined by UAX#29.
+    Since: 1.50
+    """
+    BREAK_INSERTS_HYPHEN = _log_attr_mask("break_inserts_hyphen")
+    """A hyphen is inserted when breaking before the character. Since: 1.50"""
+    BREAK_REMOVES_PRECEDING = _log_attr_mask("break_removes_preceding")
+    """
+    The preceding character is removed when breaking before the character.
+    Since: 1.50
+    """
@@ -0,0 +1,234 @@
+import operator
+import re
+from array import array
+from itertools import repeat
+from typing import Dict, Iterable, Optional
+
+from . import ffi, pango
+from .change_tracker import ChangeTracker
+from .context import Context
+from .font_description import FontDescription
+from .layout import Layout
+from .measure import measure_many
+
+# Printable ASCII, Latin-1 Supplement and Latin Extended-A, without the soft
+# hyphen, which is only shown at line breaks.
+LATIN_CHARACTERS = (
+    "".join(map(chr, range(0x20, 0x7f)))
+    + "".join(map(chr, range(0xa0, 0x180))).replace("\xad", "")
+)
+
+
+def _de_bruijn_pairs(characters: str) -> str:
+    # Returns a text in which every pair of the characters occurs exactly
+    # once, by concatenating the Lyndon words of length 1 and 2 in
+    # lexicographic order.
+    pieces = []
+    for i, first in enumerate(characters):
+        pieces.append(first)
+        for second in characters[i + 1:]:
+            pieces.append(first + second)
+    pieces.append(characters[0])
+    return "".join(pieces)
+
+
+class WidthEstimator:
+    """
+    A :class:`WidthEstimator` estimates the logical width of single line
+    texts without laying them out, by adding up the advance widths of their
+    characters from a table built once per font. This is considerably
+    faster than :func:`measure_many()`, and is useful to rule out texts
+    before measuring them, for instance when looking for the texts that fit
+    a width.
+
+    The table covers a range of characters, by default
+    :data:`LATIN_CHARACTERS`. Its advance widths are measured with the
+    :class:`Context`, and pairs of characters whose widths differ when they
+    are shaped together, because of kerning or ligatures, are measured
+    separately so that their adjustment can be added. Texts with characters
+    outside the table, such as complex scripts, combining marks, tabs or
+    line breaks, are laid out with a :class:`Layout` instead.
+
+    Building the table lays out a text containing every pair of characters
+    once, so it is only worth it for many texts; the table is built when
+    the first width is estimated. The estimate can still differ slightly
+    from the width of a layout, when shaping depends on more than two
+    characters at a time, for instance with a three letter ligature. The
+    table is built again when the serial of the context changes.
+    """
+
+    def __init__(
+            self,
+            context: Context,
+            font_description: Optional[FontDescription] = None,
+            characters: str = LATIN_CHARACTERS
+    ):
+        """
+        :param context:
+            the :class:`Context` to measure texts with.
+        :param font_description:
+            the font description of the texts, or ``None`` to use the font
+            description of the context.
+        :param characters:
+            the characters to build the table for.
+        :raises: AssertionError
+            When ``characters`` is empty or contains duplicates, line
+            breaks or tabs.
+        """
+        assert len(characters) > 0, "no characters"
+        assert len(set(characters)) == len(characters), \
+            "duplicate characters"
+        assert not re.search("[\t\n\r\u2028\u2029]", characters), \
+            "characters contain line breaks or tabs"
+        self._context = context
+        self._font_description = font_description
+        self._characters = characters
+        self._unsupported = re.compile(
+            "[^" + "".join(map(re.escape, characters)) + "]"
+        )
+        self._layout = Layout(context)
+        self._layout.font_description = font_description
+        self._tracker = ChangeTracker(context)
+        self._advances: Dict[str, int] = {}
+        self._adjustments: Dict[str, int] = {}
+
+    @property
+    def context(self) -> Context:
+        """The :class:`Context` used to measure texts."""
+        return self._context
+
+    @property
+    def characters(self) -> str:
+        """The characters covered by the table."""
+        return self._characters
+
+    def _check_table(self) -> None:
+        if self._tracker.update():
+            self._layout.context_changed()
+            self._build_table()
+
+    def _build_table(self) -> None:
+        characters = self._characters
+        widths, _, _ = measure_many(
+            self._context, characters, self._font_description
+        )
+        advances = dict(zip(characters, widths))
+
+        # The width of every character of a text containing every pair of
+        # characters, shaped as a whole.
+        text = _de_bruijn_pairs(characters)
+        text_bytes = text.encode("utf-8")
+        layout = Layout(self._context)
+        layout.font_description = self._font_description
+        pango.pango_layout_set_text(
+            layout.pointer, text_bytes, len(text_bytes)
+        )
+        shaped_widths = array("i", bytes(len(text) * array("i").itemsize))
+        text_buffer = ffi.from_buffer(text_bytes)
+        byte_offset = 0
+        char_offset = 0
+        iter_pointer = pango.pango_layout_get_iter(layout.pointer)
+        try:
+            while True:
+                run = pango.pango_layout_iter_get_run_readonly(iter_pointer)
+                if run != ffi.NULL:
+                    item = run.item
+                    # Runs are in visual order, which is the logical order
+                    # unless the characters include right-to-left ones.
+                    if item.offset >= byte_offset:
+                        char_offset += len(
+                            text_bytes[byte_offset:item.offset].decode("utf-8")
+                        )
+                    else:
+                        char_offset = len(
+                            text_bytes[:item.offset].decode("utf-8")
+                        )
+                    byte_offset = item.offset
+                    run_widths = ffi.new("int[]", item.num_chars)
+                    pango.pango_glyph_item_get_logical_widths(
+                        run, text_buffer, run_widths
+                    )
+                    run_array = array("i")
+                    run_array.frombytes(ffi.buffer(run_widths))
+                    shaped_widths[
+                        char_offset:char_offset + item.num_chars
+                    ] = run_array
+                if not pango.pango_layout_iter_next_run(iter_pointer):
+                    break
+        finally:
+            pango.pango_layout_iter_free(iter_pointer)
+
+        # Pairs in which either character is not as wide as on its own are
+        # measured on their own, to find how much they are adjusted by.
+        pairs = [
+            text[i:i + 2]
+            for i in range(len(text) - 1)
+            if shaped_widths[i] != advances[text[i]]
+            or shaped_widths[i + 1] != advances[text[i + 1]]
+        ]
+        pair_widths, _, _ = measure_many(
+            self._context, pairs, self._font_description
+        )
+        adjustments = {}
+        for pair, pair_width in zip(pairs, pair_widths):
+            adjustment = pair_width - advances[pair[0]] - advances[pair[1]]
+            if adjustment != 0:
+                adjustments[pair] = adjustment
+        self._advances = advances
+        self._adjustments = adjustments
+
+    def covers(self, text: str) -> bool:
+        """
+        Determines whether the width of a text can be estimated from the
+        table, rather than by laying it out.
+
+        :param text:
+            the text to check.
+        :return:
+            whether every character of the text is in the table.
+        """
+        return self._unsupported.search(text) is None
+
+    def _estimate(self, text: str) -> int:
+        if self._unsupported.search(text) is not None:
+            text_bytes = text.encode("utf-8")
+            layout_pointer = self._layout.pointer
+            pango.pango_layout_set_text(
+                layout_pointer, text_bytes, len(text_bytes)
+            )
+            width = ffi.new("int *")
+            pango.pango_layout_get_size(layout_pointer, width, ffi.NULL)
+            return width[0]
+        width = sum(map(self._advances.__getitem__, text))
+        if self._adjustments:
+            width += sum(map(
+                self._adjustments.get,
+                map(operator.add, text, text[1:]),
+                repeat(0)
+            ))
+        return width
+
+    def estimate(self, text: str) -> int:
+        """
+        Estimates the logical width of a text laid out on a single line.
+
+        :param text:
+            the text to measure.
+        :return:
+            the estimated width in Pango units.
+        """
+        self._check_table()
+        return self._estimate(text)
+
+    def estimate_many(self, texts: Iterable[str]) -> array:
+        """
+        Estimates the logical widths of many texts, as :meth:`estimate()`
+        does.
+
+        :param texts:
+            the texts to measure.
+        :return:
+            the estimated widths in Pango units, as an ``array.array('i')``.
+        """
+        self._check_table()
+        return array("i", map(self._estimate, texts))
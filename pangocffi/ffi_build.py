@@ -15,20 +15,51 @@ sys.path.append(str(Path(__file__).parent))
 # Create an empty _generated folder if needed
 (Path(__file__).parent / '_generated').mkdir(exist_ok=True)
 
-# Because we can't directly load the instance builder (it would run
-# ``__init__.py`` for any module import) we have to do this dubious import.
-spec = importlib.util.spec_from_file_location(
-    'ffi_instance_builder',
-    str(Path(__file__).parent / 'ffi_instance_builder.py')
-)
-ffi_instance_builder = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(ffi_instance_builder)
 
-# Generate the bindings
+def _load_module(name: str):
+    # Because we can't directly load the modules below (it would run
+    # ``__init__.py`` for any module import) we have to do this dubious
+    # import, unless pangocffi is already being imported.
+    module = sys.modules.get('pangocffi.' + name)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(
+        name,
+        str(Path(__file__).parent / (name + '.py'))
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ffi_instance_builder = _load_module('ffi_instance_builder')
+cache = _load_module('cache')
+
+# Generate the bindings, or reuse the declarations that were parsed and
+# cached by a previous import, since parsing the C definitions is slow.
 ffiBuilder = ffi_instance_builder.FFIInstanceBuilder(
     source='pangocffi._generated.ffi'
 )
-ffi = ffiBuilder.generate()
+ffi = cache.load_ffi(ffiBuilder.source)
+if ffi is None:
+    ffi = ffiBuilder.generate()
+    cache.store_ffi(ffi)
+
+
+def build_api_ffi():
+    """
+    Generates the FFI for the optional API-mode extension module. This is a
+    function rather than a module-level FFI so that the C definitions are not
+    parsed twice when importing pangocffi.
+    """
+    return ffi_instance_builder.FFIInstanceBuilder(
+        source='pangocffi._generated.ffi_api',
+        api_mode=True
+    ).generate()
+
 
 if __name__ == '__main__':
-    ffi.compile()
+    if '--api' in sys.argv:
+        build_api_ffi().compile(verbose=True)
+    else:
+        ffi.compile()
@@ -12,8 +12,30 @@ from typing import Optional
 
 class FFIInstanceBuilder:
 
-    def __init__(self, source: Optional[str] = None):
+    PKGCONFIG_LIBRARIES = ['pango', 'gobject-2.0', 'glib-2.0']
+    """
+    The pkg-config packages used to compile the API-mode bindings.
+    """
+
+    API_MODE_MIN_PANGO_VERSION = (1, 56, 0)
+    """
+    The oldest Pango that the API-mode bindings compile against, as every
+    declared function has to exist in its headers.
+    """
+
+    def __init__(self, source: Optional[str] = None, api_mode: bool = False):
+        """
+        :param source:
+            The name of the module to generate, such as
+            ``pangocffi._generated.ffi``.
+        :param api_mode:
+            Whether the module should be compiled against Pango's headers as a
+            C extension (API mode), instead of being loaded with ``dlopen()``
+            (ABI mode). Compiling requires a C compiler, ``pkg-config`` and
+            the Pango development headers.
+        """
         self.source = source
+        self.api_mode = api_mode
 
     def generate(self) -> FFI:
         # Read the C definitions
@@ -32,6 +54,16 @@ class FFIInstanceBuilder:
         ffi.cdef(c_definitions_glib)
         ffi.cdef(c_definitions_pango)
         if self.source is not None:
-            ffi.set_source(self.source, None)
+            if self.api_mode:
+                ffi.set_source_pkgconfig(
+                    self.source,
+                    self.PKGCONFIG_LIBRARIES,
+                    '#include <pango/pango.h>\n'
+                    '#if !PANGO_VERSION_CHECK(%d, %d, %d)\n'
+                    '#error "the API-mode bindings require Pango %d.%d.%d"\n'
+                    '#endif\n' % (self.API_MODE_MIN_PANGO_VERSION * 2)
+                )
+            else:
+                ffi.set_source(self.source, None)
 
         return ffi
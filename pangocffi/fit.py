@@ -0,0 +1,246 @@
+import math
+from array import array
+from typing import Optional, Sequence, Tuple
+
+from . import ffi, pango
+from .context import Context
+from .enums import WrapMode
+from .font_description import FontDescription
+from .layout import Layout
+
+
+class _FontSizeSolver:
+    # Finds the largest font size at which texts fit within a box, reusing a
+    # single layout and font description for every text.
+
+    def __init__(
+            self,
+            context: Context,
+            width: int,
+            height: int,
+            font_description: Optional[FontDescription],
+            min_size: int,
+            max_size: Optional[int],
+            wrap: Optional[WrapMode],
+            precision: int
+    ):
+        assert width > 0 or height > 0, "neither width nor height is given"
+        assert wrap is None or width > 0, "wrapping requires a width"
+        assert precision > 0, "precision isn't positive"
+        if font_description is None:
+            font_description = context.font_description
+        # The font description is modified, so a copy is used.
+        font_description = FontDescription.from_pointer(
+            pango.pango_font_description_copy(font_description.pointer),
+            gc=True
+        )
+        absolute = font_description.size_is_absolute
+        if max_size is None:
+            max_size = font_description.size
+            if max_size == 0:
+                # Like Pango, use the size of the context when the font
+                # description has none.
+                context_font_description = context.font_description
+                max_size = context_font_description.size
+                absolute = context_font_description.size_is_absolute
+            assert max_size > 0, \
+                "max_size isn't given and the font description has no size"
+        assert 0 < min_size <= max_size, \
+            "min_size isn't positive or is larger than max_size"
+
+        self._layout = Layout(context)
+        if wrap is not None:
+            self._layout.width = width
+            self._layout.wrap = wrap
+        self._font_description = font_description
+        self._width = width if width > 0 else math.inf
+        self._height = height if height > 0 else math.inf
+        self._min_size = min_size
+        self._max_size = max_size
+        self._wrapped = wrap is not None
+        self._precision = precision
+        self._size = ffi.new("int[2]")
+        if absolute:
+            self._set_size = pango.pango_font_description_set_absolute_size
+        else:
+            self._set_size = pango.pango_font_description_set_size
+
+    def _measure(self, size: int) -> float:
+        # Lays out the text at a font size, and returns the factor to scale
+        # the font size by for the text to just fit, as estimated from the
+        # size of the text. The text fits if the factor is at least 1.
+        font_description_pointer = self._font_description.pointer
+        layout_pointer = self._layout.pointer
+        self._set_size(font_description_pointer, size)
+        pango.pango_layout_set_font_description(
+            layout_pointer, font_description_pointer
+        )
+        pango.pango_layout_get_size(layout_pointer, self._size, self._size + 1)
+        text_width, text_height = self._size[0], self._size[1]
+        width_scale = self._width / text_width if text_width else math.inf
+        height_scale = (
+            self._height / text_height if text_height else math.inf
+        )
+        if self._wrapped and height_scale < math.inf:
+            # The area of wrapped text grows with the square of the font
+            # size, and its width is fixed, so its height does too.
+            height_scale = math.sqrt(height_scale)
+        return min(width_scale, height_scale)
+
+    def fit(self, text: str) -> Tuple[int, bool]:
+        text_bytes = text.encode("utf-8")
+        pango.pango_layout_set_text(
+            self._layout.pointer, text_bytes, len(text_bytes)
+        )
+        high = self._max_size
+        scale = self._measure(high)
+        if scale >= 1:
+            return high, True
+
+        # The largest size known to fit is low, if low_fits is set, and the
+        # smallest size known not to fit is high. Every size is estimated
+        # from the last measurement, assuming the size of the text scales
+        # linearly with the font size, and the search falls back to
+        # bisection when the estimate does not narrow the range by half.
+        low = self._min_size
+        low_fits = False
+        size = high
+        bisect = False
+        precision = self._precision
+        while high - low > precision:
+            if bisect:
+                guess = (low + high) // 2
+            else:
+                guess = int(size * scale)
+            guess = min(max(guess, low + precision), high - precision)
+            previous_range = high - low
+            size = guess
+            scale = self._measure(size)
+            if scale >= 1:
+                low = size
+                low_fits = True
+            else:
+                high = size
+            bisect = 2 * (high - low) > previous_range
+        if not low_fits:
+            low_fits = self._measure(low) >= 1
+        return low, low_fits
+
+
+def fit_font_size(
+        context: Context,
+        text: str,
+        width: int,
+        height: int,
+        font_description: Optional[FontDescription] = None,
+        min_size: int = 1024,
+        max_size: Optional[int] = None,
+        wrap: Optional[WrapMode] = None,
+        precision: int = 128
+) -> Tuple[int, bool]:
+    """
+    Finds the largest font size at which ``text`` fits within a box, for
+    instance to shrink a label to fit a cell of a dashboard.
+
+    The text is first laid out at ``max_size``. If it does not fit, the next
+    font size is estimated by scaling the font size by how much the text
+    overflows the box, and the search narrows down on the largest size that
+    fits from there, typically laying out the text only a few times. A
+    single :class:`Layout` is used. To fit many texts, use
+    :func:`fit_font_sizes()`, which is faster.
+
+    When the text does not fit even at ``min_size``, ``min_size`` is
+    returned, and the text can be laid out at that size with an
+    :class:`EllipsizeMode` to shorten it instead.
+
+    :param context:
+        the :class:`Context` to lay out the text with.
+    :param text:
+        the text to fit.
+    :param width:
+        the width of the box in Pango units, or ``-1`` to not constrain the
+        width.
+    :param height:
+        the height of the box in Pango units, or ``-1`` to not constrain the
+        height.
+    :param font_description:
+        the font description to lay out the text with, or ``None`` to use
+        the font description of the context. It is not modified.
+    :param min_size:
+        the smallest font size to consider, in the same units as
+        :attr:`FontDescription.size`.
+    :param max_size:
+        the largest font size to consider, or ``None`` to use the size of the
+        font description, or of the context if the font description has no
+        size.
+    :param wrap:
+        how to wrap the text at the width of the box, or ``None`` to lay it
+        out without wrapping.
+    :param precision:
+        the largest difference between the returned size and the largest
+        size that fits, in the same units as :attr:`FontDescription.size`.
+    :return:
+        a tuple containing the font size, and whether the text fits at that
+        size.
+    :raises: AssertionError
+        When neither ``width`` nor ``height`` is given, when ``wrap`` is
+        given without a ``width``, when ``precision`` or ``min_size`` isn't
+        positive, when ``min_size`` is larger than ``max_size``, or when
+        ``max_size`` isn't given and neither the font description nor the
+        context has a size.
+    """
+    solver = _FontSizeSolver(
+        context,
+        width,
+        height,
+        font_description,
+        min_size,
+        max_size,
+        wrap,
+        precision
+    )
+    return solver.fit(text)
+
+
+def fit_font_sizes(
+        context: Context,
+        texts: Sequence[str],
+        width: int,
+        height: int,
+        font_description: Optional[FontDescription] = None,
+        min_size: int = 1024,
+        max_size: Optional[int] = None,
+        wrap: Optional[WrapMode] = None,
+        precision: int = 128
+) -> Tuple[array, array]:
+    """
+    Finds the largest font size at which every text fits within a box of
+    the same size, as :func:`fit_font_size()` does, reusing a single
+    :class:`Layout` for all the texts.
+
+    :param texts:
+        the texts to fit.
+    :return:
+        a tuple containing the font sizes, as an ``array.array('i')``, and
+        whether every text fits at its size, as an ``array.array('b')``.
+    :raises: AssertionError
+        When the arguments are invalid, as for :func:`fit_font_size()`.
+
+    See :func:`fit_font_size()` for the other parameters.
+    """
+    solver = _FontSizeSolver(
+        context,
+        width,
+        height,
+        font_description,
+        min_size,
+        max_size,
+        wrap,
+        precision
+    )
+    count = len(texts)
+    sizes = array("i", bytes(count * array("i").itemsize))
+    fits = array("b", bytes(count))
+    for i, text in enumerate(texts):
+        sizes[i], fits[i] = solver.fit(text)
+    return sizes, fits
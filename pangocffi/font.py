@@ -1,6 +1,9 @@
 from typing import Optional
 
-from . import pango, ffi, PangoObject, FontMetrics, Language
+from . import pango, ffi
+from .font_metrics import FontMetrics
+from .language import Language
+from .pango_object import PangoObject
 
 
 class Font(PangoObject):
@@ -1,6 +1,7 @@
 from typing import Optional, Union
-from . import pango, ffi, PangoObject
-from . import Style, Variant, Weight, Stretch, Gravity
+from . import pango, ffi, glib
+from .enums import Style, Variant, Weight, Stretch, Gravity
+from .pango_object import PangoObject
 
 
 class FontDescription(PangoObject):
@@ -14,6 +15,37 @@ class FontDescription(PangoObject):
     _GC_METHOD = pango.pango_font_description_free
     _COPY_METHOD = pango.pango_font_description_copy
 
+    @classmethod
+    def from_string(cls, string: str) -> "FontDescription":
+        """
+        Creates a new font description from a string representation in the
+        form ``"[FAMILY-LIST] [STYLE-OPTIONS] [SIZE] [VARIATIONS]"``, for
+        instance ``"Sans Bold 12"``. Any one of the options may be absent.
+
+        :param string:
+            the string representation of the font description.
+        :return:
+            a new :class:`FontDescription`.
+        """
+        pointer = pango.pango_font_description_from_string(
+            string.encode('utf8')
+        )
+        return cls.from_pointer(pointer, gc=True)
+
+    def to_string(self) -> str:
+        """
+        Creates a string representation of the font description, in the
+        format accepted by :meth:`from_string()`.
+
+        :return:
+            the string representation of the font description.
+        """
+        string = ffi.gc(
+            pango.pango_font_description_to_string(self._pointer),
+            glib.g_free,
+        )
+        return ffi.string(string).decode('utf8')
+
     def _get_family(self) -> Optional[str]:
         family_pointer = pango.pango_font_description_get_family(self._pointer)
         if family_pointer == ffi.NULL:
@@ -1,5 +1,6 @@
 
-from . import pango, ffi, PangoObject
+from . import pango, ffi
+from .pango_object import PangoObject
 
 
 class FontMetrics(PangoObject):
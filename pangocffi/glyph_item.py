@@ -1,5 +1,7 @@
 from typing import List
-from . import pango, ffi, Item, PangoObject
+from . import pango, ffi
+from .item import Item
+from .pango_object import PangoObject
 
 
 class GlyphItem(PangoObject):
@@ -1,5 +1,6 @@
-from . import pango, ffi, PangoObject
-from . import GlyphItem
+from . import pango, ffi
+from .glyph_item import GlyphItem
+from .pango_object import PangoObject
 
 
 class GlyphItemIter(PangoObject):
@@ -1,4 +1,5 @@
-from . import pango, PangoObject
+from . import pango
+from .pango_object import PangoObject
 
 
 class Item(PangoObject):
@@ -1,6 +1,7 @@
 from typing import Optional, List
 
-from . import pango, ffi, PangoObject
+from . import pango, ffi
+from .pango_object import PangoObject
 
 
 class Language(PangoObject):
@@ -1,8 +1,40 @@
-from . import pango, gobject, ffi, PangoObject
-from . import Context, FontDescription, AttrList, TabArray
-from . import Alignment, Rectangle, EllipsizeMode, WrapMode
-from pangocffi import LayoutIter
-from typing import Tuple, Optional
+import codecs
+import os
+from . import pango, gobject, glib, ffi
+from .attr_list import AttrList
+from .context import Context
+from .enums import (
+    Alignment,
+    EllipsizeMode,
+    LayoutDeserializeFlags,
+    LayoutSerializeFlags,
+    WrapMode,
+)
+from .font_description import FontDescription
+from .layout_iter import LayoutIter
+from .layout_line import LayoutLine, LineMetrics
+from .pango_object import PangoObject
+from .rectangle import Rectangle
+from .tab_array import TabArray
+from .text_index import TextIndex
+from array import array
+from typing import List, Tuple, Optional, Sequence, Union
+
+
+def _rectangles_to_array(rects: ffi.CData) -> array:
+    # PangoRectangle is four ints, so an array of rectangles can be copied
+    # into an array of ints in a single step.
+    ints = array("i")
+    ints.frombytes(ffi.buffer(rects))
+    return ints
+
+
+def _take_error_message(error_pointer: ffi.CData) -> str:
+    # Returns the message of the GError set by a failed call, and frees it.
+    error = error_pointer[0]
+    message = ffi.string(error.message).decode("utf-8", "replace")
+    glib.g_error_free(error)
+    return message
 
 
 class Layout(PangoObject):
@@ -28,13 +60,109 @@ class Layout(PangoObject):
             pango.pango_layout_get_context(self._pointer),
         )
 
-    def _get_text(self) -> str:
+    # The serial of the layout and the TextIndex of its text, which are
+    # replaced together so that they are always consistent.
+    _cached_text: Optional[Tuple[int, TextIndex]] = None
+
+    def _get_text_index(self) -> TextIndex:
+        # The layout's serial changes whenever the layout is modified, which
+        # includes changes made through other wrappers of the same layout.
+        serial = pango.pango_layout_get_serial(self._pointer)
+        cached_text = self._cached_text
+        if cached_text is not None and cached_text[0] == serial:
+            return cached_text[1]
         text_pointer = pango.pango_layout_get_text(self._pointer)
-        return ffi.string(text_pointer).decode("utf-8")
+        text = ffi.string(text_pointer).decode("utf-8")
+        if cached_text is not None and cached_text[1].text == text:
+            text_index = cached_text[1]
+        else:
+            text_index = TextIndex(text)
+        self._cached_text = (serial, text_index)
+        return text_index
+
+    text_index: TextIndex = property(_get_text_index)
+    """
+    A :class:`TextIndex` for the text contained in the layout, which converts
+    between character offsets into :attr:`text` and the byte offsets used by
+    Pango. The index is cached until the text of the layout changes.
+    """
+
+    def _get_log_attrs(self) -> array:
+        n_attrs_pointer = ffi.new("int *")
+        attrs_pointer = pango.pango_layout_get_log_attrs_readonly(
+            self._pointer, n_attrs_pointer
+        )
+        # The attributes belong to the layout and are freed when it changes,
+        # so they are copied. PangoLogAttr is a single guint of bit fields.
+        log_attrs = array("I")
+        log_attrs.frombytes(ffi.buffer(
+            attrs_pointer, n_attrs_pointer[0] * ffi.sizeof("PangoLogAttr")
+        ))
+        return log_attrs
+
+    log_attrs: array = property(_get_log_attrs)
+    """
+    The logical attributes of the text of the layout, such as possible line
+    breaks, word boundaries and cursor positions, as an ``array.array('I')``.
+
+    The array contains one unsigned 32-bit integer for every character of
+    :attr:`text`, plus one for the end of the text, so it can be indexed with
+    character offsets. Each integer holds the flags of the position before the
+    character, which can be tested with the masks of :class:`LogAttrFlag`::
+
+        word_starts = [
+            i for i, attrs in enumerate(layout.log_attrs)
+            if attrs & LogAttrFlag.IS_WORD_START.value
+        ]
+
+    The array can be wrapped in a NumPy array without copying with
+    ``numpy.frombuffer(layout.log_attrs, dtype=numpy.uint32)``.
+
+    The array is a copy, which is not updated when the layout is modified.
+    """
+
+    def _get_serial(self) -> int:
+        return pango.pango_layout_get_serial(self._pointer)
+
+    serial: int = property(_get_serial)
+    """
+    The current serial number of the layout. The serial number is
+    initialized to a small number larger than zero when a new layout is
+    created, and is increased whenever the layout is changed using any of
+    its setters or :meth:`context_changed()`, or when its :class:`Context`
+    has changed. It never goes back to zero, and only wraps around after
+    2³² changes.
+
+    This can be used to detect cheaply whether a layout has changed since
+    its extents or lines were last computed, for instance with
+    :class:`ChangeTracker`.
+    """
+
+    def context_changed(self) -> None:
+        """
+        Forces the layout to be laid out again, after its :class:`Context`
+        has been changed in a way that Pango can't detect. Changes made
+        through the setters of the context are detected automatically.
+        """
+        pango.pango_layout_context_changed(self._pointer)
+
+    def _get_text(self) -> str:
+        return self._get_text_index().text
 
     def _set_text(self, text: str) -> None:
-        text_pointer = ffi.new("char[]", text.encode("utf8"))
-        pango.pango_layout_set_text(self._pointer, text_pointer, -1)
+        # A bytes object is null-terminated and passed to Pango without being
+        # copied into a new buffer.
+        text_bytes = text.encode("utf8")
+        pango.pango_layout_set_text(self._pointer, text_bytes, -1)
+        # Pango truncates the text at the first null character, in which case
+        # the text is read back from the layout when it is next accessed.
+        if "\0" in text:
+            self._cached_text = None
+        else:
+            self._cached_text = (
+                pango.pango_layout_get_serial(self._pointer),
+                TextIndex(text)
+            )
 
     text: str = property(_get_text, _set_text)
     """
@@ -182,6 +310,38 @@ class Layout(PangoObject):
     The tab stops for this layout.
     """
 
+    def set_text_bytes(
+            self,
+            text: Union[bytes, bytearray, memoryview]
+    ) -> None:
+        """
+        Sets the text of the layout from text that is already UTF-8 encoded.
+        Unlike setting :attr:`text`, the text is not decoded or copied before
+        being passed to Pango, which makes this preferable for large
+        documents.
+
+        As with :attr:`text`, the text ends at the first null byte, if any.
+
+        :param text:
+            UTF-8 encoded text, as any object supporting the buffer protocol.
+        :raises ValueError:
+            if the text is not valid UTF-8. The text of the layout is left
+            unchanged.
+        """
+        text_buffer = ffi.from_buffer(text)
+        try:
+            codecs.utf_8_decode(ffi.buffer(text_buffer), 'strict', True)
+        except UnicodeDecodeError as error:
+            # Bytes after a null byte are ignored by Pango
+            if b'\0' not in ffi.buffer(text_buffer)[:error.start]:
+                raise ValueError(
+                    'text is not valid UTF-8: {}'.format(error)
+                ) from error
+        pango.pango_layout_set_text(
+            self._pointer, text_buffer, len(text_buffer)
+        )
+        self._cached_text = None
+
     def apply_markup(self, markup: str) -> None:
         """
         Sets the layout text and attribute list from marked-up text.
@@ -189,8 +349,9 @@ class Layout(PangoObject):
         :param markup:
             marked-up text
         """
-        markup_pointer = ffi.new("char[]", markup.encode("utf8"))
-        pango.pango_layout_set_markup(self._pointer, markup_pointer, -1)
+        markup_bytes = markup.encode("utf8")
+        pango.pango_layout_set_markup(self._pointer, markup_bytes, -1)
+        self._cached_text = None
 
     def get_extents(self) -> Tuple[Rectangle, Rectangle]:
         """
@@ -253,6 +414,292 @@ class Layout(PangoObject):
         """
         return pango.pango_layout_get_line_count(self._pointer)
 
+    def get_line(self, line: int) -> Optional[LayoutLine]:
+        """
+        Returns a line of the layout.
+
+        :param line:
+            the index of the line, which must be between ``0`` and
+            ``get_line_count() - 1``.
+        :return:
+            the line, or ``None`` if the index is out of range.
+        """
+        line_pointer = pango.pango_layout_get_line_readonly(
+            self._pointer, line
+        )
+        if line_pointer == ffi.NULL:
+            return None
+        return LayoutLine._from_borrowed_pointer(line_pointer)
+
+    def get_lines(self) -> List[LayoutLine]:
+        """
+        Returns the lines of the layout.
+
+        :return:
+            a list of the lines of the layout.
+        """
+        lines = []
+        node = pango.pango_layout_get_lines_readonly(self._pointer)
+        while node != ffi.NULL:
+            lines.append(LayoutLine._from_borrowed_pointer(
+                ffi.cast("PangoLayoutLine *", node.data)
+            ))
+            node = node.next
+        return lines
+
+    def line_metrics(self) -> LineMetrics:
+        """
+        Returns the start index, length, baseline and logical extents of
+        every line of the layout at once, in compact arrays. This is
+        considerably faster than iterating over the lines with
+        :meth:`LayoutIter.next_line()` and calling
+        :meth:`LayoutIter.get_line_extents()` for every line.
+
+        :return:
+            the metrics of the lines of the layout.
+        """
+        count = pango.pango_layout_get_line_count(self._pointer)
+        columns = [
+            array("i", bytes(count * array("i").itemsize))
+            for _ in range(len(LineMetrics._fields))
+        ]
+        start_indices, lengths, baselines, xs, ys, widths, heights = columns
+
+        # The iterator computes the position of every line, taking the
+        # spacing and line height of the layout into account.
+        iter_pointer = pango.pango_layout_get_iter(self._pointer)
+        logical_rect = ffi.new("PangoRectangle *")
+        get_line = pango.pango_layout_iter_get_line_readonly
+        get_baseline = pango.pango_layout_iter_get_baseline
+        get_line_extents = pango.pango_layout_iter_get_line_extents
+        next_line = pango.pango_layout_iter_next_line
+        try:
+            for i in range(count):
+                line = get_line(iter_pointer)
+                start_indices[i] = line.start_index
+                lengths[i] = line.length
+                baselines[i] = get_baseline(iter_pointer)
+                get_line_extents(iter_pointer, ffi.NULL, logical_rect)
+                xs[i] = logical_rect.x
+                ys[i] = logical_rect.y
+                widths[i] = logical_rect.width
+                heights[i] = logical_rect.height
+                next_line(iter_pointer)
+        finally:
+            pango.pango_layout_iter_free(iter_pointer)
+        return LineMetrics(*columns)
+
+    def xy_to_index(self, x: int, y: int) -> Tuple[int, int, bool]:
+        """
+        Converts a position within the layout to the grapheme at that
+        position. Positions outside the layout are clamped to the nearest
+        line, and to the first or last grapheme of that line.
+
+        :param x:
+            the x offset from the left edge of the layout, in Pango units.
+        :param y:
+            the y offset from the top edge of the layout, in Pango units.
+        :return:
+            a tuple containing the byte index of the grapheme, the number of
+            characters from the start of the grapheme to the edge closest to
+            the position (``0`` for the leading edge), and whether the
+            position was inside the layout.
+        """
+        index_and_trailing = ffi.new("int[2]")
+        inside = pango.pango_layout_xy_to_index(
+            self._pointer,
+            x,
+            y,
+            index_and_trailing,
+            index_and_trailing + 1
+        )
+        return index_and_trailing[0], index_and_trailing[1], bool(inside)
+
+    def xy_to_indices(
+            self,
+            xs: Sequence[int],
+            ys: Sequence[int]
+    ) -> Tuple[array, array, array]:
+        """
+        Converts many positions within the layout to the graphemes at those
+        positions, as :meth:`xy_to_index()` does. This is considerably faster
+        than calling :meth:`xy_to_index()` for every position, since a single
+        set of output parameters is reused, and the results are written
+        directly into arrays.
+
+        :param xs:
+            the x offsets from the left edge of the layout, in Pango units.
+        :param ys:
+            the y offsets from the top edge of the layout, in Pango units.
+        :return:
+            a tuple containing the byte indices of the graphemes and the
+            trailing offsets, as ``array.array('i')``, and whether each
+            position was inside the layout, as ``array.array('b')``.
+        :raises: AssertionError
+            When ``xs`` and ``ys`` don't have the same length.
+        """
+        assert len(xs) == len(ys), "xs and ys don't have the same length"
+        count = len(xs)
+        indices = array("i", bytes(count * array("i").itemsize))
+        trailings = array("i", indices)
+        insides = array("b", bytes(count))
+
+        layout_pointer = self._pointer
+        index_and_trailing = ffi.new("int[2]")
+        trailing_pointer = index_and_trailing + 1
+        xy_to_index = pango.pango_layout_xy_to_index
+        for i, (x, y) in enumerate(zip(xs, ys)):
+            insides[i] = xy_to_index(
+                layout_pointer, x, y, index_and_trailing, trailing_pointer
+            )
+            indices[i] = index_and_trailing[0]
+            trailings[i] = index_and_trailing[1]
+        return indices, trailings, insides
+
+    def index_to_pos(self, index: int) -> Rectangle:
+        """
+        Converts a byte index within the layout to the onscreen position of
+        the grapheme at that index. The x position is the leading edge of the
+        grapheme, and the width is negative for right-to-left text.
+
+        :param index:
+            the byte index of a grapheme within the layout's text.
+        :return:
+            the position of the grapheme, in Pango units.
+        """
+        pos = Rectangle()
+        pango.pango_layout_index_to_pos(self._pointer, index, pos.pointer)
+        return pos
+
+    def get_cursor_pos(self, index: int) -> Tuple[Rectangle, Rectangle]:
+        """
+        Given a byte index within the layout, determines the positions of the
+        strong and weak cursors if the insertion point is at that index. The
+        strong cursor is where text of the base direction of the layout is
+        inserted, and the weak cursor is where text of the opposite direction
+        is inserted. Both cursors are at the same position in unidirectional
+        text.
+
+        :param index:
+            the byte index of the cursor.
+        :return:
+            a tuple containing the positions of the strong cursor and of the
+            weak cursor, as zero width rectangles in Pango units.
+        """
+        strong_pos = Rectangle()
+        weak_pos = Rectangle()
+        pango.pango_layout_get_cursor_pos(
+            self._pointer, index, strong_pos.pointer, weak_pos.pointer
+        )
+        return strong_pos, weak_pos
+
+    def index_to_line_x(
+            self,
+            index: int,
+            trailing: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Converts a byte index within the layout to a line and an x position
+        within that line.
+
+        :param index:
+            the byte index of a grapheme within the layout's text.
+        :param trailing:
+            whether to return the position of the trailing edge of the
+            grapheme instead of the leading edge.
+        :return:
+            a tuple containing the index of the line, and the x offset from
+            the start of that line in Pango units.
+        """
+        line_and_x = ffi.new("int[2]")
+        pango.pango_layout_index_to_line_x(
+            self._pointer, index, trailing, line_and_x, line_and_x + 1
+        )
+        return line_and_x[0], line_and_x[1]
+
+    def indices_to_pos(self, indices: Sequence[int]) -> array:
+        """
+        Converts many byte indices to positions, as :meth:`index_to_pos()`
+        does, without creating a :class:`Rectangle` for every index.
+
+        :param indices:
+            the byte indices of graphemes within the layout's text.
+        :return:
+            an ``array.array('i')`` containing the ``x``, ``y``, ``width``
+            and ``height`` of every position in turn, which can be viewed as
+            an array of shape ``(len(indices), 4)`` with
+            ``numpy.frombuffer(positions, dtype=numpy.intc).reshape(-1, 4)``.
+        """
+        rects = ffi.new("PangoRectangle[]", len(indices))
+        layout_pointer = self._pointer
+        index_to_pos = pango.pango_layout_index_to_pos
+        for i, index in enumerate(indices):
+            index_to_pos(layout_pointer, index, rects + i)
+        return _rectangles_to_array(rects)
+
+    def get_cursor_positions(
+            self,
+            indices: Sequence[int]
+    ) -> Tuple[array, array]:
+        """
+        Determines the positions of the strong and weak cursors for many byte
+        indices, as :meth:`get_cursor_pos()` does, without creating a
+        :class:`Rectangle` for every cursor.
+
+        :param indices:
+            the byte indices of the cursors.
+        :return:
+            a tuple containing the positions of the strong cursors and of the
+            weak cursors, in the same format as :meth:`indices_to_pos()`.
+        """
+        count = len(indices)
+        strong_rects = ffi.new("PangoRectangle[]", count)
+        weak_rects = ffi.new("PangoRectangle[]", count)
+        layout_pointer = self._pointer
+        get_cursor_pos = pango.pango_layout_get_cursor_pos
+        for i, index in enumerate(indices):
+            get_cursor_pos(
+                layout_pointer, index, strong_rects + i, weak_rects + i
+            )
+        return (
+            _rectangles_to_array(strong_rects),
+            _rectangles_to_array(weak_rects)
+        )
+
+    def indices_to_line_x(
+            self,
+            indices: Sequence[int],
+            trailing: bool = False
+    ) -> Tuple[array, array]:
+        """
+        Converts many byte indices to lines and x positions, as
+        :meth:`index_to_line_x()` does.
+
+        :param indices:
+            the byte indices of graphemes within the layout's text.
+        :param trailing:
+            whether to return the positions of the trailing edges of the
+            graphemes instead of the leading edges.
+        :return:
+            a tuple containing the indices of the lines and the x offsets
+            from the start of those lines, as ``array.array('i')``.
+        """
+        count = len(indices)
+        lines_and_xs = ffi.new("int[]", 2 * count)
+        layout_pointer = self._pointer
+        index_to_line_x = pango.pango_layout_index_to_line_x
+        for i, index in enumerate(indices):
+            index_to_line_x(
+                layout_pointer,
+                index,
+                trailing,
+                lines_and_xs + 2 * i,
+                lines_and_xs + 2 * i + 1
+            )
+        flat = array("i")
+        flat.frombytes(ffi.buffer(lines_and_xs))
+        return flat[0::2], flat[1::2]
+
     def get_iter(self) -> LayoutIter:
         """
         Returns an iterator to iterate over the visual extents of the layout.
@@ -262,3 +709,87 @@ class Layout(PangoObject):
         """
         layout_iterator_pointer = pango.pango_layout_get_iter(self._pointer)
         return LayoutIter(layout_iterator_pointer)
+
+    def serialize(
+            self,
+            flags: LayoutSerializeFlags = LayoutSerializeFlags.DEFAULT
+    ) -> bytes:
+        """
+        Serializes the layout, so that it can be stored and recreated later,
+        possibly in another process, with :meth:`deserialize()`. Requires
+        Pango 1.50 or later.
+
+        The format is JSON, and is not guaranteed to be stable across Pango
+        versions.
+
+        :param flags:
+            what to include in the serialization.
+        :return:
+            the serialized layout.
+        """
+        bytes_pointer = pango.pango_layout_serialize(
+            self._pointer, flags.value
+        )
+        try:
+            size_pointer = ffi.new("gsize *")
+            data_pointer = glib.g_bytes_get_data(bytes_pointer, size_pointer)
+            return ffi.buffer(data_pointer, size_pointer[0])[:]
+        finally:
+            glib.g_bytes_unref(bytes_pointer)
+
+    @classmethod
+    def deserialize(
+            cls,
+            context: Context,
+            data: bytes,
+            flags: LayoutDeserializeFlags = LayoutDeserializeFlags.DEFAULT
+    ) -> "Layout":
+        """
+        Creates a layout from data produced by :meth:`serialize()`. Requires
+        Pango 1.50 or later.
+
+        :param context:
+            the :class:`Context` for the new layout.
+        :param data:
+            the serialized layout.
+        :param flags:
+            how to apply the serialized properties.
+        :return:
+            the new layout.
+        :raises: ValueError
+            When ``data`` is not a valid serialized layout.
+        """
+        bytes_pointer = glib.g_bytes_new(ffi.from_buffer(data), len(data))
+        error_pointer = ffi.new("GError **")
+        try:
+            layout_pointer = pango.pango_layout_deserialize(
+                context.pointer, bytes_pointer, flags.value, error_pointer
+            )
+        finally:
+            glib.g_bytes_unref(bytes_pointer)
+        if layout_pointer == ffi.NULL:
+            raise ValueError(_take_error_message(error_pointer))
+        return cls.from_pointer(layout_pointer, gc=True)
+
+    def write_to_file(
+            self,
+            filename: Union[str, bytes, os.PathLike],
+            flags: LayoutSerializeFlags = LayoutSerializeFlags.DEFAULT
+    ) -> None:
+        """
+        Serializes the layout, as :meth:`serialize()` does, and writes the
+        result to a file. Requires Pango 1.50 or later.
+
+        :param filename:
+            the path of the file to write.
+        :param flags:
+            what to include in the serialization.
+        :raises: OSError
+            When the file can't be written.
+        """
+        error_pointer = ffi.new("GError **")
+        written = pango.pango_layout_write_to_file(
+            self._pointer, flags.value, os.fsencode(filename), error_pointer
+        )
+        if not written:
+            raise OSError(_take_error_message(error_pointer))
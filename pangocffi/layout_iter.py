@@ -1,6 +1,9 @@
 from typing import Tuple, Optional
 from . import pango, ffi
-from . import PangoObject, LayoutRun, Rectangle
+from .layout_line import LayoutLine
+from .layout_run import LayoutRun
+from .pango_object import PangoObject
+from .rectangle import Rectangle
 
 
 class LayoutIter(PangoObject):
@@ -107,7 +110,16 @@ class LayoutIter(PangoObject):
             return None
         return LayoutRun.from_pointer(run_pointer)
 
-    # def get_line(_readonly)
+    def get_line(self) -> LayoutLine:
+        """
+        Returns the current line.
+
+        :return:
+            the current line
+        """
+        return LayoutLine._from_borrowed_pointer(
+            pango.pango_layout_iter_get_line_readonly(self._pointer)
+        )
 
     # def get_layout
 
@@ -0,0 +1,195 @@
+from array import array
+from typing import List, NamedTuple, Tuple
+from . import pango, ffi, glib
+from .enums import Direction
+from .pango_object import PangoObject
+from .rectangle import Rectangle
+
+
+class LayoutLine(PangoObject):
+    """
+    A :class:`LayoutLine` represents one of the lines resulting from laying
+    out a paragraph with a :class:`Layout`.
+
+    Lines are obtained with :meth:`Layout.get_line()`,
+    :meth:`Layout.get_lines()` or :meth:`LayoutIter.get_line()`. A line keeps
+    its own reference, so it stays valid after the layout is modified, but it
+    then no longer belongs to the layout. To read the metrics of every line
+    at once, use :meth:`Layout.line_metrics()`.
+    """
+
+    _GC_METHOD = pango.pango_layout_line_unref
+
+    @classmethod
+    def _from_borrowed_pointer(cls, pointer: ffi.CData) -> "LayoutLine":
+        """
+        Instantiates a line from a pointer owned by a layout, taking a new
+        reference to the line.
+        """
+        if pointer == ffi.NULL:
+            raise ValueError("Null pointer")
+        return cls.from_pointer(pango.pango_layout_line_ref(pointer), gc=True)
+
+    @property
+    def start_index(self) -> int:
+        """
+        The start of the line as a byte index into the text of the layout.
+        """
+        return self._pointer.start_index
+
+    @property
+    def length(self) -> int:
+        """The length of the line in bytes."""
+        return self._pointer.length
+
+    @property
+    def is_paragraph_start(self) -> bool:
+        """Whether this is the first line of a paragraph."""
+        return bool(self._pointer.is_paragraph_start)
+
+    @property
+    def resolved_direction(self) -> Direction:
+        """The resolved direction of the line."""
+        return Direction(self._pointer.resolved_dir)
+
+    def get_extents(self) -> Tuple[Rectangle, Rectangle]:
+        """
+        Computes the logical and ink extents of the line. The extents are
+        relative to the baseline of the line, and the start of the line.
+
+        :return:
+            a tuple containing two :class:`Rectangle` objects.
+            The first is the extent of the line as drawn.
+            The second is the logical extent of the line.
+        """
+        ink_rect = Rectangle()
+        logical_rect = Rectangle()
+        pango.pango_layout_line_get_extents(
+            self._pointer, ink_rect.pointer, logical_rect.pointer
+        )
+        return ink_rect, logical_rect
+
+    def get_height(self) -> int:
+        """
+        Computes the height of the line, as the maximum of the heights of
+        fonts used in this line. Requires Pango 1.44 or later.
+
+        :return:
+            the height of the line in Pango units.
+        """
+        height_pointer = ffi.new("int *")
+        pango.pango_layout_line_get_height(self._pointer, height_pointer)
+        return height_pointer[0]
+
+    def index_to_x(self, index: int, trailing: bool = False) -> int:
+        """
+        Converts a byte index within the line to an x position.
+
+        :param index:
+            the byte index of a grapheme within the layout's text.
+        :param trailing:
+            whether to return the position of the trailing edge of the
+            grapheme instead of the leading edge.
+        :return:
+            the x offset from the start of the line, in Pango units.
+        """
+        x_pointer = ffi.new("int *")
+        pango.pango_layout_line_index_to_x(
+            self._pointer, index, trailing, x_pointer
+        )
+        return x_pointer[0]
+
+    def x_to_index(self, x: int) -> Tuple[int, int, bool]:
+        """
+        Converts an x position from the start of the line to the grapheme at
+        that position. Positions before the start or after the end of the
+        line are clamped to the first or last grapheme of the line.
+
+        :param x:
+            the x offset from the start of the line, in Pango units.
+        :return:
+            a tuple containing the byte index of the grapheme, the number of
+            characters from the start of the grapheme to the edge closest to
+            ``x`` (``0`` for the leading edge), and whether ``x`` was inside
+            the line.
+        """
+        index_and_trailing = ffi.new("int[2]")
+        inside = pango.pango_layout_line_x_to_index(
+            self._pointer,
+            x,
+            index_and_trailing,
+            index_and_trailing + 1
+        )
+        return index_and_trailing[0], index_and_trailing[1], bool(inside)
+
+    def get_x_ranges(
+            self,
+            start_index: int,
+            end_index: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Returns the x ranges covered by a range of text within the line,
+        which are the areas to highlight when that text is selected. In
+        bidirectional text, a single range of text can cover several x
+        ranges.
+
+        :param start_index:
+            the start of the range of text, as a byte index into the layout's
+            text.
+        :param end_index:
+            the end of the range of text, as a byte index into the layout's
+            text.
+        :return:
+            a list of ``(x0, x1)`` tuples in Pango units, relative to the
+            left edge of the layout.
+        """
+        ranges_pointer = ffi.new("int **")
+        count_pointer = ffi.new("int *")
+        pango.pango_layout_line_get_x_ranges(
+            self._pointer,
+            start_index,
+            end_index,
+            ranges_pointer,
+            count_pointer
+        )
+        ranges = ranges_pointer[0]
+        try:
+            return [
+                (ranges[2 * i], ranges[2 * i + 1])
+                for i in range(count_pointer[0])
+            ]
+        finally:
+            glib.g_free(ranges)
+
+
+class LineMetrics(NamedTuple):
+    """
+    The metrics of every line of a :class:`Layout`, as returned by
+    :meth:`Layout.line_metrics()`. Every field is an ``array.array('i')``
+    with one item per line, which can be converted to a NumPy array without
+    copying with ``numpy.frombuffer(array, dtype=numpy.intc)``.
+
+    Positions are in Pango units and in layout coordinates (the origin is
+    the top left corner of the layout).
+    """
+
+    start_indices: array
+    """The start of every line, as a byte index into the text."""
+
+    lengths: array
+    """The length of every line in bytes."""
+
+    baselines: array
+    """The y position of the baseline of every line."""
+
+    xs: array
+    """The x position of the logical extents of every line."""
+
+    ys: array
+    """The y position of the logical extents of every line."""
+
+    widths: array
+    """The width of the logical extents of every line."""
+
+    heights: array
+    """The height of the logical extents of every line."""
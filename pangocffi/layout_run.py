@@ -1,4 +1,4 @@
-from . import GlyphItem
+from .glyph_item import GlyphItem
 
 
 class LayoutRun(GlyphItem):
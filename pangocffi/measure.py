@@ -0,0 +1,486 @@
+import heapq
+import math
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from typing import Iterable, NamedTuple, Optional, Sequence, Tuple
+
+from . import ffi, pango
+from .attr_list import AttrList
+from .context import Context
+from .enums import EllipsizeMode, WrapMode
+from .font_description import FontDescription
+from .font_metrics import FontMetrics
+from .layout import Layout
+from .rectangle import Rectangle
+
+_Extents = Tuple[int, int, int, int]
+
+
+def _to_rectangle(extents: _Extents) -> Rectangle:
+    x, y, width, height = extents
+    return Rectangle(width=width, height=height, x=x, y=y)
+
+
+def _same_font_description(
+        a: Optional[FontDescription],
+        b: Optional[FontDescription]
+) -> bool:
+    # Font descriptions are compared by value, which FontDescription itself
+    # doesn't do.
+    if a is None or b is None:
+        return a is b
+    return bool(pango.pango_font_description_equal(a.pointer, b.pointer))
+
+
+def _font_description_hash(
+        font_description: Optional[FontDescription]
+) -> Optional[int]:
+    if font_description is None:
+        return None
+    return pango.pango_font_description_hash(font_description.pointer)
+
+
+class MeasurementCache:
+    """
+    A :class:`MeasurementCache` remembers the ink and logical extents of
+    texts laid out with a :class:`Context`, so that measuring the same text
+    with the same settings again (for instance labels, table cells or legend
+    entries) does not have to lay it out again.
+
+    Entries are keyed on the text, the font description, the width, the wrap
+    and ellipsize modes, and the attributes. At most ``maxsize`` entries are
+    kept, and the least recently used entry is discarded first.
+
+    The cache also remembers the :class:`FontMetrics` of font descriptions,
+    see :meth:`get_metrics()`.
+
+    All entries are discarded when the serial of the context changes, for
+    instance when its font map or font description is changed.
+
+    A :class:`MeasurementCache` can be shared between threads, but texts are
+    laid out with a single :class:`Layout` and the :class:`Context`, so only
+    one thread measures a text that is not in the cache at a time. The
+    context must not be used by other threads while the cache is in use.
+    """
+
+    def __init__(self, context: Context, maxsize: int = 1024):
+        """
+        :param context:
+            the :class:`Context` to lay out texts with.
+        :param maxsize:
+            the maximum number of entries to keep.
+        :raises: AssertionError
+            When ``maxsize`` isn't a positive :class:`int`.
+        """
+        assert isinstance(maxsize, int) and maxsize > 0, \
+            "maxsize isn't a positive int"
+        self._context = context
+        self._layout = Layout(context)
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._metrics = OrderedDict()
+        self._context_serial = context.serial
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def context(self) -> Context:
+        """The :class:`Context` used to lay out texts."""
+        return self._context
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of entries that are kept."""
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        """The number of measurements that were served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of measurements that required laying out the text."""
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """
+        Discards all entries, and resets :attr:`hits` and :attr:`misses`.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._metrics.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def _check_context_changed(self) -> None:
+        serial = self._context.serial
+        if serial != self._context_serial:
+            self._entries.clear()
+            self._metrics.clear()
+            self._layout.context_changed()
+            self._context_serial = serial
+
+    def get_extents(
+            self,
+            text: str,
+            font_description: Optional[FontDescription] = None,
+            width: int = -1,
+            wrap: WrapMode = WrapMode.WORD,
+            ellipsize: EllipsizeMode = EllipsizeMode.NONE,
+            attributes: Optional[AttrList] = None
+    ) -> Tuple[Rectangle, Rectangle]:
+        """
+        Computes the ink and logical extents of ``text``, as returned by
+        :meth:`Layout.get_extents()`, or returns them from the cache.
+
+        :param text:
+            the text to measure.
+        :param font_description:
+            the font description to use, or ``None`` to use the font
+            description of the context.
+        :param width:
+            the width to wrap or ellipsize the text at, in Pango units, or
+            ``-1`` to not wrap or ellipsize the text.
+        :param wrap:
+            the wrap mode.
+        :param ellipsize:
+            the ellipsize mode.
+        :param attributes:
+            the :class:`AttrList` to apply to the text. Requires Pango 1.50
+            or later, since the attributes are keyed on their string form.
+        :return:
+            a tuple containing two new :class:`Rectangle` objects, the ink
+            extents and the logical extents of the text.
+        """
+        with self._lock:
+            self._check_context_changed()
+
+            font_hash = _font_description_hash(font_description)
+            attributes_string = None
+            if attributes is not None:
+                attributes_string = attributes.to_string()
+            key = (
+                text,
+                font_hash,
+                width,
+                wrap.value,
+                ellipsize.value,
+                attributes_string
+            )
+
+            entry = self._entries.get(key)
+            # Different font descriptions can have the same hash, so the font
+            # description of the entry is compared too.
+            if entry is not None and _same_font_description(
+                entry[0], font_description
+            ):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                _, ink, logical = entry
+            else:
+                self._misses += 1
+                ink, logical = self._measure(
+                    text, font_description, width, wrap, ellipsize, attributes
+                )
+                if font_description is not None:
+                    font_description = font_description.copy()
+                self._entries[key] = (font_description, ink, logical)
+                self._entries.move_to_end(key)
+                if len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+        return _to_rectangle(ink), _to_rectangle(logical)
+
+    def get_metrics(
+            self,
+            font_description: Optional[FontDescription] = None
+    ) -> FontMetrics:
+        """
+        Gets the :class:`FontMetrics` of a font description, as returned by
+        :meth:`Context.get_metrics()`, or returns them from the cache.
+        Metrics are not counted in :attr:`hits` and :attr:`misses`.
+
+        :param font_description:
+            the font description to get the metrics for, or ``None`` to use
+            the font description of the context.
+        :return:
+            the metrics of the font description. They are shared with other
+            callers, and must not be modified.
+        """
+        with self._lock:
+            self._check_context_changed()
+
+            font_hash = _font_description_hash(font_description)
+            entry = self._metrics.get(font_hash)
+            if entry is not None and _same_font_description(
+                entry[0], font_description
+            ):
+                self._metrics.move_to_end(font_hash)
+                return entry[1]
+
+            metrics = self._context.get_metrics(font_description)
+            if font_description is not None:
+                font_description = font_description.copy()
+            self._metrics[font_hash] = (font_description, metrics)
+            self._metrics.move_to_end(font_hash)
+            if len(self._metrics) > self._maxsize:
+                self._metrics.popitem(last=False)
+        return metrics
+
+    def _measure(
+            self,
+            text: str,
+            font_description: Optional[FontDescription],
+            width: int,
+            wrap: WrapMode,
+            ellipsize: EllipsizeMode,
+            attributes: Optional[AttrList]
+    ) -> Tuple[_Extents, _Extents]:
+        layout = self._layout
+        layout.font_description = font_description
+        layout.width = width
+        layout.wrap = wrap
+        layout.ellipsize = ellipsize
+        layout.attributes = attributes
+        layout.text = text
+        ink, logical = layout.get_extents()
+        return (
+            (ink.x, ink.y, ink.width, ink.height),
+            (logical.x, logical.y, logical.width, logical.height)
+        )
+
+    def get_size(
+            self,
+            text: str,
+            font_description: Optional[FontDescription] = None,
+            width: int = -1,
+            wrap: WrapMode = WrapMode.WORD,
+            ellipsize: EllipsizeMode = EllipsizeMode.NONE,
+            attributes: Optional[AttrList] = None
+    ) -> Tuple[int, int]:
+        """
+        Determines the logical width and height of ``text`` in Pango units.
+        This is simply a convenience function around :meth:`get_extents()`.
+
+        :return:
+            a tuple containing the logical width and height, respectively.
+        """
+        _, logical = self.get_extents(
+            text, font_description, width, wrap, ellipsize, attributes
+        )
+        return logical.width, logical.height
+
+
+def measure_many(
+        context: Context,
+        texts: Sequence[str],
+        font_description: Optional[FontDescription] = None,
+        width: int = -1,
+        wrap: WrapMode = WrapMode.WORD,
+        ellipsize: EllipsizeMode = EllipsizeMode.NONE
+) -> Tuple[array, array, array]:
+    """
+    Measures many texts with the same settings, which is considerably faster
+    than setting the :attr:`Layout.text` of a :class:`Layout` and calling
+    :meth:`Layout.get_size()` for every text, since a single layout and a
+    single set of output parameters are reused, and the results are written
+    directly into arrays.
+
+    The results are ``array.array('i')`` columns, which can be converted to
+    NumPy arrays without copying with ``numpy.frombuffer(widths,
+    dtype=numpy.intc)``.
+
+    :param context:
+        the :class:`Context` to lay out the texts with.
+    :param texts:
+        the texts to measure.
+    :param font_description:
+        the font description to use, or ``None`` to use the font description
+        of the context.
+    :param width:
+        the width to wrap or ellipsize the texts at, in Pango units, or
+        ``-1`` to not wrap or ellipsize the texts.
+    :param wrap:
+        the wrap mode.
+    :param ellipsize:
+        the ellipsize mode.
+    :return:
+        a tuple containing the logical widths, the logical heights and the
+        baselines of the texts, in Pango units.
+    """
+    layout = Layout(context)
+    layout.font_description = font_description
+    layout.width = width
+    layout.wrap = wrap
+    layout.ellipsize = ellipsize
+
+    count = len(texts)
+    widths = array('i', bytes(count * array('i').itemsize))
+    heights = array('i', widths)
+    baselines = array('i', widths)
+
+    layout_pointer = layout.pointer
+    size = ffi.new('int[2]')
+    width_pointer = size
+    height_pointer = size + 1
+    set_text = pango.pango_layout_set_text
+    get_size = pango.pango_layout_get_size
+    get_baseline = pango.pango_layout_get_baseline
+    for i, text in enumerate(texts):
+        text_bytes = text.encode('utf-8')
+        set_text(layout_pointer, text_bytes, len(text_bytes))
+        get_size(layout_pointer, width_pointer, height_pointer)
+        widths[i] = size[0]
+        heights[i] = size[1]
+        baselines[i] = get_baseline(layout_pointer)
+    return widths, heights, baselines
+
+
+class ColumnWidth(NamedTuple):
+    """
+    The widths of the texts of a column, as returned by
+    :func:`column_width()`. Widths are logical widths in Pango units.
+    """
+
+    max_width: int
+    """The width of the widest text."""
+
+    percentile_widths: Tuple[int, ...]
+    """The width at every requested percentile."""
+
+    count: int
+    """The number of texts."""
+
+    measured: int
+    """The number of distinct texts that were laid out."""
+
+
+def column_width(
+        context: Context,
+        texts: Iterable[str],
+        font_description: Optional[FontDescription] = None,
+        percentiles: Sequence[float] = (),
+        slack: Optional[float] = None,
+        cache: Optional[MeasurementCache] = None
+) -> ColumnWidth:
+    """
+    Computes the natural width of a column of a table, as the width of its
+    widest text, and optionally the width at some percentiles, for instance
+    to size the column so that 95% of its texts fit.
+
+    The texts are counted, and every distinct text is laid out once, from
+    longest to shortest.
+
+    When ``slack`` is given, the remaining texts are skipped once they can
+    no longer change the result, which is much faster for long columns of
+    short values. The width of a text is then estimated to be at most its
+    number of characters, times the widest of the approximate character and
+    digit widths of the font (see :meth:`Context.get_metrics()`), times
+    ``slack``. This is only a heuristic: Pango has no bound on how wide a
+    character can be, so a text with unusually wide characters, such as
+    emoji or CJK characters in a Latin font, can be wider than estimated.
+    If such a text is skipped, the returned widths are too narrow. Only use
+    ``slack`` when the characters of the texts are known, such as for
+    numbers.
+
+    Percentiles use the nearest rank: the width at percentile ``p`` is the
+    smallest width that at least ``p`` percent of the texts are no wider
+    than.
+
+    :param context:
+        the :class:`Context` to lay out the texts with.
+    :param texts:
+        the texts of the column, such as the values of a column of a CSV
+        file.
+    :param font_description:
+        the font description to use, or ``None`` to use the font description
+        of the context.
+    :param percentiles:
+        the percentiles, between 0 and 100, to compute the width at.
+    :param slack:
+        how much wider than its estimate a text can be, to skip texts that
+        are estimated to be too short to change the result, or ``None`` to
+        lay out every distinct text.
+    :param cache:
+        a :class:`MeasurementCache` of the same context, to get the font
+        metrics used with ``slack`` from, or ``None`` to get them from the
+        context on every call. Sizing many columns with the same font is
+        faster with a cache.
+    :return:
+        the widths of the column.
+    :raises: AssertionError
+        When a percentile isn't between 0 and 100, ``slack`` isn't positive,
+        or ``cache`` belongs to another context.
+    """
+    assert all(0 <= percentile <= 100 for percentile in percentiles), \
+        "percentile isn't between 0 and 100"
+    assert slack is None or slack > 0, "slack isn't positive"
+    assert cache is None or cache.context.pointer == context.pointer, \
+        "cache belongs to another context"
+    counts = Counter(texts)
+    count = sum(counts.values())
+    if count == 0:
+        return ColumnWidth(0, (0,) * len(percentiles), 0, 0)
+
+    # The texts are needed down to the largest rank, counted from the
+    # widest text, that a percentile refers to.
+    ranks = [
+        count - max(math.ceil(percentile / 100 * count), 1) + 1
+        for percentile in percentiles
+    ]
+    needed = max(ranks, default=1)
+
+    layout = Layout(context)
+    layout.font_description = font_description
+    layout_pointer = layout.pointer
+    size = ffi.new('int[2]')
+    width_pointer = size
+    height_pointer = size + 1
+    set_text = pango.pango_layout_set_text
+    get_size = pango.pango_layout_get_size
+
+    if slack is None:
+        char_width = math.inf
+    else:
+        if cache is None:
+            metrics = context.get_metrics(font_description)
+        else:
+            metrics = cache.get_metrics(font_description)
+        char_width = slack * max(
+            metrics.approximate_char_width,
+            metrics.approximate_digit_width
+        )
+
+    # A min-heap of the widths of the widest texts laid out so far, each
+    # with the number of times the text occurs, that just covers the needed
+    # rank. Its smallest width is the width at that rank so far.
+    widest = []
+    covered = 0
+    measured = 0
+    for text in sorted(counts, key=len, reverse=True):
+        if covered >= needed and len(text) * char_width < widest[0][0]:
+            break
+        text_bytes = text.encode('utf-8')
+        set_text(layout_pointer, text_bytes, len(text_bytes))
+        get_size(layout_pointer, width_pointer, height_pointer)
+        measured += 1
+        text_count = counts[text]
+        heapq.heappush(widest, (size[0], text_count))
+        covered += text_count
+        while covered - widest[0][1] >= needed:
+            covered -= heapq.heappop(widest)[1]
+
+    widest.sort(reverse=True)
+    rank_widths = []
+    for rank in ranks:
+        for width, text_count in widest:
+            rank -= text_count
+            if rank <= 0:
+                break
+        rank_widths.append(width)
+    return ColumnWidth(widest[0][0], tuple(rank_widths), count, measured)
@@ -0,0 +1,235 @@
+import bisect
+from array import array
+from typing import NamedTuple, Optional
+
+from . import ffi, pango
+from .change_tracker import ChangeTracker
+from .layout import Layout
+
+
+class PageBreaks(NamedTuple):
+    """
+    The pages computed by a :class:`Paginator`, in compact arrays with an
+    item per page.
+    """
+
+    line_indices: array
+    """The index of the first line of every page."""
+
+    start_indices: array
+    """
+    The byte index into the text of the layout at which every page starts.
+    """
+
+    y_offsets: array
+    """
+    The y position of the top of every page in layout coordinates, in Pango
+    units. A page is rendered by moving the layout up by this offset and
+    clipping it to the page height.
+    """
+
+
+class Paginator:
+    """
+    A :class:`Paginator` flows the lines of a :class:`Layout` across pages
+    of a fixed height, and computes where every page starts. A page holds as
+    many whole lines as fit within its height, and at least one line.
+
+    Page breaks can be moved up to keep a minimum number of lines of a
+    paragraph together at the bottom of a page (``orphans``) and at the top
+    of the next page (``widows``). When a paragraph is too short to satisfy
+    both, it is moved to the next page as a whole, unless it already starts
+    at the top of the page.
+
+    Lines are read from the layout as they are needed, so pages can be
+    computed a few at a time with :meth:`paginate()`, which resumes from the
+    last page computed, without reading the lines of earlier pages again.
+    When the layout changes, the pages computed so far are discarded.
+    """
+
+    def __init__(
+            self,
+            layout: Layout,
+            page_height: int,
+            widows: int = 1,
+            orphans: int = 1
+    ):
+        """
+        :param layout:
+            the :class:`Layout` to paginate.
+        :param page_height:
+            the height of a page in Pango units.
+        :param widows:
+            the minimum number of lines of a paragraph at the top of a page.
+        :param orphans:
+            the minimum number of lines of a paragraph at the bottom of a
+            page.
+        :raises: AssertionError
+            When ``page_height``, ``widows`` or ``orphans`` isn't positive.
+        """
+        assert page_height > 0, "page_height isn't positive"
+        assert widows > 0, "widows isn't positive"
+        assert orphans > 0, "orphans isn't positive"
+        self._layout = layout
+        self._page_height = page_height
+        self._widows = widows
+        self._orphans = orphans
+        self._tracker = ChangeTracker(layout)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._tracker.update()
+        self._iter = None
+        self._exhausted = False
+        # Per line: the byte index at which it starts, the y range it
+        # occupies, and the index of the first line of its paragraph.
+        self._line_starts = array("i")
+        self._line_tops = array("i")
+        self._line_bottoms = array("i")
+        self._paragraph_starts = array("i")
+        self._pages = PageBreaks(array("i"), array("i"), array("i"))
+        self._complete = False
+
+    def _check_layout(self) -> None:
+        if self._tracker.changed:
+            self._reset()
+
+    def _read_lines(self, y: int, count: int) -> None:
+        # Reads lines from the layout until a line ends below y and at least
+        # count lines have been read, or the layout has no more lines.
+        if self._exhausted:
+            return
+        if self._iter is None:
+            self._iter = ffi.gc(
+                pango.pango_layout_get_iter(self._layout.pointer),
+                pango.pango_layout_iter_free
+            )
+            moved = True
+        else:
+            moved = pango.pango_layout_iter_next_line(self._iter)
+        iter_pointer = self._iter
+        get_line = pango.pango_layout_iter_get_line_readonly
+        get_line_yrange = pango.pango_layout_iter_get_line_yrange
+        next_line = pango.pango_layout_iter_next_line
+        line_starts = self._line_starts
+        line_tops = self._line_tops
+        line_bottoms = self._line_bottoms
+        paragraph_starts = self._paragraph_starts
+        yrange = ffi.new("int[2]")
+        while moved:
+            line = get_line(iter_pointer)
+            get_line_yrange(iter_pointer, yrange, yrange + 1)
+            line_starts.append(line.start_index)
+            line_tops.append(yrange[0])
+            line_bottoms.append(yrange[1])
+            if line.is_paragraph_start or not paragraph_starts:
+                paragraph_starts.append(len(line_tops) - 1)
+            else:
+                paragraph_starts.append(paragraph_starts[-1])
+            if yrange[1] > y and len(line_tops) >= count:
+                return
+            moved = next_line(iter_pointer)
+        self._exhausted = True
+        self._iter = None
+
+    def _paragraph_end(self, index: int) -> int:
+        # Returns the index of the first line after the paragraph of a line,
+        # or index + self._widows if the paragraph continues beyond that.
+        paragraph_starts = self._paragraph_starts
+        paragraph_start = paragraph_starts[index]
+        self._read_lines(0, index + self._widows + 1)
+        end = index + 1
+        while (
+            end < len(paragraph_starts)
+            and paragraph_starts[end] == paragraph_start
+            and end < index + self._widows
+        ):
+            end += 1
+        return end
+
+    def _next_break(self, first: int) -> int:
+        # Returns the index of the first line of the page after the page
+        # starting at the given line.
+        limit = self._line_tops[first] + self._page_height
+        self._read_lines(limit, first + 2)
+        line_bottoms = self._line_bottoms
+        end = max(bisect.bisect_right(line_bottoms, limit, first), first + 1)
+        if end >= len(line_bottoms):
+            return end
+        paragraph_start = self._paragraph_starts[end]
+        if paragraph_start == end:
+            return end
+        if end - paragraph_start < self._orphans:
+            moved = paragraph_start
+        else:
+            paragraph_end = self._paragraph_end(end)
+            if paragraph_end - end >= self._widows:
+                return end
+            moved = paragraph_end - self._widows
+            if moved - paragraph_start < self._orphans:
+                moved = paragraph_start
+        return moved if moved > first else end
+
+    @property
+    def layout(self) -> Layout:
+        """The layout being paginated."""
+        return self._layout
+
+    @property
+    def page_height(self) -> int:
+        """The height of a page in Pango units."""
+        return self._page_height
+
+    @property
+    def pages(self) -> PageBreaks:
+        """
+        The pages computed so far. The arrays must not be modified.
+        """
+        self._check_layout()
+        return self._pages
+
+    @property
+    def complete(self) -> bool:
+        """Whether every page of the layout has been computed."""
+        self._check_layout()
+        return self._complete
+
+    def paginate(self, count: Optional[int] = None) -> PageBreaks:
+        """
+        Computes the next pages of the layout, starting after the last page
+        computed so far.
+
+        :param count:
+            the maximum number of pages to compute, or ``None`` to compute
+            every remaining page.
+        :return:
+            the pages that were computed. The same pages are appended to
+            :attr:`pages`.
+        :raises: AssertionError
+            When ``count`` is negative.
+        """
+        assert count is None or count >= 0, "count is negative"
+        self._check_layout()
+        line_indices = array("i")
+        start_indices = array("i")
+        y_offsets = array("i")
+        pages = self._pages
+        if pages.line_indices:
+            first = self._next_break(pages.line_indices[-1])
+        else:
+            first = 0
+        while not self._complete:
+            if count is not None and len(line_indices) == count:
+                break
+            self._read_lines(0, first + 1)
+            if first >= len(self._line_tops):
+                self._complete = True
+                break
+            line_indices.append(first)
+            start_indices.append(self._line_starts[first])
+            y_offsets.append(self._line_tops[first])
+            first = self._next_break(first)
+        pages.line_indices.extend(line_indices)
+        pages.start_indices.extend(start_indices)
+        pages.y_offsets.extend(y_offsets)
+        return PageBreaks(line_indices, start_indices, y_offsets)
@@ -1,5 +1,25 @@
 from abc import ABC
-from . import ffi
+from . import cffi_mode, ffi
+
+# Maps the pointer types of other FFIs to the same types of pangocffi's FFI.
+_own_ctypes = {}
+
+
+def _to_own_pointer(pointer: ffi.CData) -> ffi.CData:
+    """
+    In API mode, :data:`ffi` is the compiled FFI, whose types differ from
+    those of FFIs that include ``pangocffi.ffi_build.ffi``, such as the FFI of
+    pangocairocffi. Pointers from such FFIs are cast to pangocffi's types, so
+    that they can be passed to the compiled library.
+    """
+    ctype = ffi.typeof(pointer)
+    own_ctype = _own_ctypes.get(ctype)
+    if own_ctype is None:
+        own_ctype = ffi.typeof(ctype.cname)
+        _own_ctypes[ctype] = own_ctype
+    if own_ctype is ctype:
+        return pointer
+    return ffi.cast(own_ctype, pointer)
 
 
 class PangoObject(ABC):
@@ -75,7 +95,8 @@ class PangoObject(ABC):
         Instantiates an object from a C pointer.
 
         :param pointer:
-            a C pointer to the object.
+            a C pointer to the object. In API mode, a pointer from an FFI that
+            includes ``pangocffi.ffi_build.ffi`` is cast to pangocffi's types.
         :param gc:
             whether to garbage collect the pointer. Defaults to ``False``.
         :return:
@@ -84,6 +105,8 @@ class PangoObject(ABC):
 
         if pointer == ffi.NULL:
             raise ValueError("Null pointer")
+        if cffi_mode == 'api':
+            pointer = _to_own_pointer(pointer)
         self = object.__new__(cls)
         cls._init_pointer(self, pointer, gc)
 
@@ -114,7 +137,7 @@ class PangoObject(ABC):
 
         formatted = []
         for k, v in properties:
-            if k != "_pointer":
+            if k != "_pointer" and not k.startswith("_cached_"):
                 f = k.lstrip("_") + "=" + str(v)
                 formatted.append(f)
 
@@ -0,0 +1,455 @@
+import itertools
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+from typing import Sequence, Tuple
+
+from .attr_list import AttrList
+from .context import Context
+from .enums import WrapMode
+from .font_description import FontDescription
+from .layout import Layout
+
+_WARM_UP_TEXT = 'Hi from Pango! 0123456789'
+
+
+class ParagraphSpec(NamedTuple):
+    """
+    A picklable description of a paragraph to lay out with
+    :func:`layout_paragraph()` or a :class:`LayoutProcessPool`.
+    """
+
+    text: str
+    """The text of the paragraph."""
+
+    font_description: Optional[str] = None
+    """
+    The font description in the format accepted by
+    :meth:`FontDescription.from_string()`, or ``None`` to use the font
+    description of the context.
+    """
+
+    attributes: Optional[str] = None
+    """
+    The attributes in the format returned by :meth:`AttrList.to_string()`,
+    or ``None`` for no attributes.
+    """
+
+    width: int = -1
+    """
+    The width to wrap the paragraph at, in Pango units, or ``-1`` to not wrap
+    the paragraph.
+    """
+
+    wrap: WrapMode = WrapMode.WORD
+    """The wrap mode."""
+
+
+class ParagraphResult(NamedTuple):
+    """
+    The result of laying out a :class:`ParagraphSpec`. Extents are tuples of
+    ``(x, y, width, height)`` in Pango units.
+    """
+
+    ink_extents: Tuple[int, int, int, int]
+    """The extents of the paragraph as drawn."""
+
+    logical_extents: Tuple[int, int, int, int]
+    """The logical extents of the paragraph."""
+
+    baseline: int
+    """The baseline of the first line, from the top of the paragraph."""
+
+    line_starts: Tuple[int, ...]
+    """The character offset into the text at which each line starts."""
+
+
+def _apply_spec(layout: Layout, spec: ParagraphSpec) -> None:
+    if spec.font_description is None:
+        layout.font_description = None
+    else:
+        layout.font_description = FontDescription.from_string(
+            spec.font_description
+        )
+    if spec.attributes is None:
+        layout.attributes = None
+    else:
+        layout.attributes = AttrList.from_string(spec.attributes)
+    layout.width = spec.width
+    layout.wrap = spec.wrap
+    layout.text = spec.text
+
+
+def layout_paragraph(
+        context: Context,
+        spec: ParagraphSpec,
+        layout: Optional[Layout] = None
+) -> ParagraphResult:
+    """
+    Lays out a paragraph and returns its extents and line breaks.
+
+    :param context:
+        the :class:`Context` to lay out the paragraph with.
+    :param spec:
+        the paragraph to lay out.
+    :param layout:
+        a :class:`Layout` created from ``context`` to reuse, or ``None`` to
+        create a new layout.
+    :return:
+        the extents and line breaks of the paragraph.
+    """
+    if layout is None:
+        layout = Layout(context)
+    _apply_spec(layout, spec)
+    return _paragraph_result(layout)
+
+
+def _paragraph_result(layout: Layout) -> ParagraphResult:
+    ink, logical = layout.get_extents()
+    text_index = layout.text_index
+    line_starts = []
+    layout_iter = layout.get_iter()
+    while True:
+        line_starts.append(text_index.byte_to_char(layout_iter.get_index()))
+        if not layout_iter.next_line():
+            break
+    return ParagraphResult(
+        (ink.x, ink.y, ink.width, ink.height),
+        (logical.x, logical.y, logical.width, logical.height),
+        layout.get_baseline(),
+        tuple(line_starts)
+    )
+
+
+def warm_fonts(context: Context, font_descriptions: Iterable[str]) -> None:
+    """
+    Loads fonts and lays out a short text with each of them, so that the
+    first paragraphs laid out with them are not slowed down by loading and
+    caching the fonts.
+
+    :param context:
+        the :class:`Context` to load the fonts with.
+    :param font_descriptions:
+        font descriptions in the format accepted by
+        :meth:`FontDescription.from_string()`.
+    """
+    layout = Layout(context)
+    layout.text = _WARM_UP_TEXT
+    for font_description in font_descriptions:
+        desc = FontDescription.from_string(font_description)
+        context.load_font(desc)
+        layout.font_description = desc
+        layout.get_extents()
+
+
+# The context and layout of a worker process of a LayoutProcessPool.
+_worker_context: Optional[Context] = None
+_worker_layout: Optional[Layout] = None
+
+
+def _initialize_worker(
+        context_factory: Callable[[], Context],
+        font_descriptions: Tuple[str, ...]
+) -> None:
+    global _worker_context, _worker_layout
+    _worker_context = context_factory()
+    _worker_layout = Layout(_worker_context)
+    warm_fonts(_worker_context, font_descriptions)
+
+
+def _layout_one(spec: ParagraphSpec) -> ParagraphResult:
+    return layout_paragraph(_worker_context, spec, _worker_layout)
+
+
+def _layout_chunk(specs: List[ParagraphSpec]) -> List[ParagraphResult]:
+    return [
+        layout_paragraph(_worker_context, spec, _worker_layout)
+        for spec in specs
+    ]
+
+
+class _LayoutPool:
+    """
+    The scheduling shared by :class:`LayoutProcessPool` and
+    :class:`LayoutThreadPool`. Subclasses set :attr:`_executor` and the
+    functions that lay out one paragraph and a chunk of paragraphs in a
+    worker.
+    """
+
+    _executor: Executor = None
+    _max_workers: int = 1
+    _layout_one: Callable[[ParagraphSpec], ParagraphResult] = None
+    _layout_chunk: Callable[
+        [List[ParagraphSpec]], List[ParagraphResult]
+    ] = None
+
+    @property
+    def max_workers(self) -> int:
+        """The number of workers."""
+        return self._max_workers
+
+    def submit(self, spec: ParagraphSpec) -> Future:
+        """
+        Schedules a single paragraph to be laid out.
+
+        :param spec:
+            the paragraph to lay out.
+        :return:
+            a :class:`concurrent.futures.Future` of the
+            :class:`ParagraphResult`.
+        """
+        return self._executor.submit(self._layout_one, spec)
+
+    def map(
+            self,
+            specs: Iterable[ParagraphSpec],
+            chunksize: int = 16
+    ) -> Iterator[ParagraphResult]:
+        """
+        Lays out paragraphs in parallel, and yields the results in the order
+        of ``specs`` as soon as they are available.
+
+        Paragraphs are sent to the workers in chunks of ``chunksize``, and
+        only a few chunks per worker are scheduled at a time, so ``specs``
+        can be a lazy iterable of any length.
+
+        :param specs:
+            the paragraphs to lay out.
+        :param chunksize:
+            the number of paragraphs sent to a worker at once.
+        :return:
+            an iterator of :class:`ParagraphResult` objects.
+        """
+        assert chunksize > 0, "chunksize isn't positive"
+        specs = iter(specs)
+        pending = deque()
+        max_pending = 2 * self._max_workers
+        try:
+            while True:
+                while len(pending) < max_pending:
+                    chunk = list(itertools.islice(specs, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(
+                        self._executor.submit(self._layout_chunk, chunk)
+                    )
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shuts down the workers.
+
+        :param wait:
+            whether to wait until the scheduled paragraphs have been laid out.
+        """
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+class LayoutProcessPool(_LayoutPool):
+    """
+    A :class:`LayoutProcessPool` lays out paragraphs in parallel in a pool of
+    worker processes. Laying out text is CPU-bound and Pango objects can't be
+    shared between processes, so every worker creates its own font map and
+    :class:`Context` by calling ``context_factory``, and paragraphs are sent
+    to the workers as picklable :class:`ParagraphSpec` objects.
+
+    ``context_factory`` must be picklable, so it has to be a function defined
+    at the top level of a module. Since pangocffi doesn't create font maps
+    itself, the function would usually use a rendering backend such as
+    PangoCairo. For example, using pangocairocffi and cairocffi::
+
+        def create_context():
+            surface = cairocffi.RecordingSurface(
+                cairocffi.CONTENT_COLOR_ALPHA, None
+            )
+            return pangocairocffi.create_context(cairocffi.Context(surface))
+
+    Since Pango and its dependencies may start threads, it is safer to use
+    the ``'spawn'`` or ``'forkserver'`` start methods than ``'fork'``, which
+    can be selected with ``mp_context``.
+
+    The pool can be used as a context manager, which shuts it down on exit.
+    """
+
+    _layout_one = staticmethod(_layout_one)
+    _layout_chunk = staticmethod(_layout_chunk)
+
+    def __init__(
+            self,
+            context_factory: Callable[[], Context],
+            max_workers: Optional[int] = None,
+            warm_font_descriptions: Sequence[str] = (),
+            mp_context=None
+    ):
+        """
+        :param context_factory:
+            a picklable function that returns a new :class:`Context`, which
+            is called once in every worker process.
+        :param max_workers:
+            the number of worker processes, which defaults to the number of
+            CPUs.
+        :param warm_font_descriptions:
+            font descriptions to load once in every worker, see
+            :func:`warm_fonts()`.
+        :param mp_context:
+            the :mod:`multiprocessing` context used to start the workers.
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=mp_context,
+            initializer=_initialize_worker,
+            initargs=(context_factory, tuple(warm_font_descriptions))
+        )
+
+
+class ContextRegistry:
+    """
+    A :class:`ContextRegistry` gives every thread its own :class:`Context`
+    and :class:`Layout`, which are created by the thread that first uses
+    them and are never handed to other threads.
+
+    Pango objects are not thread-safe, so a :class:`Context`, a
+    :class:`Layout`, or any other object created from them must only be used
+    by one thread at a time. Calls into Pango release the GIL, so threads
+    that each use their own objects lay out text in parallel.
+
+    ``context_factory`` is called once in every thread, and must create a
+    new :class:`Context` with a font map that is not shared with other
+    threads. For example, ``pango_cairo_font_map_get_default()`` already
+    returns a different font map in every thread, so contexts created from
+    it in the calling thread are safe to use.
+    """
+
+    def __init__(
+            self,
+            context_factory: Callable[[], Context],
+            warm_font_descriptions: Sequence[str] = ()
+    ):
+        """
+        :param context_factory:
+            a function that returns a new :class:`Context`.
+        :param warm_font_descriptions:
+            font descriptions to load once in every thread, see
+            :func:`warm_fonts()`.
+        """
+        self._context_factory = context_factory
+        self._warm_font_descriptions = tuple(warm_font_descriptions)
+        self._local = threading.local()
+
+    def get_context(self) -> Context:
+        """
+        :return:
+            the :class:`Context` of the current thread.
+        """
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            context = self._context_factory()
+            warm_fonts(context, self._warm_font_descriptions)
+            self._local.context = context
+        return context
+
+    def get_layout(self) -> Layout:
+        """
+        :return:
+            a :class:`Layout` for the :class:`Context` of the current thread,
+            which is reused for every call from the thread.
+        """
+        layout = getattr(self._local, 'layout', None)
+        if layout is None:
+            layout = Layout(self.get_context())
+            self._local.layout = layout
+        return layout
+
+    def get_layout_for(self, spec: ParagraphSpec) -> Layout:
+        """
+        Returns the :class:`Layout` of the current thread, with the text and
+        settings of ``spec``. If the layout already contains ``spec`` and has
+        not been modified since, it is returned as it is, so that it doesn't
+        have to be laid out again.
+
+        :param spec:
+            the paragraph to lay out.
+        :return:
+            the :class:`Layout` of the current thread.
+        """
+        layout = self.get_layout()
+        serial = layout.serial
+        if getattr(self._local, 'spec', None) != (spec, serial):
+            _apply_spec(layout, spec)
+            self._local.spec = (spec, layout.serial)
+        return layout
+
+    def layout_paragraph(self, spec: ParagraphSpec) -> ParagraphResult:
+        """
+        Lays out a paragraph with the :class:`Context` of the current thread.
+        See :func:`layout_paragraph()`.
+        """
+        return _paragraph_result(self.get_layout_for(spec))
+
+
+class LayoutThreadPool(_LayoutPool):
+    """
+    A :class:`LayoutThreadPool` lays out paragraphs in parallel in a pool of
+    threads. Every thread creates its own :class:`Context` and
+    :class:`Layout` through a :class:`ContextRegistry`, and only plain
+    :class:`ParagraphResult` tuples are returned, so no Pango object is ever
+    shared between threads.
+
+    Calls into Pango release the GIL, so laying out paragraphs overlaps on
+    multiple cores, while the Python code around the calls does not. A
+    :class:`LayoutProcessPool` avoids that limit at the cost of pickling the
+    paragraphs and the results.
+
+    The pool can be used as a context manager, which shuts it down on exit.
+    """
+
+    def __init__(
+            self,
+            context_factory: Callable[[], Context],
+            max_workers: Optional[int] = None,
+            warm_font_descriptions: Sequence[str] = ()
+    ):
+        """
+        :param context_factory:
+            a function that returns a new :class:`Context`, which is called
+            once in every thread. See :class:`ContextRegistry`.
+        :param max_workers:
+            the number of threads, which defaults to the number of CPUs.
+        :param warm_font_descriptions:
+            font descriptions to load once in every thread, see
+            :func:`warm_fonts()`.
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._registry = ContextRegistry(
+            context_factory,
+            warm_font_descriptions
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix='pangocffi-layout',
+            initializer=self._registry.get_context
+        )
+
+    def _layout_one(self, spec: ParagraphSpec) -> ParagraphResult:
+        return self._registry.layout_paragraph(spec)
+
+    def _layout_chunk(
+            self,
+            specs: List[ParagraphSpec]
+    ) -> List[ParagraphResult]:
+        return [self._registry.layout_paragraph(spec) for spec in specs]
@@ -1,5 +1,6 @@
 from typing import Optional
-from . import ffi, PangoObject
+from . import ffi
+from .pango_object import PangoObject
 
 
 class Rectangle(PangoObject):
@@ -0,0 +1,139 @@
+from typing import (
+    Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+)
+
+from . import ffi, pango
+from .context import Context
+from .enums import WrapMode
+from .font_description import FontDescription
+from .layout import Layout
+
+
+class StreamedLine(NamedTuple):
+    """
+    A line produced by :func:`stream_lines()`. Indices are byte offsets into
+    the UTF-8 encoding of the whole stream, and positions are in Pango units
+    relative to the top of the first paragraph.
+    """
+    paragraph: int
+    start_index: int
+    length: int
+    baseline: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+def _paragraphs(chunks: Iterable[str]) -> Iterator[Tuple[int, bytes]]:
+    # Yields the byte offset and the UTF-8 encoded text of every paragraph,
+    # without its delimiter, as soon as the delimiter is seen. Only the
+    # incomplete paragraph at the end of the text read so far is buffered.
+    boundary = ffi.new("int[2]")
+    next_start_pointer = boundary + 1
+    find_paragraph_boundary = pango.pango_find_paragraph_boundary
+    pending: List[bytes] = []
+    paragraph_start = 0
+    offset = 0
+    skip_newline = False
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        if skip_newline and data:
+            # "\r\n" split between two chunks is a single delimiter.
+            if data[:1] == b"\n":
+                data = data[1:]
+                offset += 1
+                paragraph_start += 1
+            skip_newline = False
+        data_buffer = ffi.from_buffer(data)
+        length = len(data)
+        start = 0
+        while start < length:
+            find_paragraph_boundary(
+                data_buffer + start,
+                length - start,
+                boundary,
+                next_start_pointer
+            )
+            delimiter_index = start + boundary[0]
+            next_start = start + boundary[1]
+            if next_start == delimiter_index:
+                pending.append(data[start:])
+                break
+            pending.append(data[start:delimiter_index])
+            yield paragraph_start, b"".join(pending)
+            pending = []
+            paragraph_start = offset + next_start
+            skip_newline = next_start == length and data[-1:] == b"\r"
+            start = next_start
+        offset += length
+    # Text ending with a delimiter ends with an empty paragraph, as it does
+    # in a Layout.
+    yield paragraph_start, b"".join(pending)
+
+
+def stream_lines(
+        context: Context,
+        chunks: Union[str, Iterable[str]],
+        font_description: Optional[FontDescription] = None,
+        width: int = -1,
+        wrap: WrapMode = WrapMode.WORD
+) -> Iterator[StreamedLine]:
+    """
+    Lays out a text one paragraph at a time, and yields its lines as soon as
+    the paragraph they belong to is laid out. Unlike setting
+    :attr:`Layout.text` to the whole text, the first lines are available
+    before the rest of the text has been read or shaped, and only a single
+    paragraph is kept in memory at a time. This makes it suitable for very
+    large texts, such as log files::
+
+        with open("server.log", encoding="utf-8") as file:
+            for line in stream_lines(context, file, width=width):
+                ...
+
+    The text is split into paragraphs with :func:`find_paragraph_boundary()`
+    as it is read, and every paragraph is laid out with the same
+    :class:`Layout`. Paragraphs are stacked without any spacing between
+    them, as in a :class:`Document`. A paragraph is only laid out once its
+    delimiter has been read, so a text without any delimiters is held in
+    memory as a whole.
+
+    :param context:
+        the :class:`Context` to lay out the text with.
+    :param chunks:
+        the text, or an iterable of pieces of text, such as a file opened in
+        text mode. Paragraphs may span several pieces.
+    :param font_description:
+        the font description of the text, or ``None`` to use the font
+        description of the context.
+    :param width:
+        the width to wrap paragraphs to in Pango units, or ``-1`` to not
+        wrap them.
+    :param wrap:
+        how to wrap paragraphs that are wider than ``width``.
+    :return:
+        an iterator over the lines of the text, in order.
+    """
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    layout = Layout(context)
+    layout.font_description = font_description
+    layout.width = width
+    layout.wrap = wrap
+    set_text = pango.pango_layout_set_text
+    paragraph_y = 0
+    for paragraph, (paragraph_start, text) in enumerate(_paragraphs(chunks)):
+        set_text(layout.pointer, text, len(text))
+        metrics = layout.line_metrics()
+        for i in range(len(metrics.start_indices)):
+            yield StreamedLine(
+                paragraph,
+                paragraph_start + metrics.start_indices[i],
+                metrics.lengths[i],
+                paragraph_y + metrics.baselines[i],
+                metrics.xs[i],
+                paragraph_y + metrics.ys[i],
+                metrics.widths[i],
+                metrics.heights[i]
+            )
+        paragraph_y += layout.get_size()[1]
@@ -1,4 +1,6 @@
-from . import pango, ffi, PangoObject, TabAlign
+from . import pango, ffi
+from .enums import TabAlign
+from .pango_object import PangoObject
 from typing import List, Tuple, Optional
 
 
@@ -0,0 +1,105 @@
+import bisect
+import itertools
+from array import array
+from typing import Optional
+
+# Maps every byte of UTF-8 encoded text to 1 if it starts a character, or 0
+# if it is a continuation byte (0b10xxxxxx).
+_LEAD_BYTES = bytes(0 if 0x80 <= i <= 0xBF else 1 for i in range(256))
+
+_NOT_INDEXED = object()
+
+
+class TextIndex:
+    """
+    A :class:`TextIndex` translates between character offsets into a Python
+    string and byte offsets into its UTF-8 encoding, which is how Pango
+    indexes text (for instance in :class:`Attribute`,
+    :meth:`LayoutIter.get_index()` and :attr:`GlyphItemIter.start_index`).
+
+    The index is built the first time an offset is translated, and
+    translating an offset afterwards does not depend on the length of the
+    text (or, for byte offsets, only logarithmically). For ASCII text no
+    index needs to be built at all.
+
+    To obtain the index for the text of a :class:`Layout`, use
+    :attr:`Layout.text_index`.
+    """
+
+    def __init__(self, text: str):
+        """
+        :param text:
+            the text to index.
+        """
+        self._text = text
+        self._byte_offsets = _NOT_INDEXED
+
+    def _get_byte_offsets(self) -> Optional[array]:
+        # The index is built when it is first needed, so that creating a
+        # TextIndex for text that is never indexed is cheap. It is assigned
+        # once it is complete, so other threads never see a partial index.
+        byte_offsets = self._byte_offsets
+        if byte_offsets is _NOT_INDEXED:
+            byte_offsets = None
+            if not self._text.isascii():
+                text_bytes = self._text.encode('utf-8')
+                # The byte offset of every character, followed by the length
+                # of the text in bytes.
+                byte_offsets = array('i', itertools.compress(
+                    range(len(text_bytes)),
+                    text_bytes.translate(_LEAD_BYTES)
+                ))
+                byte_offsets.append(len(text_bytes))
+            self._byte_offsets = byte_offsets
+        return byte_offsets
+
+    @property
+    def text(self) -> str:
+        """The text that is indexed."""
+        return self._text
+
+    @property
+    def byte_length(self) -> int:
+        """The length of the text in bytes, when encoded as UTF-8."""
+        byte_offsets = self._get_byte_offsets()
+        if byte_offsets is None:
+            return len(self._text)
+        return byte_offsets[-1]
+
+    def char_to_byte(self, char_offset: int) -> int:
+        """
+        Converts a character offset into a byte offset.
+
+        :param char_offset:
+            an offset between ``0`` and the length of the text in characters,
+            inclusive.
+        :return:
+            the byte offset of the character.
+        :raises: IndexError
+            When ``char_offset`` is out of range.
+        """
+        if not 0 <= char_offset <= len(self._text):
+            raise IndexError('character offset out of range')
+        byte_offsets = self._get_byte_offsets()
+        if byte_offsets is None:
+            return char_offset
+        return byte_offsets[char_offset]
+
+    def byte_to_char(self, byte_offset: int) -> int:
+        """
+        Converts a byte offset into a character offset. A byte offset in the
+        middle of a character is converted to the offset of that character.
+
+        :param byte_offset:
+            an offset between ``0`` and :attr:`byte_length`, inclusive.
+        :return:
+            the offset of the character containing the byte.
+        :raises: IndexError
+            When ``byte_offset`` is out of range.
+        """
+        if not 0 <= byte_offset <= self.byte_length:
+            raise IndexError('byte offset out of range')
+        byte_offsets = self._get_byte_offsets()
+        if byte_offsets is None:
+            return byte_offset
+        return bisect.bisect_right(byte_offsets, byte_offset) - 1
@@ -1,3 +1,4 @@
+import os
 import sys
 import setuptools
 
@@ -6,4 +7,12 @@ if sys.version_info.major < 3:
         'pangocffi does not support Python 2.x. Please use Python 3.'
     )
 
-setuptools.setup()
+if os.getenv('PANGOCFFI_API_MODE'):
+    # Opt-in: compile the bindings against Pango's headers. This requires a
+    # C compiler, pkg-config and the Pango development headers.
+    setuptools.setup(
+        setup_requires=['cffi >= 1.12.0'],
+        cffi_modules=['pangocffi/ffi_build.py:build_api_ffi'],
+    )
+else:
+    setuptools.setup()
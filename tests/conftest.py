@@ -0,0 +1,10 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Keep the tests from reading or writing the user's pangocffi cache. This has
+# to happen before pangocffi is first imported.
+_cache_dir = tempfile.mkdtemp(prefix='pangocffi-tests-')
+os.environ['PANGOCFFI_CACHE_DIR'] = _cache_dir
+atexit.register(shutil.rmtree, _cache_dir, ignore_errors=True)
@@ -21,6 +21,36 @@ def _dlopen(ffi, *names):
     raise OSError("dlopen() failed to load a library: %s" % ' / '.join(names))
 
 
+class _CastingLibrary(object):
+    """
+    Wraps a library loaded with the tests' FFI, casting pointers at the
+    boundary with pangocffi. In API mode, pangocffi's compiled FFI has types
+    of its own, which the tests' FFI rejects and the other way around. In ABI
+    mode, the types are shared and the casts do nothing.
+    """
+
+    def __init__(self, ffi, lib):
+        self._ffi = ffi
+        self._lib = lib
+
+    def _to_own_pointer(self, ffi, value):
+        if not isinstance(value, ffi.CData):
+            return value
+        ctype = ffi.typeof(value)
+        if ctype.kind != 'pointer':
+            return value
+        return ffi.cast(ctype.cname, value)
+
+    def __getattr__(self, name):
+        function = getattr(self._lib, name)
+
+        def call(*args):
+            args = [self._to_own_pointer(self._ffi, arg) for arg in args]
+            return self._to_own_pointer(pangocffi.ffi, function(*args))
+
+        return call
+
+
 class ContextCreator(object):
 
     # CFFIs
@@ -192,11 +222,11 @@ class ContextCreator(object):
             'cairo-2',
             'cairo-gobject-2',
             'cairo.so.2')
-        cls.pangocairo = _dlopen(
+        cls.pangocairo = _CastingLibrary(cls.ffi, _dlopen(
             cls.ffi,
             'pangocairo-1.0',
             'pangocairo-1.0-0'
-        )
+        ))
 
     def _create_pango_context(self):
         pango_context = self.pangocairo.pango_cairo_create_context(
@@ -216,3 +246,18 @@ class ContextCreator(object):
         self.cairo.cairo_surface_destroy(
             self.cairo_surface
         )
+
+
+# Keeps the surfaces of the contexts created by create_pango_context() alive.
+_context_creators = []
+
+
+def create_pango_context() -> Context:
+    """
+    Creates a Pango context for a surface without output. This is a function
+    at the top level of the module, so that it can be passed to worker
+    processes.
+    """
+    context_creator = ContextCreator.create_surface_without_output()
+    _context_creators.append(context_creator)
+    return context_creator.get_pango_context_as_class()
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from pangocffi import ParagraphSpec, layout_paragraph
+from pangocffi.aio import AsyncLayoutPool
+from ..context_creator import ContextCreator, create_pango_context
+
+TEXT = 'Hi from Παν語! Pango is a library for laying out and rendering text.'
+
+
+async def _wait_until(condition, timeout: float = 5) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, 'timed out'
+        await asyncio.sleep(0.01)
+
+
+class _BlockingWork:
+    # Stands in for the work of the workers. Every call records that it has
+    # started, and then waits until it is allowed to finish.
+
+    def __init__(self):
+        self.started = []
+        self._finish = threading.Semaphore(0)
+
+    def __call__(self, spec):
+        self.started.append(spec)
+        self._finish.acquire()
+        return spec
+
+    def finish(self, count: int = 1) -> None:
+        for _ in range(count):
+            self._finish.release()
+
+    def finish_all(self) -> None:
+        # Lets every call finish, so that a failing test doesn't leave the
+        # workers blocked.
+        self.finish(len(self.started) + 100)
+
+
+class TestAsyncLayoutPoolWithContext(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        ContextCreator.initialise_ffi()
+        self.spec = ParagraphSpec(TEXT, 'sans-serif 12', width=100 * 1024)
+
+    async def test_layout_lines_and_measure(self):
+        expected = layout_paragraph(create_pango_context(), self.spec)
+        async with AsyncLayoutPool(create_pango_context, 2) as pool:
+            assert await pool.layout_lines(self.spec) == expected
+            ink, logical = await pool.measure(self.spec)
+            assert ink == expected.ink_extents
+            assert logical == expected.logical_extents
+
+    async def test_hit_test(self):
+        async with AsyncLayoutPool(create_pango_context, 1) as pool:
+            index, trailing, inside = await pool.hit_test(self.spec, 0, 0)
+            assert (index, trailing, inside) == (0, 0, True)
+
+            result = await pool.layout_lines(self.spec)
+            second_line_y = result.logical_extents[3] // \
+                len(result.line_starts) * 3 // 2
+            index, _, inside = await pool.hit_test(self.spec, 0, second_line_y)
+            assert inside
+            assert index == result.line_starts[1]
+
+            _, _, inside = await pool.hit_test(self.spec, -1024, -1024)
+            assert not inside
+
+    async def test_backpressure(self):
+        specs = [
+            ParagraphSpec(TEXT, 'sans-serif 12', width=(i + 1) * 1024)
+            for i in range(4)
+        ]
+        work = _BlockingWork()
+        async with AsyncLayoutPool(
+            create_pango_context,
+            max_workers=4,
+            max_pending=3
+        ) as pool:
+            with patch.object(pool._registry, 'layout_paragraph', work):
+                tasks = [
+                    asyncio.ensure_future(pool.layout_lines(spec))
+                    for spec in specs
+                ]
+                try:
+                    await _wait_until(lambda: len(work.started) == 3)
+                    # The fourth call waits for a slot, although a worker is
+                    # free.
+                    await asyncio.sleep(0.1)
+                    assert work.started == specs[:3]
+
+                    work.finish()
+                    done, _ = await asyncio.wait(
+                        tasks, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    assert len(done) == 1
+                    await _wait_until(lambda: len(work.started) == 4)
+                finally:
+                    work.finish_all()
+                assert await asyncio.gather(*tasks) == specs
+
+    async def test_cancellation(self):
+        specs = [
+            ParagraphSpec(TEXT * (i + 1), 'sans-serif 12', width=100 * 1024)
+            for i in range(20)
+        ]
+        async with AsyncLayoutPool(
+            create_pango_context,
+            max_workers=3,
+            max_pending=3
+        ) as pool:
+            tasks = [
+                asyncio.ensure_future(pool.layout_lines(spec))
+                for spec in specs
+            ]
+            tasks[-1].cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            assert isinstance(results[-1], asyncio.CancelledError)
+            assert all(
+                len(result.line_starts) > 1 for result in results[:-1]
+            )
+
+            # Every slot is released, even for the cancelled call, so
+            # max_pending calls can run at once again.
+            work = _BlockingWork()
+            with patch.object(pool._registry, 'layout_paragraph', work):
+                tasks = [
+                    asyncio.ensure_future(pool.layout_lines(spec))
+                    for spec in specs[:3]
+                ]
+                try:
+                    await _wait_until(lambda: len(work.started) == 3)
+                finally:
+                    work.finish_all()
+                assert await asyncio.gather(*tasks) == specs[:3]
@@ -2,7 +2,7 @@ import copy
 import warnings
 import unittest
 
-from pangocffi import Attribute, AttrList, ffi
+from pangocffi import Attribute, AttrList, ffi, pango_version
 from pangocffi.enums import Stretch
 
 
@@ -71,6 +71,22 @@ class TestLayout(unittest.TestCase):
             )
         assert a != 2
 
+    def test_to_string_and_from_string(self):
+        a = AttrList()
+        a.insert(Attribute.from_size(10 * 1024, 0, 5))
+        if pango_version() < 15000:
+            with self.assertRaises(NotImplementedError):
+                a.to_string()
+            with self.assertRaises(NotImplementedError):
+                AttrList.from_string("0 5 size 10240")
+            return
+        string = a.to_string()
+        b = AttrList.from_string(string)
+        assert b.to_string() == string
+        assert a == b
+        with self.assertRaises(ValueError):
+            AttrList.from_string("not an attribute list")
+
     def test_insert(self):
         a = AttrList()
         b = Attribute.from_size(5, 1, 4)
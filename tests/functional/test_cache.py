@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cffi import FFI
+
+from pangocffi import cache
+from pangocffi.ffi_instance_builder import FFIInstanceBuilder
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.env = patch.dict(
+            os.environ, {'PANGOCFFI_CACHE_DIR': self.temp_dir.name}
+        )
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.temp_dir.cleanup()
+
+    def test_cache_dir_from_environment(self):
+        assert cache.cache_dir() == Path(self.temp_dir.name)
+
+    def test_cache_dir_disabled(self):
+        with patch.dict(os.environ, {'PANGOCFFI_CACHE_DIR': ''}):
+            assert cache.cache_dir() is None
+            assert cache.store_library_paths({}) is None
+            assert cache.load_library_paths() == {}
+
+    def test_library_paths_round_trip(self):
+        libraries = {}
+        cache.set_library_path(libraries, 'pango', ['pango'], 'libpango.so')
+        path = cache.store_library_paths(libraries)
+        assert path == Path(self.temp_dir.name) / cache.LIBRARY_CACHE_FILENAME
+
+        loaded = cache.load_library_paths()
+        assert cache.get_library_path(loaded, 'pango', ['pango']) == \
+            'libpango.so'
+        assert cache.get_library_path(loaded, 'pango', ['pango-1.0']) is None
+        assert cache.get_library_path(loaded, 'glib', ['glib']) is None
+
+        cache.clear()
+        assert cache.load_library_paths() == {}
+
+    def test_library_paths_invalidated_by_environment(self):
+        libraries = {}
+        cache.set_library_path(libraries, 'pango', ['pango'], 'libpango.so')
+        cache.store_library_paths(libraries)
+        with patch.dict(os.environ, {'PANGO_LOCATION': '/elsewhere'}):
+            assert cache.load_library_paths() == {}
+
+    def test_corrupt_cache_is_ignored(self):
+        path = Path(self.temp_dir.name) / cache.LIBRARY_CACHE_FILENAME
+        path.write_text('not json')
+        assert cache.load_library_paths() == {}
+
+    def test_ffi_round_trip(self):
+        ffi = FFIInstanceBuilder().generate()
+
+        assert cache.load_ffi() is None
+        path = cache.store_ffi(ffi)
+        assert path.name == cache.FFI_CACHE_FILENAME_FORMAT.format(
+            cache.c_definitions_digest()
+        )
+
+        cached_ffi = cache.load_ffi()
+        assert isinstance(cached_ffi, FFI)
+        assert cached_ffi.sizeof('PangoRectangle') == \
+            ffi.sizeof('PangoRectangle')
+
+        # The cached declarations can be included like parsed ones.
+        including_ffi = FFI()
+        including_ffi.include(cached_ffi)
+        including_ffi.cdef('PangoLayout *create_layout(void);')
+
+        cache.clear()
+        assert cache.load_ffi() is None
+
+    def test_used_ffi_is_not_stored(self):
+        ffi = FFIInstanceBuilder().generate()
+        ffi.new('PangoRectangle *')
+        assert cache.store_ffi(ffi) is None
+        assert cache.load_ffi() is None
+
+    def test_populated_ffi_can_be_loaded(self):
+        # The FFI in use by pangocffi has already built its types.
+        from pangocffi.ffi_build import ffi
+        ffi.sizeof('PangoRectangle')
+
+        cache.populate()
+        cached_ffi = cache.load_ffi()
+        assert cached_ffi.sizeof('PangoRectangle') == \
+            ffi.sizeof('PangoRectangle')
+        assert cached_ffi.sizeof('PangoLogAttr') == \
+            ffi.sizeof('PangoLogAttr')
+
+    def test_corrupt_ffi_is_ignored(self):
+        path = Path(self.temp_dir.name) / cache.FFI_CACHE_FILENAME_FORMAT \
+            .format(cache.c_definitions_digest())
+        path.write_bytes(b'not a pickle')
+        assert cache.load_ffi() is None
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'requires POSIX permissions')
+    def test_writable_by_others_is_ignored(self):
+        cache.store_ffi(FFIInstanceBuilder().generate())
+        libraries = {}
+        cache.set_library_path(libraries, 'pango', ['pango'], 'libpango.so')
+        cache.store_library_paths(libraries)
+        for path in Path(self.temp_dir.name).iterdir():
+            path.chmod(0o666)
+        assert cache.load_ffi() is None
+        assert cache.load_library_paths() == {}
+
+    def test_ffi_is_shared(self):
+        import pangocffi
+        from pangocffi import ffi_build
+
+        if pangocffi.cffi_mode == 'abi':
+            assert pangocffi.ffi is ffi_build.ffi
+
+    def test_populate(self):
+        path = cache.populate()
+        assert path == Path(self.temp_dir.name)
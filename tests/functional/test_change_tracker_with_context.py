@@ -0,0 +1,70 @@
+import unittest
+
+from pangocffi import ChangeTracker, FontDescription, Layout
+from ..context_creator import ContextCreator
+
+
+class TestChangeTrackerWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+        self.layout = Layout(self.pango_context)
+        self.layout.text = 'Hi from Παν語'
+
+    def tearDown(self):
+        self.layout = None
+        self.pango_context = None
+        self.context.close()
+
+    def test_serials(self):
+        layout_serial = self.layout.serial
+        assert layout_serial > 0
+        assert self.layout.serial == layout_serial
+        self.layout.width = 100 * 1024
+        assert self.layout.serial != layout_serial
+
+        layout_serial = self.layout.serial
+        self.layout.context_changed()
+        assert self.layout.serial != layout_serial
+
+        context_serial = self.pango_context.serial
+        assert context_serial > 0
+        self.pango_context.changed()
+        assert self.pango_context.serial != context_serial
+
+    def test_tracker_update(self):
+        tracker = ChangeTracker(self.layout, self.pango_context)
+        assert tracker.objects == (self.layout, self.pango_context)
+        assert tracker.changed
+        assert tracker.update()
+        assert not tracker.changed
+        assert not tracker.update()
+        assert tracker.serials == (
+            self.layout.serial, self.pango_context.serial
+        )
+
+        self.layout.text = 'Hi again'
+        assert tracker.changed
+        assert tracker.update()
+        assert not tracker.changed
+
+        tracker.invalidate()
+        assert tracker.changed
+
+    def test_tracker_detects_context_changes(self):
+        tracker = ChangeTracker(self.layout)
+        tracker.update()
+        font_description = FontDescription()
+        font_description.family = 'sans-serif'
+        font_description.size = 20 * 1024
+        self.pango_context.font_description = font_description
+        assert tracker.update()
+        assert not tracker.update()
+
+        self.pango_context.changed()
+        assert tracker.update()
+
+    def test_tracker_requires_objects(self):
+        with self.assertRaises(AssertionError):
+            ChangeTracker()
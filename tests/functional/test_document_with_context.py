@@ -0,0 +1,185 @@
+import unittest
+
+from pangocffi import (
+    Attribute,
+    AttrList,
+    Document,
+    Layout,
+    WrapMode,
+    find_paragraph_boundary,
+)
+from ..context_creator import ContextCreator
+
+TEXT = (
+    'Hi from Παν語!\n'
+    'Pango is a library for laying out and rendering of text.\r\n'
+    '\n'
+    'Pango can be used anywhere that text layout is needed.'
+)
+
+
+class TestDocumentWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+
+    def tearDown(self):
+        self.pango_context = None
+        self.context.close()
+
+    def assert_matches_layouts(self, document):
+        # Every paragraph is laid out as a separate layout would be, and the
+        # paragraphs are stacked on top of each other.
+        y = 0
+        for index in range(document.paragraph_count):
+            layout = Layout(self.pango_context)
+            layout.width = document.width
+            layout.wrap = document.wrap
+            layout.text = document.get_paragraph_text(index)
+            assert document.get_paragraph_y(index) == y
+            height = layout.get_size()[1]
+            assert document.get_paragraph_height(index) == height
+            assert document.get_layout(index).text == layout.text
+            y += height
+        assert document.height == y
+
+    def test_find_paragraph_boundary(self):
+        assert find_paragraph_boundary('Παν語\r\nPango') == (4, 6)
+        assert find_paragraph_boundary('Pango\u2029') == (5, 6)
+        assert find_paragraph_boundary('Pango') == (5, 5)
+        assert find_paragraph_boundary('') == (0, 0)
+
+    def test_paragraphs(self):
+        document = Document(self.pango_context, TEXT, width=100 * 1024)
+        assert document.text == TEXT
+        assert document.length == len(TEXT)
+        assert document.paragraph_count == 4
+        assert document.get_paragraph_text(0) == 'Hi from Παν語!'
+        assert document.get_paragraph_text(2) == ''
+        assert document.get_paragraph_start(1) == len('Hi from Παν語!\n')
+        assert document.paragraph_at_offset(0) == 0
+        assert document.paragraph_at_offset(len('Hi from Παν語!')) == 0
+        assert document.paragraph_at_offset(len('Hi from Παν語!\n')) == 1
+        assert document.paragraph_at_offset(len(TEXT)) == 3
+        with self.assertRaises(IndexError):
+            document.paragraph_at_offset(len(TEXT) + 1)
+        with self.assertRaises(IndexError):
+            document.get_paragraph_text(4)
+        self.assert_matches_layouts(document)
+
+        assert Document(self.pango_context).paragraph_count == 1
+        assert Document(self.pango_context, 'Pango\n').paragraph_count == 2
+
+    def test_paragraph_at_y(self):
+        document = Document(self.pango_context, TEXT, width=100 * 1024)
+        for index in range(document.paragraph_count):
+            y = document.get_paragraph_y(index)
+            assert document.paragraph_at_y(y) == index
+        assert document.paragraph_at_y(-1) == 0
+        assert document.paragraph_at_y(document.height + 1) == 3
+
+    def test_edits_only_replace_touched_paragraphs(self):
+        document = Document(self.pango_context, TEXT, width=100 * 1024)
+        layouts = [
+            document.get_layout(i) for i in range(document.paragraph_count)
+        ]
+        self.assert_matches_layouts(document)
+
+        offset = document.get_paragraph_start(3) + len('Pango')
+        replaced = document.insert(offset, ' (the library)')
+        text = TEXT[:offset] + ' (the library)' + TEXT[offset:]
+        assert document.text == text
+        assert replaced == range(3, 4)
+        for index in range(3):
+            assert document.get_layout(index) is layouts[index]
+        assert document.get_layout(3) is not layouts[3]
+        self.assert_matches_layouts(document)
+
+        layouts[3] = document.get_layout(3)
+        offset = document.get_paragraph_start(1) + 5
+        replaced = document.insert(offset, '\nis a\nlot')
+        text = text[:offset] + '\nis a\nlot' + text[offset:]
+        assert document.text == text
+        assert document.paragraph_count == 6
+        assert document.get_layout(0) is layouts[0]
+        assert replaced == range(1, 4)
+        assert document.get_layout(5) is layouts[3]
+        self.assert_matches_layouts(document)
+
+        replaced = document.delete(0, len(text))
+        assert document.text == ''
+        assert document.paragraph_count == 1
+        assert replaced == range(0, 1)
+        self.assert_matches_layouts(document)
+
+    def test_edits_join_delimiters(self):
+        document = Document(self.pango_context, 'Pango\rlayout')
+        assert document.paragraph_count == 2
+        document.insert(len('Pango\r'), '\n')
+        assert document.paragraph_count == 2
+        assert document.get_paragraph_start(1) == len('Pango\r\n')
+
+        document.delete(len('Pango'), len('Pango\r\n'))
+        assert document.text == 'Pangolayout'
+        assert document.paragraph_count == 1
+        self.assert_matches_layouts(document)
+
+    def test_width_changes(self):
+        document = Document(self.pango_context, TEXT)
+        self.assert_matches_layouts(document)
+        height = document.height
+        document.width = 50 * 1024
+        document.wrap = WrapMode.WORD_CHAR
+        assert document.height > height
+        self.assert_matches_layouts(document)
+
+    def test_attributes(self):
+        # Requires Pango 1.46 or later, to compare attribute lists.
+        text = 'Pango\nlayout'
+        attributes = AttrList()
+        # Applies to "go\nla".
+        attributes.insert(Attribute.from_size(20 * 1024, 3, 9))
+        document = Document(self.pango_context, text, attributes)
+
+        assert document.get_layout(0).attributes == _attr_list(
+            20 * 1024, 3, 5
+        )
+        assert document.get_layout(1).attributes == _attr_list(
+            20 * 1024, 0, 2
+        )
+
+        # Text inserted before the attribute moves it.
+        document.insert(0, 'Hi ')
+        assert document.get_layout(0).attributes == _attr_list(
+            20 * 1024, 6, 8
+        )
+
+        # Text inserted within the attribute extends it.
+        document.insert(len('Hi Pango\nl'), 'ay')
+        assert document.get_layout(1).attributes == _attr_list(
+            20 * 1024, 0, 4
+        )
+
+        # Inserted attributes apply to the inserted text.
+        inserted = AttrList()
+        inserted.insert(Attribute.from_size(30 * 1024, 0, 2))
+        document.insert(0, 'Oh', inserted)
+        assert document.get_layout(0).attributes == _attr_list(
+            30 * 1024, 0, 2, 20 * 1024, 8, 10
+        )
+
+        # Deleting the paragraph delimiter joins the attributes.
+        document.delete(len('OhHi Pango'), len('OhHi Pango\n'))
+        assert document.text == 'OhHi Pangolayayout'
+        assert document.get_layout(0).attributes == _attr_list(
+            30 * 1024, 0, 2, 20 * 1024, 8, 10, 20 * 1024, 10, 14
+        )
+
+
+def _attr_list(*values) -> AttrList:
+    attributes = AttrList()
+    for i in range(0, len(values), 3):
+        size, start, end = values[i:i + 3]
+        attributes.insert(Attribute.from_size(size, start, end))
+    return attributes
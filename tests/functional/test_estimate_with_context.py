@@ -0,0 +1,83 @@
+import unittest
+
+from pangocffi import (
+    FontDescription,
+    LATIN_CHARACTERS,
+    WidthEstimator,
+    measure_many,
+)
+from pangocffi.estimate import _de_bruijn_pairs
+from ..context_creator import ContextCreator
+
+
+class TestWidthEstimatorWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+        self.desc = FontDescription()
+        self.desc.family = 'sans-serif'
+        self.desc.size = 12 * 1024
+
+    def tearDown(self):
+        self.pango_context = None
+        self.context.close()
+
+    def test_de_bruijn_pairs(self):
+        text = _de_bruijn_pairs('abc')
+        pairs = {text[i:i + 2] for i in range(len(text) - 1)}
+        assert len(text) == 10
+        assert pairs == {a + b for a in 'abc' for b in 'abc'}
+
+    def test_estimates_match_layout(self):
+        texts = [
+            'Hello, World!',
+            'AVATAR Tokyo Wave',
+            'Ærøskøbing Łódź',
+            '1234567890',
+            '',
+        ]
+        estimator = WidthEstimator(self.pango_context, self.desc)
+        widths, _, _ = measure_many(self.pango_context, texts, self.desc)
+        for text, width in zip(texts, widths):
+            assert estimator.covers(text)
+            assert estimator.estimate(text) == width
+        assert list(estimator.estimate_many(texts)) == list(widths)
+
+    def test_falls_back_to_layout(self):
+        texts = ['Hi from Παν語', 'Tab\tseparated', 'e\u0301']
+        estimator = WidthEstimator(self.pango_context, self.desc)
+        widths, _, _ = measure_many(self.pango_context, texts, self.desc)
+        for text, width in zip(texts, widths):
+            assert not estimator.covers(text)
+            assert estimator.estimate(text) == width
+
+    def test_characters(self):
+        estimator = WidthEstimator(self.pango_context, self.desc, '0123456789')
+        assert estimator.characters == '0123456789'
+        assert estimator.covers('2024')
+        assert not estimator.covers('2024-01-01')
+        widths, _, _ = measure_many(
+            self.pango_context, ['2024', '2024-01-01'], self.desc
+        )
+        assert estimator.estimate('2024') == widths[0]
+        assert estimator.estimate('2024-01-01') == widths[1]
+        assert 'A' in LATIN_CHARACTERS
+        assert '\xad' not in LATIN_CHARACTERS
+
+    def test_context_changes(self):
+        estimator = WidthEstimator(self.pango_context)
+        width = estimator.estimate('Pango')
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = 24 * 1024
+        self.pango_context.font_description = desc
+        assert estimator.estimate('Pango') > width
+
+    def test_invalid_characters(self):
+        with self.assertRaises(AssertionError):
+            WidthEstimator(self.pango_context, characters='')
+        with self.assertRaises(AssertionError):
+            WidthEstimator(self.pango_context, characters='aa')
+        with self.assertRaises(AssertionError):
+            WidthEstimator(self.pango_context, characters='a\n')
@@ -1,3 +1,6 @@
+from unittest.mock import patch
+
+import pangocffi
 from pangocffi.ffi_instance_builder import FFIInstanceBuilder
 from cffi import FFI
 
@@ -6,3 +9,28 @@ def test_ffi_instance_builder():
     ffi_builder = FFIInstanceBuilder('test')
     ffi = ffi_builder.generate()
     assert isinstance(ffi, FFI)
+
+
+def test_ffi_instance_builder_defaults_to_abi_mode():
+    ffi_builder = FFIInstanceBuilder('test')
+    assert ffi_builder.api_mode is False
+
+
+def test_ffi_instance_builder_emits_api_mode_c_code(tmp_path):
+    # pkg-config is only needed to compile the extension, not to check that
+    # the C definitions can be turned into C code.
+    def set_source_pkgconfig(ffi, module_name, libraries, source, **kwargs):
+        ffi.set_source(module_name, source, **kwargs)
+
+    with patch.object(FFI, 'set_source_pkgconfig', set_source_pkgconfig):
+        ffi = FFIInstanceBuilder(
+            'pangocffi._generated.ffi_api',
+            api_mode=True
+        ).generate()
+    path = tmp_path / 'ffi_api.c'
+    ffi.emit_c_code(str(path))
+    assert '#include <pango/pango.h>' in path.read_text()
+
+
+def test_cffi_mode():
+    assert pangocffi.cffi_mode in ('api', 'abi')
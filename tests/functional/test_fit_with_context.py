@@ -0,0 +1,139 @@
+import unittest
+
+from pangocffi import (
+    FontDescription,
+    Layout,
+    WrapMode,
+    fit_font_size,
+    fit_font_sizes,
+)
+from ..context_creator import ContextCreator
+
+
+class TestFitWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+        self.desc = FontDescription()
+        self.desc.family = 'sans-serif'
+        self.desc.size = 40 * 1024
+
+    def tearDown(self):
+        self.pango_context = None
+        self.context.close()
+
+    def get_size(self, text, size, width=-1, wrap=WrapMode.WORD):
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = size
+        layout = Layout(self.pango_context)
+        layout.font_description = desc
+        layout.width = width
+        layout.wrap = wrap
+        layout.text = text
+        return layout.get_size()
+
+    def assert_largest_fit(self, text, size, width, height, **kwargs):
+        layout_width = width if kwargs.get('wrap') is not None else -1
+        text_width, text_height = self.get_size(text, size, layout_width)
+        assert text_width <= width and text_height <= height
+        text_width, text_height = self.get_size(
+            text, size + 128, layout_width
+        )
+        assert text_width > width or text_height > height
+
+    def test_fits_width(self):
+        text = 'Hi from Παν語'
+        width, height = 100 * 1024, 100 * 1024
+        size, fits = fit_font_size(
+            self.pango_context, text, width, height, self.desc
+        )
+        assert fits
+        assert 1024 < size < 40 * 1024
+        self.assert_largest_fit(text, size, width, height)
+        assert self.desc.size == 40 * 1024
+
+    def test_fits_height(self):
+        text = 'Pango'
+        size, fits = fit_font_size(
+            self.pango_context, text, -1, 20 * 1024, self.desc
+        )
+        assert fits
+        self.assert_largest_fit(text, size, 2 ** 30, 20 * 1024)
+
+    def test_fits_wrapped(self):
+        text = 'Pango is a library for laying out and rendering of text.'
+        width, height = 100 * 1024, 60 * 1024
+        size, fits = fit_font_size(
+            self.pango_context,
+            text,
+            width,
+            height,
+            self.desc,
+            wrap=WrapMode.WORD_CHAR
+        )
+        assert fits
+        self.assert_largest_fit(
+            text, size, width, height, wrap=WrapMode.WORD_CHAR
+        )
+
+    def test_already_fits(self):
+        size, fits = fit_font_size(
+            self.pango_context, 'Pango', 1000 * 1024, 1000 * 1024, self.desc
+        )
+        assert (size, fits) == (40 * 1024, True)
+
+    def test_does_not_fit(self):
+        size, fits = fit_font_size(
+            self.pango_context,
+            'Pango',
+            1024,
+            1024,
+            self.desc,
+            min_size=4 * 1024
+        )
+        assert (size, fits) == (4 * 1024, False)
+
+    def test_font_description_without_size(self):
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        context_desc = FontDescription()
+        context_desc.family = 'sans-serif'
+        context_desc.size = 40 * 1024
+        self.pango_context.font_description = context_desc
+        assert fit_font_size(
+            self.pango_context, 'Pango', 1000 * 1024, 1000 * 1024, desc
+        ) == (40 * 1024, True)
+
+        self.pango_context.font_description = desc
+        with self.assertRaisesRegex(AssertionError, 'has no size'):
+            fit_font_size(self.pango_context, 'Pango', 1024, 1024)
+
+    def test_fit_font_sizes(self):
+        texts = ['Pango', 'Hi from Παν語', 'Pango' * 10, '']
+        sizes, fits = fit_font_sizes(
+            self.pango_context, texts, 100 * 1024, 30 * 1024, self.desc
+        )
+        assert sizes.typecode == 'i'
+        assert fits.typecode == 'b'
+        for i, text in enumerate(texts):
+            assert (sizes[i], bool(fits[i])) == fit_font_size(
+                self.pango_context, text, 100 * 1024, 30 * 1024, self.desc
+            )
+        assert sizes[2] < sizes[0]
+        assert sizes[3] == 40 * 1024
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(AssertionError):
+            fit_font_size(self.pango_context, 'Pango', -1, -1, self.desc)
+        with self.assertRaises(AssertionError):
+            fit_font_size(
+                self.pango_context, 'Pango', -1, 1024, self.desc,
+                wrap=WrapMode.WORD
+            )
+        with self.assertRaises(AssertionError):
+            fit_font_size(
+                self.pango_context, 'Pango', 1024, 1024, self.desc,
+                min_size=2 * 40 * 1024
+            )
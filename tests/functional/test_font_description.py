@@ -10,6 +10,14 @@ class TestFontDescription(unittest.TestCase):
         identical_desc = desc.from_pointer(desc.pointer)
         assert identical_desc == desc
 
+    def test_font_description_string_round_trip(self):
+        desc = FontDescription.from_string('Sans Bold 12')
+        assert desc.family == 'Sans'
+        assert desc.weight == Weight.BOLD.value
+        assert desc.size == 12 * 1024
+        assert FontDescription.from_string(desc.to_string()).to_string() \
+            == desc.to_string()
+
     def test_font_description_not_implemented_equality(self):
         desc = FontDescription()
         assert ('not an object' != desc)
@@ -29,3 +29,15 @@ class TestFontMetricsWithContext(unittest.TestCase):
         assert metrics.strikethrough_thickness >= 0
         assert isinstance(metrics.underline_position, int)
         assert isinstance(metrics.underline_thickness, int)
+
+    def test_context_metrics(self):
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = 12 * 1024
+        metrics = self.pango_context.get_metrics(desc)
+        assert metrics.approximate_char_width > 0
+        assert metrics.height > 0
+
+        lang = Language.from_string('pt_BR')
+        metrics = self.pango_context.get_metrics(desc, lang)
+        assert metrics.approximate_digit_width > 0
@@ -75,6 +75,76 @@ class TestLayout(unittest.TestCase):
         layout.text = "Hi from Pango"
         layout.apply_markup('<span font="italic 30">Hi from Παν語</span>')
 
+    @staticmethod
+    def test_layout_setting_text_bytes():
+        context = Context()
+        layout = Layout(context)
+
+        text = "Hi from Παν語"
+        layout.set_text_bytes(text.encode("utf-8"))
+        assert layout.text == text
+
+        layout.set_text_bytes(bytearray("Hello".encode("utf-8")))
+        assert layout.text == "Hello"
+
+        buffer = "Hi from Pango".encode("utf-8")
+        layout.set_text_bytes(memoryview(buffer)[3:])
+        assert layout.text == "from Pango"
+
+        layout.set_text_bytes(b"")
+        assert layout.text == ""
+
+    @staticmethod
+    def test_layout_text_ends_at_null():
+        context = Context()
+        layout = Layout(context)
+
+        layout.text = "Hi\0from Pango"
+        assert layout.text == "Hi"
+        assert layout.text_index.byte_length == 2
+
+        layout.set_text_bytes(b"Hi\0from Pango")
+        assert layout.text == "Hi"
+
+        layout.set_text_bytes(b"Hi\0\xff")
+        assert layout.text == "Hi"
+
+    def test_layout_set_text_bytes_invalid(self):
+        context = Context()
+        layout = Layout(context)
+        layout.text = "Hello"
+
+        with self.assertRaises(ValueError):
+            layout.set_text_bytes(b"Hi\xff")
+        with self.assertRaises(ValueError):
+            layout.set_text_bytes(bytearray(b"\xe8\xaa"))
+        assert layout.text == "Hello"
+        assert layout.text_index.text == "Hello"
+
+    @staticmethod
+    def test_layout_text_index():
+        context = Context()
+        layout = Layout(context)
+        assert layout.text_index.text == ""
+
+        layout.text = "Hi from Παν語"
+        text_index = layout.text_index
+        assert text_index.text == "Hi from Παν語"
+        assert text_index.char_to_byte(9) == 10
+        assert layout.text_index is text_index
+
+        # Changes made through another wrapper are picked up
+        Layout.from_pointer(layout.pointer).text = "Hello"
+        assert layout.text == "Hello"
+        assert layout.text_index.byte_length == 5
+
+        layout.set_text_bytes("Παν語".encode("utf-8"))
+        assert layout.text == "Παν語"
+        assert layout.text_index.byte_length == 9
+
+        layout.apply_markup("<b>Bold</b>")
+        assert layout.text == "Bold"
+
     def test_set_attributes(self):
         context = Context()
         layout = Layout(context)
@@ -0,0 +1,117 @@
+import unittest
+
+from pangocffi import Direction, Layout, LayoutLine, WrapMode
+from ..context_creator import ContextCreator
+
+TEXT = (
+    'Hi from Παν語! Pango is a library for laying out and rendering of '
+    'text, with an emphasis on internationalization.\n'
+    'Pango can be used anywhere that text layout is needed.'
+)
+
+
+class TestLayoutLineWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+        self.layout = Layout(self.pango_context)
+        self.layout.width = 150 * 1024
+        self.layout.wrap = WrapMode.WORD_CHAR
+        self.layout.spacing = 2 * 1024
+        self.layout.text = TEXT
+
+    def tearDown(self):
+        self.layout = None
+        self.pango_context = None
+        self.context.close()
+
+    def test_get_lines(self):
+        lines = self.layout.get_lines()
+        assert len(lines) == self.layout.get_line_count()
+        assert len(lines) > 2
+
+        text_length = self.layout.text_index.byte_length
+        assert lines[0].start_index == 0
+        assert lines[0].is_paragraph_start
+        for line, next_line in zip(lines, lines[1:]):
+            assert line.start_index + line.length <= next_line.start_index
+        assert lines[-1].start_index + lines[-1].length == text_length
+        assert sum(line.is_paragraph_start for line in lines) == 2
+        assert all(
+            line.resolved_direction == Direction.LTR for line in lines
+        )
+
+    def test_get_line(self):
+        line_count = self.layout.get_line_count()
+        lines = self.layout.get_lines()
+        for i in range(line_count):
+            line = self.layout.get_line(i)
+            assert isinstance(line, LayoutLine)
+            assert line.start_index == lines[i].start_index
+            assert line.length == lines[i].length
+        assert self.layout.get_line(line_count) is None
+
+    def test_lines_outlive_layout_changes(self):
+        line = self.layout.get_line(0)
+        start_index, length = line.start_index, line.length
+        self.layout.text = 'Replaced'
+        assert line.start_index == start_index
+        assert line.length == length
+
+    def test_line_extents_and_positions(self):
+        line = self.layout.get_line(0)
+        ink, logical = line.get_extents()
+        assert logical.width > 0
+        assert logical.height > 0
+        assert logical.y < 0
+
+        end_index = line.start_index + line.length
+        x = line.index_to_x(line.start_index)
+        x_trailing = line.index_to_x(line.start_index, trailing=True)
+        assert x == 0
+        assert x_trailing > x
+        assert line.index_to_x(end_index) >= x_trailing
+
+        index, trailing, inside = line.x_to_index(x_trailing - 1)
+        assert index == line.start_index
+        assert trailing == 1
+        assert inside
+
+        index, trailing, inside = line.x_to_index(-1024)
+        assert index == line.start_index
+        assert not inside
+
+        ranges = line.get_x_ranges(line.start_index, end_index)
+        assert len(ranges) == 1
+        assert ranges[0][0] <= ranges[0][1]
+
+    def test_line_metrics(self):
+        metrics = self.layout.line_metrics()
+        lines = self.layout.get_lines()
+        assert len(metrics.start_indices) == len(lines)
+        for column in metrics:
+            assert len(column) == len(lines)
+            assert column.typecode == 'i'
+
+        layout_iter = self.layout.get_iter()
+        for i, line in enumerate(lines):
+            assert metrics.start_indices[i] == line.start_index
+            assert metrics.lengths[i] == line.length
+            assert metrics.baselines[i] == layout_iter.get_baseline()
+            _, logical = layout_iter.get_line_extents()
+            assert metrics.xs[i] == logical.x
+            assert metrics.ys[i] == logical.y
+            assert metrics.widths[i] == logical.width
+            assert metrics.heights[i] == logical.height
+            assert layout_iter.get_line().start_index == line.start_index
+            layout_iter.next_line()
+
+        for y, next_y in zip(metrics.ys, metrics.ys[1:]):
+            assert y < next_y
+
+    def test_line_metrics_of_empty_layout(self):
+        self.layout.text = ''
+        metrics = self.layout.line_metrics()
+        assert list(metrics.start_indices) == [0]
+        assert list(metrics.lengths) == [0]
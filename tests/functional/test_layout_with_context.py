@@ -1,4 +1,17 @@
-from pangocffi import Layout, Alignment, EllipsizeMode, WrapMode
+import gc
+import os
+import tempfile
+import warnings
+from array import array
+from pangocffi import (
+    Layout,
+    Alignment,
+    EllipsizeMode,
+    LayoutDeserializeFlags,
+    LayoutSerializeFlags,
+    LogAttrFlag,
+    WrapMode,
+)
 from ..context_creator import ContextCreator
 import unittest
 
@@ -63,3 +76,205 @@ class TestLayoutWithContext(unittest.TestCase):
 
         line_count = layout.get_line_count()
         assert line_count == 1
+
+    def test_layout_xy_to_index(self):
+        layout = Layout(self.pango_context)
+        layout.text = 'Hi from Παν語'
+        _, logical_rect = layout.get_extents()
+
+        index, trailing, inside = layout.xy_to_index(0, 0)
+        assert (index, trailing, inside) == (0, 0, True)
+
+        index, trailing, inside = layout.xy_to_index(
+            logical_rect.width - 1, logical_rect.height // 2
+        )
+        assert index == len('Hi from Παν'.encode('utf-8'))
+        assert trailing == 1
+        assert inside
+
+        index, trailing, inside = layout.xy_to_index(
+            logical_rect.width + 1024, 0
+        )
+        assert index == len('Hi from Παν'.encode('utf-8'))
+        assert not inside
+
+    def test_layout_xy_to_indices(self):
+        layout = Layout(self.pango_context)
+        layout.width = 100 * 1024
+        layout.wrap = WrapMode.WORD_CHAR
+        layout.text = 'Hi from Παν語! Pango is a library for laying out text.'
+        _, logical_rect = layout.get_extents()
+
+        xs = [x * 1024 for x in range(-10, 120, 7)] * 2
+        ys = [0] * (len(xs) // 2) + [logical_rect.height - 1] * (len(xs) // 2)
+        indices, trailings, insides = layout.xy_to_indices(xs, ys)
+        assert indices.typecode == 'i'
+        assert trailings.typecode == 'i'
+        assert insides.typecode == 'b'
+        assert len(indices) == len(trailings) == len(insides) == len(xs)
+        for i, (x, y) in enumerate(zip(xs, ys)):
+            index, trailing, inside = layout.xy_to_index(x, y)
+            assert indices[i] == index
+            assert trailings[i] == trailing
+            assert insides[i] == inside
+
+        assert layout.xy_to_indices([], []) == (
+            array('i'), array('i'), array('b')
+        )
+        with self.assertRaises(AssertionError):
+            layout.xy_to_indices([0, 1], [0])
+
+    def test_layout_index_to_pos(self):
+        layout = Layout(self.pango_context)
+        layout.width = 100 * 1024
+        layout.wrap = WrapMode.WORD_CHAR
+        layout.text = 'Hi from Παν語! Pango is a library for laying out text.'
+
+        first = layout.index_to_pos(0)
+        assert first.x == 0
+        assert first.y == 0
+        assert first.width > 0
+        assert first.height > 0
+
+        strong, weak = layout.get_cursor_pos(1)
+        assert strong.x == first.width
+        assert strong.width == 0
+        assert (weak.x, weak.y, weak.height) == (
+            strong.x, strong.y, strong.height
+        )
+
+        assert layout.index_to_line_x(0) == (0, 0)
+        assert layout.index_to_line_x(0, trailing=True) == (0, first.width)
+        last_index = len(layout.text.encode('utf-8')) - 1
+        line, _ = layout.index_to_line_x(last_index)
+        assert line == layout.get_line_count() - 1
+
+    def test_layout_index_to_pos_batches(self):
+        layout = Layout(self.pango_context)
+        layout.width = 100 * 1024
+        layout.wrap = WrapMode.WORD_CHAR
+        layout.text = 'Hi from Παν語! Pango is a library for laying out text.'
+        text_index = layout.text_index
+        indices = [
+            text_index.char_to_byte(i) for i in range(len(layout.text))
+        ]
+
+        positions = layout.indices_to_pos(indices)
+        strong_positions, weak_positions = layout.get_cursor_positions(
+            indices
+        )
+        lines, xs = layout.indices_to_line_x(indices, trailing=True)
+        assert positions.typecode == 'i'
+        assert len(positions) == 4 * len(indices)
+        assert len(strong_positions) == len(weak_positions) == len(positions)
+        assert len(lines) == len(xs) == len(indices)
+
+        for i, index in enumerate(indices):
+            pos = layout.index_to_pos(index)
+            assert positions[4 * i:4 * i + 4] == array(
+                'i', [pos.x, pos.y, pos.width, pos.height]
+            )
+            strong, weak = layout.get_cursor_pos(index)
+            assert strong_positions[4 * i:4 * i + 4] == array(
+                'i', [strong.x, strong.y, strong.width, strong.height]
+            )
+            assert weak_positions[4 * i:4 * i + 4] == array(
+                'i', [weak.x, weak.y, weak.width, weak.height]
+            )
+            assert (lines[i], xs[i]) == layout.index_to_line_x(index, True)
+
+        assert layout.indices_to_pos([]) == array('i')
+        assert layout.indices_to_line_x([]) == (array('i'), array('i'))
+
+    def test_layout_log_attrs(self):
+        layout = Layout(self.pango_context)
+        layout.text = 'Hi from Pango. Παν語'
+        log_attrs = layout.log_attrs
+        assert log_attrs.typecode == 'I'
+        assert len(log_attrs) == len(layout.text) + 1
+
+        def positions(flag):
+            return [
+                i for i, attrs in enumerate(log_attrs) if attrs & flag.value
+            ]
+
+        assert positions(LogAttrFlag.IS_WORD_START)[:3] == [0, 3, 8]
+        assert positions(LogAttrFlag.IS_WORD_END)[:3] == [2, 7, 13]
+        assert positions(LogAttrFlag.IS_WHITE) == [2, 7, 14]
+        assert positions(LogAttrFlag.IS_CURSOR_POSITION) == list(
+            range(len(layout.text) + 1)
+        )
+        assert positions(LogAttrFlag.IS_SENTENCE_START)[:2] == [0, 15]
+
+    def test_layout_log_attrs_outlive_layout(self):
+        layout = Layout(self.pango_context)
+        layout.text = 'Hi from Pango'
+        log_attrs = layout.log_attrs
+        expected = log_attrs.tolist()
+        layout.text = 'Παν語 ' * 100
+        assert log_attrs.tolist() == expected
+        assert len(layout.log_attrs) == len(layout.text) + 1
+        layout = None
+        gc.collect()
+        assert log_attrs.tolist() == expected
+
+    def test_layout_serialize(self):
+        layout = Layout(self.pango_context)
+        layout.width = 100 * 1024
+        layout.wrap = WrapMode.WORD_CHAR
+        layout.alignment = Alignment.CENTER
+        layout.text = 'Hi from Παν語! Pango is a library for laying out text.'
+        try:
+            data = layout.serialize()
+        except AttributeError:
+            warnings.warn(
+                "Layout can't be serialized. "
+                "Pango version 1.50.0 or later is required."
+            )
+            return
+        assert isinstance(data, bytes)
+        assert data.lstrip().startswith(b'{')
+        data_with_output = layout.serialize(
+            LayoutSerializeFlags.CONTEXT | LayoutSerializeFlags.OUTPUT
+        )
+        assert len(data_with_output) > len(data)
+
+        copy = Layout.deserialize(self.pango_context, data)
+        assert copy.pointer != layout.pointer
+        assert copy.text == layout.text
+        assert copy.width == layout.width
+        assert copy.wrap is layout.wrap
+        assert copy.alignment is layout.alignment
+        assert copy.get_size() == layout.get_size()
+        assert copy.get_line_count() == layout.get_line_count()
+
+        copy = Layout.deserialize(
+            self.pango_context,
+            data_with_output,
+            LayoutDeserializeFlags.CONTEXT
+        )
+        assert copy.text == layout.text
+
+        with self.assertRaises(ValueError):
+            Layout.deserialize(self.pango_context, b'{"text": 42')
+
+    def test_layout_write_to_file(self):
+        layout = Layout(self.pango_context)
+        layout.text = 'Hi from Παν語'
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'layout.json')
+            try:
+                layout.write_to_file(path)
+            except AttributeError:
+                warnings.warn(
+                    "Layout can't be serialized. "
+                    "Pango version 1.50.0 or later is required."
+                )
+                return
+            with open(path, 'rb') as file:
+                assert file.read() == layout.serialize()
+
+            with self.assertRaises(OSError):
+                layout.write_to_file(
+                    os.path.join(directory, 'missing', 'layout.json')
+                )
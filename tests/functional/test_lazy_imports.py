@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pangocffi
+
+
+def _imported_modules(source: str) -> set:
+    output = subprocess.check_output([
+        sys.executable,
+        '-c',
+        source + '\n'
+        'import sys\n'
+        'print(" ".join(m for m in sys.modules if m.startswith("pangocffi")))'
+    ])
+    return set(output.decode().split())
+
+
+def test_wrappers_are_imported_on_first_use():
+    modules = _imported_modules(
+        'from pangocffi import FontDescription, units_to_double'
+    )
+    assert 'pangocffi.font_description' in modules
+    assert 'pangocffi.convert' in modules
+    assert 'pangocffi.attribute' not in modules
+    assert 'pangocffi.layout' not in modules
+
+
+def test_every_wrapper_can_be_imported_independently():
+    for name, module_name in pangocffi._LAZY_IMPORTS.items():
+        modules = _imported_modules(f'from pangocffi import {name}')
+        assert f'pangocffi.{module_name}' in modules
+
+
+def test_submodules_are_attributes():
+    modules = _imported_modules(
+        'import pangocffi\n'
+        'assert pangocffi.layout.Layout is pangocffi.Layout\n'
+        'assert pangocffi.measure.MeasurementCache is not None'
+    )
+    assert 'pangocffi.layout' in modules
+    assert 'pangocffi.measure' in modules
+
+
+def test_unknown_attribute():
+    assert not hasattr(pangocffi, 'NotAWrapper')
+
+
+def test_dir_includes_lazy_names():
+    assert 'Layout' in dir(pangocffi)
+    assert set(pangocffi._LAZY_IMPORTS) <= set(pangocffi.__all__)
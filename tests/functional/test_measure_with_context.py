@@ -0,0 +1,246 @@
+from pangocffi import (
+    Attribute,
+    AttrList,
+    EllipsizeMode,
+    FontDescription,
+    Layout,
+    MeasurementCache,
+    WrapMode,
+    column_width,
+    measure_many,
+)
+from ..context_creator import ContextCreator
+import unittest
+import warnings
+
+
+class TestMeasurementCacheWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+
+    def tearDown(self):
+        self.pango_context = None
+        self.context.close()
+
+    def test_cache_returns_layout_extents(self):
+        cache = MeasurementCache(self.pango_context)
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = 12 * 1024
+
+        layout = Layout(self.pango_context)
+        layout.font_description = desc
+        layout.width = 100 * 1024
+        layout.text = 'Hi from Παν語'
+        ink, logical = layout.get_extents()
+
+        for _ in range(2):
+            cached_ink, cached_logical = cache.get_extents(
+                'Hi from Παν語', desc, width=100 * 1024
+            )
+            for rect, cached_rect in ((ink, cached_ink),
+                                      (logical, cached_logical)):
+                assert cached_rect.x == rect.x
+                assert cached_rect.y == rect.y
+                assert cached_rect.width == rect.width
+                assert cached_rect.height == rect.height
+        assert cache.misses == 1
+        assert cache.hits == 1
+        assert len(cache) == 1
+
+        assert cache.get_size('Hi from Παν語', desc, width=100 * 1024) == \
+            layout.get_size()
+        assert cache.hits == 2
+
+    def test_cache_keys(self):
+        cache = MeasurementCache(self.pango_context)
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = 12 * 1024
+        cache.get_extents('Hello', desc)
+
+        other_desc = desc.copy()
+        cache.get_extents('Hello', other_desc)
+        assert cache.hits == 1
+
+        other_desc.size = 20 * 1024
+        cache.get_extents('Hello', other_desc)
+        cache.get_extents('Hello', desc, width=10 * 1024)
+        cache.get_extents('Hello', desc, wrap=WrapMode.CHAR)
+        cache.get_extents('Hello', desc, ellipsize=EllipsizeMode.END)
+        cache.get_extents('Hello')
+        assert cache.hits == 1
+        assert cache.misses == 6
+
+    def test_cache_keys_attributes(self):
+        cache = MeasurementCache(self.pango_context)
+        attrs = AttrList()
+        attrs.insert(Attribute.from_size(30 * 1024, 0, 5))
+        try:
+            _, logical = cache.get_extents('Hello', attributes=attrs)
+        except AttributeError:
+            warnings.warn(
+                (
+                    "AttrList can't be serialized."
+                    "Pango version 1.50.0 or later is required."
+                )
+            )
+            return
+        _, plain_logical = cache.get_extents('Hello')
+        assert logical.height > plain_logical.height
+
+        same_attrs = AttrList()
+        same_attrs.insert(Attribute.from_size(30 * 1024, 0, 5))
+        cache.get_extents('Hello', attributes=same_attrs)
+        assert cache.hits == 1
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = MeasurementCache(self.pango_context, maxsize=2)
+        cache.get_extents('a')
+        cache.get_extents('b')
+        cache.get_extents('a')
+        cache.get_extents('c')
+        assert len(cache) == 2
+
+        cache.get_extents('a')
+        assert cache.hits == 2
+        cache.get_extents('b')
+        assert cache.misses == 4
+
+    def test_cache_clear(self):
+        cache = MeasurementCache(self.pango_context)
+        cache.get_extents('a')
+        cache.get_extents('a')
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.hits == 0
+        assert cache.misses == 0
+
+    def test_cache_invalidated_by_context_changes(self):
+        cache = MeasurementCache(self.pango_context)
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = 12 * 1024
+        self.pango_context.font_description = desc
+        _, logical = cache.get_extents('Hello')
+
+        desc.size = 30 * 1024
+        self.pango_context.font_description = desc
+        _, larger_logical = cache.get_extents('Hello')
+        assert cache.misses == 2
+        assert len(cache) == 1
+        assert larger_logical.height > logical.height
+
+    def test_cache_metrics(self):
+        cache = MeasurementCache(self.pango_context)
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = 12 * 1024
+        metrics = cache.get_metrics(desc)
+        assert metrics.height == \
+            self.pango_context.get_metrics(desc).height
+
+        same_desc = FontDescription.from_string('sans-serif 12')
+        assert cache.get_metrics(same_desc) is metrics
+        desc.size = 30 * 1024
+        assert cache.get_metrics(desc).height > metrics.height
+        assert cache.get_metrics(same_desc) is metrics
+        assert cache.hits == 0
+        assert cache.misses == 0
+
+        self.pango_context.font_description = desc
+        assert cache.get_metrics(same_desc) is not metrics
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(AssertionError):
+            MeasurementCache(self.pango_context, maxsize=0)
+
+
+class TestMeasureManyWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+
+    def tearDown(self):
+        self.pango_context = None
+        self.context.close()
+
+    def test_measure_many_matches_layout(self):
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = 12 * 1024
+        texts = ['Hi', 'Hi from Παν語', '', 'A much longer text that wraps']
+
+        widths, heights, baselines = measure_many(
+            self.pango_context,
+            texts,
+            desc,
+            width=50 * 1024,
+            wrap=WrapMode.WORD_CHAR
+        )
+        assert len(widths) == len(heights) == len(baselines) == len(texts)
+
+        layout = Layout(self.pango_context)
+        layout.font_description = desc
+        layout.width = 50 * 1024
+        layout.wrap = WrapMode.WORD_CHAR
+        for i, text in enumerate(texts):
+            layout.text = text
+            assert (widths[i], heights[i]) == layout.get_size()
+            assert baselines[i] == layout.get_baseline()
+
+    def test_measure_many_empty(self):
+        widths, heights, baselines = measure_many(self.pango_context, [])
+        assert len(widths) == len(heights) == len(baselines) == 0
+
+    def test_column_width(self):
+        desc = FontDescription()
+        desc.family = 'sans-serif'
+        desc.size = 12 * 1024
+        texts = ['1', '22', '333', '4444', 'Hi from Παν語', '22', '']
+        texts += ['1'] * 93
+        widths, _, _ = measure_many(self.pango_context, texts, desc)
+        widths = sorted(widths)
+
+        result = column_width(
+            self.pango_context, texts, desc, percentiles=(50, 95, 100)
+        )
+        assert result.max_width == widths[-1]
+        assert result.percentile_widths == (widths[49], widths[94], widths[99])
+        assert result.count == len(texts)
+        assert result.measured == 6
+
+        # The texts down to "1" are needed for the 50th percentile, but ""
+        # can't be wider than them, so it isn't laid out.
+        pruned = column_width(
+            self.pango_context, iter(texts), desc, (50, 95, 100), slack=2.0
+        )
+        assert pruned.measured == 5
+        assert pruned[:3] == result[:3]
+
+        cache = MeasurementCache(self.pango_context)
+        for _ in range(2):
+            assert column_width(
+                self.pango_context, texts, desc, (50, 95, 100), slack=2.0,
+                cache=cache
+            ) == pruned
+        other_context = ContextCreator.create_surface_without_output()
+        with self.assertRaises(AssertionError):
+            column_width(
+                other_context.get_pango_context_as_class(), texts,
+                slack=2.0, cache=cache
+            )
+        other_context.close()
+
+    def test_column_width_skips_short_texts(self):
+        texts = ['Pango is a library for laying out text'] + ['1'] * 1000
+        result = column_width(self.pango_context, texts, slack=2.0)
+        assert result.measured == 1
+        assert result.count == 1001
+
+    def test_column_width_empty(self):
+        result = column_width(self.pango_context, [], percentiles=(50,))
+        assert result == (0, (0,), 0, 0)
@@ -0,0 +1,110 @@
+import unittest
+
+from pangocffi import Layout, Paginator
+from ..context_creator import ContextCreator
+
+
+class TestPaginateWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+        self.layout = Layout(self.pango_context)
+        self.layout.width = 100 * 1024
+        # A single line paragraph followed by a wrapped paragraph.
+        self.layout.text = 'Pango\n' + ' '.join(['Παν語 Pango'] * 20)
+
+    def tearDown(self):
+        self.layout = None
+        self.pango_context = None
+        self.context.close()
+
+    def line_ranges(self):
+        layout_iter = self.layout.get_iter()
+        ranges = []
+        while True:
+            ranges.append(layout_iter.get_line_yrange())
+            if not layout_iter.next_line():
+                return ranges
+
+    def test_pages_fit(self):
+        ranges = self.line_ranges()
+        line_height = ranges[0][1] - ranges[0][0]
+        paginator = Paginator(self.layout, 3 * line_height)
+        pages = paginator.paginate()
+        assert paginator.complete
+        assert paginator.pages == pages
+        assert pages.line_indices[0] == 0
+        assert pages.start_indices[0] == 0
+        lines = self.layout.get_lines()
+        for page, first in enumerate(pages.line_indices):
+            assert pages.start_indices[page] == lines[first].start_index
+            assert pages.y_offsets[page] == ranges[first][0]
+            if page + 1 < len(pages.line_indices):
+                last = pages.line_indices[page + 1] - 1
+            else:
+                last = len(ranges) - 1
+            assert ranges[last][1] - ranges[first][0] <= 3 * line_height
+        assert len(pages.line_indices) > 1
+
+    def test_lines_taller_than_page(self):
+        paginator = Paginator(self.layout, 1)
+        pages = paginator.paginate()
+        assert list(pages.line_indices) == list(range(len(self.line_ranges())))
+
+    def test_resume(self):
+        ranges = self.line_ranges()
+        line_height = ranges[0][1] - ranges[0][0]
+        paginator = Paginator(self.layout, 2 * line_height)
+        first = paginator.paginate(1)
+        assert list(first.line_indices) == [0]
+        assert not paginator.complete
+        rest = paginator.paginate()
+        assert paginator.complete
+        assert len(paginator.paginate().line_indices) == 0
+        expected = Paginator(self.layout, 2 * line_height).paginate()
+        assert paginator.pages == expected
+        assert list(rest.line_indices) == list(expected.line_indices[1:])
+
+    def test_widows_and_orphans(self):
+        # Lines of the same height.
+        self.layout.text = 'Pango\n' + ' '.join(['Pango layout'] * 8)
+        ranges = self.line_ranges()
+        assert len(ranges) >= 4
+        line_height = ranges[0][1] - ranges[0][0]
+
+        # Without constraints, the second page starts after two lines.
+        paginator = Paginator(self.layout, 2 * line_height)
+        assert paginator.paginate().line_indices[1] == 2
+
+        # A single line of the second paragraph can't be left at the bottom
+        # of the first page.
+        paginator = Paginator(self.layout, 2 * line_height, orphans=2)
+        assert paginator.paginate().line_indices[1] == 1
+
+        # The second paragraph is moved to the next page as a whole when
+        # fewer lines than widows would be left for the next page.
+        paginator = Paginator(
+            self.layout, 2 * line_height, widows=len(ranges)
+        )
+        assert paginator.paginate().line_indices[1] == 1
+
+    def test_layout_changes(self):
+        ranges = self.line_ranges()
+        line_height = ranges[0][1] - ranges[0][0]
+        paginator = Paginator(self.layout, 2 * line_height)
+        paginator.paginate()
+        self.layout.text = 'Pango'
+        assert not paginator.complete
+        assert len(paginator.pages.line_indices) == 0
+        assert list(paginator.paginate().line_indices) == [0]
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(AssertionError):
+            Paginator(self.layout, 0)
+        with self.assertRaises(AssertionError):
+            Paginator(self.layout, 100, widows=0)
+        with self.assertRaises(AssertionError):
+            Paginator(self.layout, 100, orphans=0)
+        with self.assertRaises(AssertionError):
+            Paginator(self.layout, 100).paginate(-1)
@@ -0,0 +1,121 @@
+import multiprocessing
+import threading
+import unittest
+
+from pangocffi import (
+    Attribute,
+    AttrList,
+    ContextRegistry,
+    LayoutProcessPool,
+    LayoutThreadPool,
+    ParagraphSpec,
+    WrapMode,
+    layout_paragraph,
+)
+from ..context_creator import ContextCreator, create_pango_context
+
+PARAGRAPHS = [
+    'Hi from Παν語! Pango is a library for laying out and rendering of '
+    'text, with an emphasis on internationalization.',
+    '',
+    'Short',
+    'Pango can be used anywhere that text layout is needed, though most of '
+    'the work on Pango so far has been done in the context of the GTK widget '
+    'toolkit.',
+]
+
+
+class TestLayoutParagraphWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+
+    def tearDown(self):
+        self.pango_context = None
+        self.context.close()
+
+    def test_layout_paragraph_line_starts(self):
+        spec = ParagraphSpec(
+            PARAGRAPHS[0],
+            font_description='sans-serif 12',
+            width=100 * 1024,
+            wrap=WrapMode.WORD_CHAR
+        )
+        result = layout_paragraph(self.pango_context, spec)
+        assert result.line_starts[0] == 0
+        assert len(result.line_starts) > 1
+        assert list(result.line_starts) == sorted(result.line_starts)
+        assert result.line_starts[-1] < len(PARAGRAPHS[0])
+        assert result.logical_extents[2] <= 100 * 1024
+        assert result.baseline > 0
+
+    def test_layout_paragraph_attributes(self):
+        attrs = AttrList()
+        attrs.insert(Attribute.from_size(30 * 1024, 0, 5))
+        try:
+            attributes = attrs.to_string()
+        except AttributeError:
+            return
+        plain = layout_paragraph(self.pango_context, ParagraphSpec('Short'))
+        result = layout_paragraph(
+            self.pango_context,
+            ParagraphSpec('Short', attributes=attributes)
+        )
+        assert result.logical_extents[3] > plain.logical_extents[3]
+
+
+class TestLayoutProcessPoolWithContext(unittest.TestCase):
+
+    def test_pool_matches_layout_paragraph(self):
+        context = create_pango_context()
+        specs = [
+            ParagraphSpec(text, 'sans-serif 12', width=150 * 1024)
+            for text in PARAGRAPHS * 5
+        ]
+        expected = [layout_paragraph(context, spec) for spec in specs]
+
+        with LayoutProcessPool(
+            create_pango_context,
+            max_workers=2,
+            warm_font_descriptions=['sans-serif 12'],
+            mp_context=multiprocessing.get_context('spawn')
+        ) as pool:
+            assert list(pool.map(specs, chunksize=3)) == expected
+            assert pool.submit(specs[0]).result() == expected[0]
+
+
+class TestLayoutThreadPoolWithContext(unittest.TestCase):
+
+    def setUp(self):
+        ContextCreator.initialise_ffi()
+
+    def test_registry_creates_context_per_thread(self):
+        registry = ContextRegistry(create_pango_context)
+        context = registry.get_context()
+        assert registry.get_context() is context
+        assert registry.get_layout() is registry.get_layout()
+
+        other_contexts = []
+        thread = threading.Thread(
+            target=lambda: other_contexts.append(registry.get_context())
+        )
+        thread.start()
+        thread.join()
+        assert other_contexts[0].pointer != context.pointer
+
+    def test_pool_matches_layout_paragraph(self):
+        context = create_pango_context()
+        specs = [
+            ParagraphSpec(text, 'sans-serif 12', width=150 * 1024)
+            for text in PARAGRAPHS * 5
+        ]
+        expected = [layout_paragraph(context, spec) for spec in specs]
+
+        with LayoutThreadPool(
+            create_pango_context,
+            max_workers=4,
+            warm_font_descriptions=['sans-serif 12']
+        ) as pool:
+            assert list(pool.map(specs, chunksize=2)) == expected
+            assert pool.submit(specs[0]).result() == expected[0]
@@ -0,0 +1,88 @@
+import unittest
+
+from pangocffi import Document, StreamedLine, WrapMode, stream_lines
+from ..context_creator import ContextCreator
+
+TEXT = (
+    'Hi from Παν語!\n'
+    'Pango is a library for laying out and rendering of text.\r\n'
+    '\n'
+    'Pango can be used anywhere that text layout is needed.'
+)
+
+
+class TestStreamWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ContextCreator.create_surface_without_output()
+        self.pango_context = self.context.get_pango_context_as_class()
+
+    def tearDown(self):
+        self.pango_context = None
+        self.context.close()
+
+    def expected_lines(self, text, width):
+        # The lines of every paragraph of a document, moved to the byte
+        # offset and position of the paragraph.
+        document = Document(self.pango_context, text, width=width)
+        lines = []
+        for index in range(document.paragraph_count):
+            start = len(
+                text[:document.get_paragraph_start(index)].encode('utf-8')
+            )
+            y = document.get_paragraph_y(index)
+            metrics = document.get_layout(index).line_metrics()
+            for i in range(len(metrics.start_indices)):
+                lines.append(StreamedLine(
+                    index,
+                    start + metrics.start_indices[i],
+                    metrics.lengths[i],
+                    y + metrics.baselines[i],
+                    metrics.xs[i],
+                    y + metrics.ys[i],
+                    metrics.widths[i],
+                    metrics.heights[i]
+                ))
+        return lines
+
+    def test_matches_document(self):
+        width = 100 * 1024
+        lines = list(stream_lines(self.pango_context, TEXT, width=width))
+        assert lines == self.expected_lines(TEXT, width)
+        assert lines[0].paragraph == 0
+        assert lines[0].start_index == 0
+        assert lines[-1].paragraph == 3
+        assert len(lines) > 4
+
+    def test_chunks(self):
+        # Paragraphs and delimiters split between chunks.
+        chunks = [
+            'Hi from ', 'Παν語!\nPango is', ' a library\r', '\n', '',
+            '\nPango', ' can be used\n'
+        ]
+        text = ''.join(chunks)
+        lines = list(stream_lines(self.pango_context, chunks))
+        assert lines == self.expected_lines(text, -1)
+        assert [line.paragraph for line in lines] == [0, 1, 2, 3, 4]
+        assert lines[2].start_index == len(
+            'Hi from Παν語!\nPango is a library\r\n'.encode('utf-8')
+        )
+        assert lines[-1].length == 0
+
+    def test_lazy(self):
+        def chunks():
+            yield 'Hi from Παν語!\n'
+            raise AssertionError('read too far')
+
+        lines = stream_lines(
+            self.pango_context, chunks(), wrap=WrapMode.CHAR
+        )
+        line = next(lines)
+        assert line.paragraph == 0
+        assert line.length == len('Hi from Παν語!'.encode('utf-8'))
+
+    def test_empty(self):
+        lines = list(stream_lines(self.pango_context, ''))
+        assert len(lines) == 1
+        assert lines[0].start_index == 0
+        assert lines[0].length == 0
@@ -0,0 +1,44 @@
+import unittest
+
+from pangocffi import TextIndex
+
+
+class TestTextIndex(unittest.TestCase):
+
+    def test_ascii_text(self):
+        text_index = TextIndex("Hello")
+        assert text_index.text == "Hello"
+        assert text_index.byte_length == 5
+        assert text_index.char_to_byte(3) == 3
+        assert text_index.byte_to_char(5) == 5
+
+    def test_multibyte_text(self):
+        text = "Hi from Παν語!"
+        text_index = TextIndex(text)
+        text_bytes = text.encode("utf-8")
+        assert text_index.byte_length == len(text_bytes)
+        for char_offset in range(len(text) + 1):
+            byte_offset = text_index.char_to_byte(char_offset)
+            assert byte_offset == len(text[:char_offset].encode("utf-8"))
+            assert text_index.byte_to_char(byte_offset) == char_offset
+
+    def test_byte_offset_inside_character(self):
+        text_index = TextIndex("a語b")
+        assert text_index.byte_to_char(2) == 1
+        assert text_index.byte_to_char(3) == 1
+        assert text_index.byte_to_char(4) == 2
+
+    def test_empty_text(self):
+        text_index = TextIndex("")
+        assert text_index.byte_length == 0
+        assert text_index.char_to_byte(0) == 0
+        assert text_index.byte_to_char(0) == 0
+
+    def test_out_of_range(self):
+        text_index = TextIndex("Παν")
+        with self.assertRaises(IndexError):
+            text_index.char_to_byte(4)
+        with self.assertRaises(IndexError):
+            text_index.char_to_byte(-1)
+        with self.assertRaises(IndexError):
+            text_index.byte_to_char(7)
@@ -0,0 +1,131 @@
+import subprocess
+import sys
+import sysconfig
+import threading
+import unittest
+
+from pangocffi import (
+    AttrList,
+    Attribute,
+    FontDescription,
+    Layout,
+    MeasurementCache,
+    TextIndex,
+)
+from ..context_creator import ContextCreator, create_pango_context
+
+THREADS = 8
+
+
+def _run_in_threads(target, count: int = THREADS) -> None:
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def run(i):
+        barrier.wait()
+        try:
+            target(i)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=run, args=(i,)) for i in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class TestThreadSafety(unittest.TestCase):
+
+    def setUp(self):
+        ContextCreator.initialise_ffi()
+
+    @unittest.skipUnless(
+        sysconfig.get_config_var('Py_GIL_DISABLED'),
+        'requires a free-threaded build of Python'
+    )
+    def test_import_keeps_gil_disabled(self):
+        output = subprocess.check_output([
+            sys.executable,
+            '-c',
+            'import sys, pangocffi\n'
+            'pangocffi.Layout, pangocffi.FontDescription\n'
+            'print(sys._is_gil_enabled())'
+        ])
+        assert output.decode().strip() == 'False'
+
+    def test_layout_in_threads_with_own_contexts(self):
+        text = 'Hi from Παν語! ' * 50
+        expected = []
+
+        def lay_out(i):
+            layout = Layout(create_pango_context())
+            layout.font_description = FontDescription.from_string(
+                'sans-serif 12'
+            )
+            layout.width = 200 * 1024
+            layout.text = text
+            for _ in range(20):
+                size = layout.get_size()
+                assert layout.text == text
+            expected.append(size)
+
+        _run_in_threads(lay_out)
+        assert len(set(expected)) == 1
+
+    def test_attr_lists_in_threads(self):
+        # Every layout takes its own reference to its attribute list, which
+        # it releases when it is freed.
+        text = 'Hi from Παν語!'
+        plain_layout = Layout(create_pango_context())
+        plain_layout.text = text
+        plain_size = plain_layout.get_size()
+        sizes = []
+
+        def lay_out(i):
+            attr_list = AttrList()
+            attr_list.insert(
+                Attribute.from_size(24 * 1024, 0, len(text.encode('utf-8')))
+            )
+            layout = Layout(create_pango_context())
+            layout.text = text
+            for _ in range(20):
+                layout.attributes = attr_list
+                sizes.append(layout.get_size())
+                del layout.attributes
+                assert layout.get_size() == plain_size
+
+        _run_in_threads(lay_out)
+        assert len(set(sizes)) == 1
+        assert sizes[0][1] > plain_size[1]
+
+    def test_measurement_cache_shared_between_threads(self):
+        cache = MeasurementCache(create_pango_context(), maxsize=16)
+        texts = ['text {}'.format(i) for i in range(32)]
+        sizes = {}
+
+        def measure(i):
+            for text in texts:
+                size = cache.get_size(text)
+                assert sizes.setdefault(text, size) == size
+
+        _run_in_threads(measure)
+        assert cache.hits + cache.misses == THREADS * len(texts)
+        assert len(cache) <= 16
+
+    def test_text_index_shared_between_threads(self):
+        text_index = TextIndex('Hi from Παν語! ' * 100)
+        byte_offsets = []
+
+        def index(i):
+            byte_offsets.append(text_index.char_to_byte(1000 + i))
+
+        _run_in_threads(index)
+        assert sorted(byte_offsets) == [
+            len(text_index.text[:1000 + i].encode('utf-8'))
+            for i in range(THREADS)
+        ]
@@ -78,7 +78,6 @@ def add_attr_index_definitions(cdefs: str) -> str:
 def add_extra_typedefs(cdefs: str) -> str:
     cdefs = 'typedef ... hb_feature_t;\n' + \
             'typedef ... hb_font_t;\n' + \
-            'typedef ... GBytes;\n' + \
             'typedef ... GQuark;\n' + \
             cdefs
     return cdefs
@@ -136,7 +135,9 @@ def get_struct_for_opaque_typedef(
     header_source = read_pango_file(pango_git_dir, header_file)
     regex = r"struct %s\s*{[^}]*};" % private_struct_name
     matches = re.search(regex, header_source)
-    private_struct_definition = matches.group()
+    private_struct_definition = re.sub(
+        r'/\*.*?\*/', '', matches.group(), flags=re.DOTALL
+    )
     public_struct_definition = re.sub(r"%s" % private_struct_name, '', private_struct_definition)
     public_struct_definition = re.sub(r"struct ", 'typedef struct', public_struct_definition)
     public_struct_definition = re.sub(r"};", '} %s;' % opaque_typedef_name, public_struct_definition)
@@ -283,11 +284,30 @@ def generate(pango_git_dir):
     )
     typedefs_opaque = remove_opaque_typedef(typedefs_opaque, 'PangoColor')
 
+    typedefs_struct += get_struct_for_opaque_typedef(
+        'PangoLayoutLine',
+        pango_git_dir,
+        'pango-layout.h',
+        '_PangoLayoutLine'
+    )
+    typedefs_opaque = remove_opaque_typedef(
+        typedefs_opaque,
+        'PangoLayoutLine'
+    )
+
+    typedefs_struct += get_struct_for_opaque_typedef(
+        'PangoLogAttr',
+        pango_git_dir,
+        'pango-break.h',
+        '_PangoLogAttr'
+    )
+    typedefs_opaque = remove_opaque_typedef(typedefs_opaque, 'PangoLogAttr')
+
     # Remove and replace the aliased opaque typedefs
     typedefs_struct += 'typedef PangoGlyphItem PangoLayoutRun;\n'
     typedefs_opaque = remove_opaque_typedef(typedefs_opaque, 'PangoLayoutRun')
 
-    # insert extra typedefs for hb and GBytes
+    # insert extra typedefs for hb
     typedefs_opaque = add_extra_typedefs(typedefs_opaque)
 
     # insert definitions for attr index